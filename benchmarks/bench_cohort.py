@@ -0,0 +1,74 @@
+# bench_cohort.py — throughput of rscore.score_cohort on a synthetic CEGEP cohort
+# Run from the repo root:
+#   python benchmarks/bench_cohort.py                       # 10k, 100k, 1M rows
+#   python benchmarks/bench_cohort.py --rows 5000000 --repeat 1
+#
+# Builds a long-format table (student_id, course, grade, avg, sd, credits), scores
+# it and reports rows/second. Before timing, a sample of students is re-scored one
+# by one with rscore.score_courses (the Results tab's path) and must match exactly.
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rscore  # noqa: E402
+
+
+def synthetic_cohort(n_rows: int, courses_per_student: int = 8, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n_students = max(1, n_rows // courses_per_student)
+    df = pd.DataFrame({
+        "student_id": rng.integers(0, n_students, n_rows),
+        "course": rng.integers(100, 700, n_rows).astype(str),
+        "grade": rng.uniform(55, 100, n_rows).round(1),
+        "avg": rng.uniform(65, 85, n_rows).round(1),
+        "sd": rng.uniform(4, 15, n_rows).round(1),
+        "credits": rng.choice([1.0, 1.33, 2.0, 2.33, 2.66], n_rows),
+    })
+    # Same gaps the app sees: missing std devs, zero std devs, blank credits
+    df.loc[rng.random(n_rows) < 0.01, "sd"] = np.nan
+    df.loc[rng.random(n_rows) < 0.005, "sd"] = 0.0
+    df.loc[rng.random(n_rows) < 0.01, "credits"] = np.nan
+    return df
+
+
+def check_against_results_tab(table: pd.DataFrame, out: pd.DataFrame, n: int = 50) -> None:
+    for sid in out["student_id"].head(n):
+        rows = table[table["student_id"] == sid]
+        credits = rows["credits"].fillna(1).replace(0, 1)
+        want = rscore.score_courses(rows["grade"], rows["avg"], rows["sd"], credits, -2.0, 2.0)
+        got = out[out["student_id"] == sid].iloc[0]
+        for col, ref in (("R (central)", want.overall_central), ("R (min)", want.overall_min),
+                         ("R (max)", want.overall_max)):
+            assert np.isclose(got[col], ref, equal_nan=True), (sid, col, got[col], ref)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Rows/second for rscore.score_cohort.")
+    ap.add_argument("--rows", default="10000,100000,1000000", help="comma-separated table sizes")
+    ap.add_argument("--repeat", type=int, default=3, help="best-of-N timing")
+    args = ap.parse_args(argv)
+
+    print(f"{'rows':>10} {'students':>9} {'ms':>9} {'rows/s':>12}")
+    for n in (int(x) for x in args.rows.split(",")):
+        table = synthetic_cohort(n)
+        out = rscore.score_cohort(table, -2.0, 2.0)
+        check_against_results_tab(table, out)
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            rscore.score_cohort(table, -2.0, 2.0)
+            best = min(best, time.perf_counter() - t0)
+        print(f"{n:>10} {len(out):>9} {best * 1e3:>9.1f} {n / best:>12,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+# bench_ocr.py — accuracy + latency harness for the OCR import pipeline (no Streamlit)
+# Run from the repo root:
+#   python benchmarks/bench_ocr.py                 # full pipeline (needs the tesseract binary)
+#   python benchmarks/bench_ocr.py --text-only     # parser + merge on ideal transcripts
+#   python benchmarks/bench_ocr.py --save-corpus out/   # write the PNGs + expected rows
+#
+# Reports per-stage latency (decode, preprocess, ocr, parse, merge) and field-level
+# precision / recall for grade, class average, std dev and class code, per variant.
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ocr_utils  # noqa: E402
+from ocr_engine import OcrEngine  # noqa: E402
+from ocr_utils import OcrResult  # noqa: E402
+from corpus import Sample, build_corpus  # noqa: E402
+
+STAGES = ("decode", "preprocess", "ocr", "parse", "merge")
+FIELDS = {"grade": "Your Grade", "avg": "Class Avg", "sd": "Std. Dev", "code": "Class Code"}
+
+
+# ---------- Pipeline ----------
+
+def run_sample(engine: OcrEngine, sample: Sample, text_only: bool) -> Tuple[List[Dict[str, Any]], Dict[str, float], Dict[str, Any]]:
+    """Run one sample through the Import tab's engine stages, timing each (seconds)."""
+    t: Dict[str, float] = {}
+    info: Dict[str, Any] = {}
+    if text_only:
+        res = OcrResult(text=sample.text)
+    else:
+        t0 = time.perf_counter()
+        img = engine.decode(sample.png)
+        t["decode"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        prep = engine.preprocess(img, info)
+        t["preprocess"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        res = engine.recognize(prep)
+        t["ocr"] = time.perf_counter() - t0
+        info["ocr_pass"] = res.summary()
+
+    # Same "auto" mode as the Import tab: word-box layout first, text parser as fallback
+    t0 = time.perf_counter()
+    rows, info["parser"] = engine.parse(res)
+    t["parse"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    rows = engine.merge(rows)
+    t["merge"] = time.perf_counter() - t0
+    return rows, t, info
+
+
+# ---------- Scoring ----------
+
+def _norm_name(name: Any) -> str:
+    return ocr_utils.clean_course_name(str(name or "")).lower()
+
+
+def _same(field: str, a: Any, b: Any) -> bool:
+    if field == "code":
+        return str(a or "").replace(" ", "").upper() == str(b or "").replace(" ", "").upper()
+    try:
+        return abs(float(a) - float(b)) <= 0.05
+    except Exception:
+        return False
+
+
+def score_rows(expected: List[Dict[str, Any]], got: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """Field-level TP / FP / FN. Rows are matched on cleaned course name, then on class code."""
+    by_name = {_norm_name(r["Course Name"]): r for r in got if _norm_name(r.get("Course Name"))}
+    by_code = {str(r.get("Class Code") or "").upper(): r for r in got if r.get("Class Code")}
+    counts = {f: {"tp": 0, "fp": 0, "fn": 0} for f in FIELDS}
+    used = set()
+    for exp in expected:
+        pred = by_name.get(_norm_name(exp["Course Name"])) or by_code.get(exp["Class Code"].upper())
+        if pred is not None:
+            used.add(id(pred))
+        for f, col in FIELDS.items():
+            want = exp.get(col)
+            have = pred.get(col) if pred is not None else None
+            if have in (None, ""):
+                counts[f]["fn"] += want not in (None, "")
+            elif want not in (None, "") and _same(f, want, have):
+                counts[f]["tp"] += 1
+            else:
+                counts[f]["fp"] += 1
+                counts[f]["fn"] += want not in (None, "")
+    for r in got:  # rows that match nothing expected are all false positives
+        if id(r) in used:
+            continue
+        for f, col in FIELDS.items():
+            counts[f]["fp"] += r.get(col) not in (None, "")
+    return counts
+
+
+def _pr(c: Dict[str, int]) -> Tuple[float | None, float | None]:
+    """(precision, recall); None when a field never appears (e.g. std dev on list screenshots)."""
+    p = c["tp"] / (c["tp"] + c["fp"]) if c["tp"] + c["fp"] else None
+    r = c["tp"] / (c["tp"] + c["fn"]) if c["tp"] + c["fn"] else None
+    return p, r
+
+
+def _fmt(v: float | None) -> str:
+    return "  -  " if v is None else f"{v:.2f}"
+
+
+# ---------- Report ----------
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="OCR import pipeline accuracy / latency benchmark.")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--per-variant", type=int, default=3, help="screenshots per layout/language variant")
+    ap.add_argument("--text-only", action="store_true", help="skip decode/preprocess/OCR; parse ideal transcripts")
+    ap.add_argument("--save-corpus", metavar="DIR", help="write <name>.png and <name>.json for every sample")
+    ap.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = ap.parse_args(argv)
+
+    corpus = build_corpus(seed=args.seed, per_variant=args.per_variant)
+    if args.save_corpus:
+        os.makedirs(args.save_corpus, exist_ok=True)
+        for s in corpus:
+            with open(os.path.join(args.save_corpus, f"{s.name}.png"), "wb") as fh:
+                fh.write(s.png)
+            with open(os.path.join(args.save_corpus, f"{s.name}.json"), "w", encoding="utf-8") as fh:
+                json.dump({"expected": s.expected, "text": s.text}, fh, ensure_ascii=False, indent=2)
+
+    timings: Dict[str, List[float]] = defaultdict(list)
+    per_variant: Dict[str, Dict[str, Dict[str, int]]] = {}
+    samples = []
+    engine = OcrEngine()  # default config, no result cache: every sample is timed end to end
+    for s in corpus:
+        try:
+            rows, t, info = run_sample(engine, s, args.text_only)
+        except Exception as e:  # e.g. TesseractNotFoundError
+            print(f"{s.name}: pipeline failed: {e}\n(use --text-only to benchmark the parser without Tesseract)",
+                  file=sys.stderr)
+            return 2
+        for stage, secs in t.items():
+            timings[stage].append(secs)
+        variant = s.name.rsplit("-", 1)[0]
+        counts = score_rows(s.expected, rows)
+        agg = per_variant.setdefault(variant, {f: {"tp": 0, "fp": 0, "fn": 0} for f in FIELDS})
+        for f in FIELDS:
+            for k in ("tp", "fp", "fn"):
+                agg[f][k] += counts[f][k]
+        samples.append({"name": s.name, "rows": len(rows), "expected": len(s.expected), **info})
+
+    total = {f: {k: sum(v[f][k] for v in per_variant.values()) for k in ("tp", "fp", "fn")} for f in FIELDS}
+    report = {
+        "mode": "text-only" if args.text_only else "full",
+        "samples": samples,
+        "latency_ms": {
+            st: {"mean": 1e3 * sum(v) / len(v), "max": 1e3 * max(v)}
+            for st, v in ((st, timings[st]) for st in STAGES) if v
+        },
+        "accuracy": {
+            name: {f: dict(zip(("precision", "recall"), _pr(c))) for f, c in counts.items()}
+            for name, counts in list(per_variant.items()) + [("ALL", total)]
+        },
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"mode: {report['mode']}  samples: {len(corpus)}")
+    print("\nlatency (ms)      mean       max")
+    for st, v in report["latency_ms"].items():
+        print(f"  {st:<12} {v['mean']:>9.2f} {v['max']:>9.2f}")
+    print("\naccuracy (precision / recall)")
+    print(f"  {'variant':<16}" + "".join(f"{f:>14}" for f in FIELDS))
+    for name, acc in report["accuracy"].items():
+        cells = "".join(f"{_fmt(acc[f]['precision']):>7}/{_fmt(acc[f]['recall']):<6}" for f in FIELDS)
+        print(f"  {name:<16}{cells}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
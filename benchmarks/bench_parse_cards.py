@@ -0,0 +1,66 @@
+# bench_parse_cards.py — micro-benchmark for the mobile "Projected grade" card pass
+# Run from the repo root:  python benchmarks/bench_parse_cards.py
+#
+# Builds stitched mobile-card OCR text with an increasing number of cards and times
+# ocr_utils.parse_omnivox_text. The parse is linear when the time per line stays flat
+# as the text grows (a quadratic pass would double it at every step).
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr_utils import parse_omnivox_text  # noqa: E402
+
+NAMES = ["General Chemistry", "Differential Calculus", "Mechanics Physics",
+         "English Literature", "Humanities Knowledge", "Biologie Générale"]
+
+
+def stitched_cards(n_cards: int) -> str:
+    lines = []
+    for k in range(n_cards):
+        lines += [
+            f"{NAMES[k % len(NAMES)]} {chr(65 + k % 26)}{chr(65 + (k // 26) % 26)} Section",
+            f"{200 + k % 700}-N{k % 10}A-{k % 90 + 10:02d}",
+            f"Projected grade {60 + k % 40}.5%",
+            "Assessments 12/14",
+            f"Class average {55 + k % 40}.25%",
+            "View details",
+        ]
+    return "\n".join(lines)
+
+
+def time_parse(text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        parse_omnivox_text(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Time parse_omnivox_text on growing stitched mobile-card text.")
+    ap.add_argument("--sizes", default="50,100,200,400,800", help="comma-separated card counts")
+    ap.add_argument("--repeat", type=int, default=5, help="best-of-N timing")
+    args = ap.parse_args(argv)
+
+    print(f"{'cards':>6} {'lines':>7} {'rows':>5} {'ms':>9} {'us/line':>8}")
+    per_line = []
+    for n in (int(x) for x in args.sizes.split(",")):
+        text = stitched_cards(n)
+        n_lines = text.count("\n") + 1
+        rows = len(parse_omnivox_text(text))
+        secs = time_parse(text, args.repeat)
+        per_line.append(secs / n_lines * 1e6)
+        print(f"{n:>6} {n_lines:>7} {rows:>5} {secs * 1e3:>9.2f} {per_line[-1]:>8.2f}")
+    growth = per_line[-1] / per_line[0] if per_line[0] else float("nan")
+    print(f"us/line growth, largest vs smallest: x{growth:.2f} (≈1 means linear)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+# corpus.py — synthetic Omnivox-like screenshots with known rows (no Streamlit)
+# Renders desktop Grades tables and mobile "Projected grade" cards with PIL, in
+# English and French, so the OCR pipeline can be scored against ground truth.
+
+from __future__ import annotations
+import io
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from PIL import Image, ImageDraw, ImageFont
+
+COURSES = [
+    ("Differential Calculus", "201-SN2-RE"),
+    ("Integral Calculus", "201-SN3-RE"),
+    ("General Chemistry", "202-NYA-05"),
+    ("Mechanics", "203-NYA-05"),
+    ("General Biology", "101-NYA-05"),
+    ("English Literature", "603-102-MQ"),
+    ("Humanities Knowledge", "345-101-MQ"),
+    ("Physical Education", "109-101-MQ"),
+    ("Linear Algebra", "201-NYC-05"),
+    ("Ecriture et litterature", "601-101-MQ"),
+]
+
+LABELS = {
+    "en": {"course": "Course", "grade": "Current grade", "avg": "Class average",
+           "sd": "Std. dev", "projected": "Projected grade", "card_avg": "Class average",
+           "nav": ["Assignments", "Calendar", "Class Forum", "Course documents", "Grades",
+                   "List of my absences", "Teachers info"]},
+    "fr": {"course": "Cours", "grade": "Note actuelle", "avg": "Moyenne du groupe",
+           "sd": "Ecart type", "projected": "Note projetée", "card_avg": "Moyenne",
+           "nav": ["Travaux", "Calendrier", "Forum", "Documents", "Notes", "Absences"]},
+}
+
+
+@dataclass
+class Sample:
+    name: str
+    layout: str             # "desktop" | "mobile"
+    lang: str               # "en" | "fr"
+    png: bytes
+    expected: List[Dict[str, Any]] = field(default_factory=list)
+    text: str = ""          # ideal OCR transcript, for parser-only runs without Tesseract
+
+
+def _font(size: int):
+    try:
+        return ImageFont.load_default(size=size)   # Pillow >= 10.1 ships a scalable default
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def _pct(v: float, lang: str) -> str:
+    return f"{v:.1f}%" if lang == "en" else f"{v:.1f} %".replace(".", ",")
+
+
+def _png(img: Image.Image) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _pick_rows(rng: random.Random, n: int, with_sd: bool) -> List[Dict[str, Any]]:
+    rows = []
+    for name, code in rng.sample(COURSES, n):
+        rows.append({
+            "Course Name": name,
+            "Class Code": code,
+            "Your Grade": round(rng.uniform(60, 98), 1),
+            "Class Avg": round(rng.uniform(60, 85), 1),
+            "Std. Dev": round(rng.uniform(4, 15), 1) if with_sd else None,
+        })
+    return rows
+
+
+def render_desktop(rows: List[Dict[str, Any]], lang: str = "en", with_sd: bool = False) -> Image.Image:
+    """Omnivox desktop Grades list: left nav, page header, ruled table with numbered rows."""
+    lab = LABELS[lang]
+    f, fb = _font(18), _font(20)
+    W, row_h = 1400, 70
+    H = 260 + row_h * (len(rows) + 1)
+    img = Image.new("RGB", (W, H), (255, 255, 255))
+    d = ImageDraw.Draw(img)
+    d.rectangle([0, 0, 250, H], fill=(232, 236, 241))
+    for k, item in enumerate(lab["nav"]):
+        d.text((20, 120 + 40 * k), item, fill=(40, 40, 40), font=f)
+    d.text((300, 40), "Omnivox  LEA", fill=(20, 60, 120), font=fb)
+    d.text((300, 90), lab["nav"][4] if len(lab["nav"]) > 4 else "Grades", fill=(0, 0, 0), font=fb)
+
+    cols = [320, 820, 1030] + ([1230] if with_sd else [])
+    y = 180
+    d.text((cols[0], y + 22), lab["course"], fill=(0, 0, 0), font=fb)
+    d.text((cols[1], y + 22), lab["grade"], fill=(0, 0, 0), font=fb)
+    d.text((cols[2], y + 22), lab["avg"], fill=(0, 0, 0), font=fb)
+    if with_sd:
+        d.text((cols[3], y + 22), lab["sd"], fill=(0, 0, 0), font=fb)
+    for k, r in enumerate(rows):
+        y += row_h
+        d.line([300, y, W - 40, y], fill=(190, 190, 190), width=2)
+        d.text((cols[0], y + 10), f"{k + 1}. {r['Course Name']}", fill=(0, 0, 0), font=f)
+        d.text((cols[0] + 28, y + 38), f"{r['Class Code']} sect. 0{k % 9 + 1}", fill=(90, 90, 90), font=f)
+        d.text((cols[1], y + 22), _pct(r["Your Grade"], lang), fill=(0, 0, 0), font=f)
+        d.text((cols[2], y + 22), _pct(r["Class Avg"], lang), fill=(0, 0, 0), font=f)
+        if with_sd:
+            d.text((cols[3], y + 22), f"{r['Std. Dev']:.1f}", fill=(0, 0, 0), font=f)
+    d.line([300, y + row_h, W - 40, y + row_h], fill=(190, 190, 190), width=2)
+    return img
+
+
+def render_mobile(rows: List[Dict[str, Any]], lang: str = "en") -> Image.Image:
+    """Omnivox mobile app: one white "Projected grade" card per course on a grey background."""
+    lab = LABELS[lang]
+    f, fb = _font(22), _font(24)
+    W, card_h, gap = 720, 250, 40
+    H = 120 + (card_h + gap) * len(rows)
+    img = Image.new("RGB", (W, H), (238, 240, 244))
+    d = ImageDraw.Draw(img)
+    d.text((30, 40), "Omnivox", fill=(20, 60, 120), font=fb)
+    y = 120
+    for r in rows:
+        d.rectangle([24, y, W - 24, y + card_h], fill=(255, 255, 255))
+        d.text((50, y + 25), r["Course Name"], fill=(0, 0, 0), font=fb)
+        d.text((50, y + 65), r["Class Code"], fill=(90, 90, 90), font=f)
+        d.text((50, y + 120), f"{lab['projected']} {_pct(r['Your Grade'], lang)}", fill=(0, 0, 0), font=f)
+        d.text((50, y + 170), f"{lab['card_avg']} {_pct(r['Class Avg'], lang)}", fill=(0, 0, 0), font=f)
+        y += card_h + gap
+    return img
+
+
+def desktop_transcript(rows: List[Dict[str, Any]], lang: str = "en", with_sd: bool = False) -> str:
+    lab = LABELS[lang]
+    head = [lab["course"], lab["grade"], lab["avg"]] + ([lab["sd"]] if with_sd else [])
+    lines = ["Omnivox LEA", "   ".join(head)]
+    for k, r in enumerate(rows):
+        vals = [_pct(r["Your Grade"], lang), _pct(r["Class Avg"], lang)]
+        if with_sd:
+            vals.append(f"{r['Std. Dev']:.1f}")
+        lines.append(f"{k + 1}. {r['Course Name']}   " + "   ".join(vals))
+        lines.append(f"{r['Class Code']} sect. 0{k % 9 + 1}")
+    return "\n".join(lines)
+
+
+def mobile_transcript(rows: List[Dict[str, Any]], lang: str = "en") -> str:
+    lab = LABELS[lang]
+    lines = ["Omnivox"]
+    for r in rows:
+        lines += [r["Course Name"], r["Class Code"],
+                  f"{lab['projected']} {_pct(r['Your Grade'], lang)}",
+                  f"{lab['card_avg']} {_pct(r['Class Avg'], lang)}"]
+    return "\n".join(lines)
+
+
+def build_corpus(seed: int = 7, per_variant: int = 3) -> List[Sample]:
+    """Deterministic corpus: desktop (en, en+std dev, fr) and mobile (en, fr) variants."""
+    rng = random.Random(seed)
+    variants = [
+        ("desktop", "en", False),
+        ("desktop", "en", True),
+        ("desktop", "fr", False),
+        ("mobile", "en", False),
+        ("mobile", "fr", False),
+    ]
+    out: List[Sample] = []
+    for layout, lang, with_sd in variants:
+        for k in range(per_variant):
+            rows = _pick_rows(rng, rng.randint(3, 7), with_sd)
+            if layout == "desktop":
+                img, text = render_desktop(rows, lang, with_sd), desktop_transcript(rows, lang, with_sd)
+            else:
+                img, text = render_mobile(rows, lang), mobile_transcript(rows, lang)
+            tag = f"{layout}-{lang}{'-sd' if with_sd else ''}-{k + 1}"
+            out.append(Sample(name=tag, layout=layout, lang=lang, png=_png(img), expected=rows, text=text))
+    return out
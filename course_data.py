@@ -0,0 +1,387 @@
+# course_data.py — course-table helpers shared by the pages and the CLI (no Streamlit)
+# Header mapping for uploaded CSVs, numeric cleaning, and credit autofill from the
+# mapping files (by Class Code, then cleaned Course Name).
+
+from __future__ import annotations
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from course_names import clean_course_name
+
+__all__ = [
+    "REQUIRED_COLS",
+    "NUMERIC_COLS",
+    "HEADER_ALIASES",
+    "CREDIT_MAPPING_FILES",
+    "map_headers",
+    "csv_header_map",
+    "rename_csv_headers",
+    "clean_numeric",
+    "coerce_numeric",
+    "norm_code",
+    "norm_name",
+    "load_credit_mappings",
+    "credit_mapping_mtime_sig",
+    "autofill_credits",
+    "prepare_course_table",
+    "VALID_RANGES",
+    "CsvImport",
+    "import_course_csv",
+]
+
+REQUIRED_COLS = ["Course Name", "Your Grade", "Class Avg", "Std. Dev", "Credits"]
+NUMERIC_COLS = ["Your Grade", "Class Avg", "Std. Dev", "Credits"]
+
+# maps from messy CSV headers -> ours
+HEADER_ALIASES = {
+    "course": "Course Name",
+    "course name": "Course Name",
+    "class": "Course Name",
+    "grade": "Your Grade",
+    "your grade": "Your Grade",
+    "note": "Your Grade",
+    "mark": "Your Grade",
+    "average": "Class Avg",
+    "class avg": "Class Avg",
+    "std": "Std. Dev",
+    "std dev": "Std. Dev",
+    "standard deviation": "Std. Dev",
+    "credits": "Credits",
+    "credit": "Credits",
+}
+
+# Looked up relative to the working directory (or base_dir), first match wins per key
+CREDIT_MAPPING_FILES = [
+    "course_credits_mapping.csv",
+    "data/course_credits_mapping.csv",
+    "credits_map.csv",
+    "ministerial_credits.csv",
+    "data/ministerial_credits.csv",
+]
+
+
+# ---------- Headers ----------
+
+def map_headers(df: pd.DataFrame) -> pd.DataFrame:
+    """Try to rename messy CSV headers to our standard ones."""
+    new_cols = {}
+    for col in df.columns:
+        key = col.strip().lower()
+        if key in HEADER_ALIASES:
+            new_cols[col] = HEADER_ALIASES[key]
+    if new_cols:
+        df = df.rename(columns=new_cols)
+    return df
+
+
+def csv_header_map(columns) -> Dict[str, str]:
+    """{raw header: standard header}: the alias table first, then the CSV tab's fuzzy
+    substring rules for anything still unrecognised."""
+    rename_map: Dict[str, str] = {}
+    for c in columns:
+        alias = HEADER_ALIASES.get(str(c).strip().lower())
+        if alias:
+            rename_map[c] = alias
+            continue
+        if c in REQUIRED_COLS or c == "Class Code":
+            continue
+        c_lower = str(c).strip().lower().replace(".", "").replace("_", "").replace(" ", "")
+        if "coursename" in c_lower or c_lower in ("course", "classname", "name"):
+            rename_map[c] = "Course Name"
+        elif c_lower in ("classcode", "coursecode", "code"):
+            rename_map[c] = "Class Code"
+        elif "grade" in c_lower or "mark" in c_lower or "note" in c_lower:
+            rename_map[c] = "Your Grade"
+        elif "avg" in c_lower or "average" in c_lower or "mean" in c_lower:
+            rename_map[c] = "Class Avg"
+        elif "std" in c_lower or "deviation" in c_lower or "sigma" in c_lower:
+            rename_map[c] = "Std. Dev"
+        elif "credit" in c_lower or c_lower == "cr":
+            rename_map[c] = "Credits"
+    return rename_map
+
+
+def rename_csv_headers(df: pd.DataFrame) -> pd.DataFrame:
+    """The CSV tab's header detection (alias table + fuzzy substring rules)."""
+    return df.rename(columns=csv_header_map(df.columns))
+
+
+# ---------- Numbers ----------
+
+_NUM_RE = r"([0-9.]+)"
+
+
+def coerce_numeric(col: pd.Series) -> pd.Series:
+    """Float Series. Plain numbers take the vectorized to_numeric path; only cells that
+    fail it ("85,5 %", "B+ 78") go through clean_numeric's comma/regex extraction."""
+    out = pd.to_numeric(col, errors="coerce")
+    if out.dtype == object:
+        out = out.astype(float)
+    bad = out.isna() & col.notna()
+    if bad.any():
+        fixed = (
+            col[bad].astype(str)
+            .str.replace(",", ".", regex=False)
+            .str.extract(_NUM_RE)[0]
+        )
+        out.loc[bad] = pd.to_numeric(fixed, errors="coerce")
+    return out.astype(float)
+
+
+def clean_numeric(df: pd.DataFrame, cols):
+    for c in cols:
+        if c not in df.columns:
+            df[c] = np.nan
+        df[c] = (
+            df[c].astype(str)
+            .str.replace(",", ".", regex=False)
+            .str.extract(r"([0-9.]+)")[0]
+            .astype(float)
+        )
+    return df
+
+
+# ---------- Credit lookup ----------
+
+def norm_code(code: str) -> str:
+    if not code:
+        return ""
+    return re.sub(r"\s+", "", str(code).upper())
+
+
+def norm_name(name: str) -> str:
+    try:
+        return clean_course_name(name).lower()
+    except Exception:
+        # fallback: letters+spaces only
+        s = re.sub(r"[^A-Za-zÀ-ÿ\s]", " ", str(name) or "")
+        s = re.sub(r"\s+", " ", s).strip()
+        return s.lower()
+
+
+def _mapping_paths(base_dir: str | None, paths: Iterable[str] | None) -> List[str]:
+    return [os.path.join(base_dir or "", p) for p in (paths or CREDIT_MAPPING_FILES)]
+
+
+def load_credit_mappings(base_dir: str | None = None,
+                         paths: Iterable[str] | None = None) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """
+    Loads one or more mapping files and returns:
+      - code_to_credits: dict["201-SN2-RE"] -> 2.0
+      - name_to_credits: dict["differential calculus"] -> 2.0
+    Recognized filenames/columns are flexible.
+    """
+    code_to, name_to = {}, {}
+
+    for fn in _mapping_paths(base_dir, paths):
+        if not os.path.exists(fn):
+            continue
+        try:
+            m = pd.read_csv(fn)
+        except Exception:
+            continue
+
+        # lenient column discovery
+        cols = {c.strip().lower(): c for c in m.columns}
+        col_code = cols.get("class code") or cols.get("code") or cols.get("class_code") or cols.get("course code") or cols.get("ministerial code")
+        col_name = cols.get("course name") or cols.get("name") or cols.get("course") or cols.get("title")
+        col_cred = cols.get("credits") or cols.get("credit") or cols.get("cr")
+        if not col_cred:
+            continue
+
+        mm = m.copy()
+        for c in (col_code, col_name, col_cred):
+            if c and c in mm.columns:
+                mm[c] = mm[c].astype(str)
+
+        # coerce credits
+        mm["_credits_"] = pd.to_numeric(mm[col_cred], errors="coerce")
+        mm = mm[pd.notna(mm["_credits_"]) & (mm["_credits_"] > 0)]
+
+        if col_code and col_code in mm.columns:
+            for v, cr in zip(mm[col_code], mm["_credits_"]):
+                code_to[norm_code(v)] = float(cr)
+
+        if col_name and col_name in mm.columns:
+            for v, cr in zip(mm[col_name], mm["_credits_"]):
+                name_to[norm_name(v)] = float(cr)
+
+    return code_to, name_to
+
+
+def credit_mapping_mtime_sig(base_dir: str | None = None, paths: Iterable[str] | None = None) -> float:
+    """Return a combined mtime signature for known mapping files (cache-buster)."""
+    mtimes = []
+    for pth in _mapping_paths(base_dir, paths):
+        try:
+            if os.path.exists(pth):
+                mtimes.append(os.path.getmtime(pth))
+        except Exception:
+            pass
+    return float(sum(mtimes)) if mtimes else 0.0
+
+
+def autofill_credits(df_in: pd.DataFrame, code_to: Dict[str, float], name_to: Dict[str, float]) -> pd.DataFrame:
+    """
+    Returns a copy with Credits filled where missing/zero using:
+      1) Class Code match
+      2) Cleaned Course Name match
+    Adds a readonly 'Credits Source' column for debugging.
+    """
+    df = df_in.copy()
+    if "Credits" not in df.columns:
+        df["Credits"] = np.nan
+
+    # If empty, ensure debug column exists and return immediately
+    if df.empty:
+        if "Credits Source" not in df.columns:
+            df["Credits Source"] = None
+        return df
+
+    # Only rows without a positive credit value are looked up (code first, then name)
+    credits = pd.to_numeric(df["Credits"], errors="coerce")
+    source = pd.Series(pd.NA, index=df.index, dtype="string")
+    for col, table, norm, label in (("Class Code", code_to, norm_code, "code"),
+                                    ("Course Name", name_to, norm_name, "name")):
+        need = ~(credits.fillna(0) > 0)
+        if not need.any() or col not in df.columns or not table:
+            continue
+        found = df.loc[need, col].map(lambda v: table.get(norm(v)) if pd.notna(v) else None).dropna()
+        credits.loc[found.index] = found.astype(float)
+        source.loc[found.index] = label
+    credits.loc[~(credits.fillna(0) > 0)] = np.nan
+
+    df["Credits"] = credits
+    df["Credits Source"] = source
+    return df
+
+
+# ---------- CSV import ----------
+
+# Accepted ranges, same bounds as the review editor; values outside are reported and blanked
+VALID_RANGES = {"Your Grade": (0.0, 100.0), "Class Avg": (0.0, 100.0), "Std. Dev": (0.0, 50.0), "Credits": (0.0, 10.0)}
+
+
+@dataclass
+class CsvImport:
+    df: pd.DataFrame                                        # REQUIRED_COLS + "Class Code" + "Credits Source"
+    rows: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)   # first max_errors problems
+    n_errors: int = 0                                       # all problems, including unlisted ones
+
+
+def _normalize(raw: pd.DataFrame, header_map: Dict[str, str], first_row: int, report: CsvImport,
+               max_errors: int) -> pd.DataFrame:
+    """Rename, keep the template columns, coerce numerics and validate one chunk.
+    Bad cells become NaN and are recorded with their data row number (1 = first row
+    under the header; not a file line, since quoted fields can span lines); the row stays."""
+    df = raw.rename(columns=header_map)
+    df = df.loc[:, ~df.columns.duplicated()]
+    keep = REQUIRED_COLS + (["Class Code"] if "Class Code" in df.columns else [])
+    out = pd.DataFrame(index=df.index)
+    rows = np.arange(len(df)) + first_row
+
+    def _report(mask: np.ndarray, col: str, values, message: str) -> None:
+        hits = np.flatnonzero(mask)
+        report.n_errors += len(hits)
+        for i in hits[:max(0, max_errors - len(report.errors))]:
+            report.errors.append({"row": int(rows[i]), "column": col, "value": values[i], "error": message})
+
+    for col in keep:
+        if col not in df.columns:
+            out[col] = np.nan
+            continue
+        raw_col = df[col]
+        if col not in NUMERIC_COLS:
+            out[col] = raw_col
+            continue
+        num = coerce_numeric(raw_col)
+        given = raw_col.notna().to_numpy() & raw_col.astype(str).str.strip().ne("").to_numpy()
+        unparsed = given & num.isna().to_numpy()
+        lo, hi = VALID_RANGES[col]
+        out_of_range = (num.notna() & ((num < lo) | (num > hi))).to_numpy()
+        _report(unparsed, col, raw_col.to_numpy(), "not a number")
+        _report(out_of_range, col, raw_col.to_numpy(), f"outside {lo:g}–{hi:g}")
+        num[out_of_range] = np.nan
+        out[col] = num
+    names = out["Course Name"]
+    _report((names.isna() | names.astype(str).str.strip().eq("")).to_numpy(), "Course Name",
+            names.to_numpy(), "missing course name")
+    return out
+
+
+def _finish(df: pd.DataFrame, code_to: Dict[str, float], name_to: Dict[str, float]) -> pd.DataFrame:
+    """Fill missing/zero Credits from the mappings, then count any still missing as 1.
+    Class Code is kept ("" when the file has none): r_bands uses it for course-family priors."""
+    df = autofill_credits(df, code_to, name_to)
+    df["Credits"] = pd.to_numeric(df["Credits"], errors="coerce").fillna(1)
+    df.loc[df["Credits"] == 0, "Credits"] = 1
+    df["Class Code"] = df["Class Code"].fillna("").astype(str).str.strip() if "Class Code" in df.columns else ""
+    return df[REQUIRED_COLS + ["Class Code", "Credits Source"]].reset_index(drop=True)
+
+
+def _read_chunks(source, size, chunksize, on_progress, max_errors, engine: str):
+    report = CsvImport(df=pd.DataFrame(columns=REQUIRED_COLS))
+    parts: List[pd.DataFrame] = []
+    header_map: Dict[str, str] | None = None
+    row = 1  # data rows, header excluded
+    for chunk in pd.read_csv(source, encoding="utf-8-sig", dtype=str, chunksize=chunksize,
+                             skipinitialspace=True, engine=engine):
+        if header_map is None:
+            header_map = csv_header_map(chunk.columns)
+        parts.append(_normalize(chunk, header_map, row, report, max_errors))
+        row += len(chunk)
+        report.rows += len(chunk)
+        if on_progress is not None:
+            frac = None
+            if size and hasattr(source, "tell"):
+                try:
+                    frac = min(1.0, source.tell() / size)
+                except Exception:
+                    frac = None
+            on_progress(report.rows, frac)
+    return report, parts
+
+
+def import_course_csv(source, code_to: Dict[str, float], name_to: Dict[str, float], chunksize: int = 5000,
+                      on_progress: Callable[[int, float | None], None] | None = None,
+                      max_errors: int = 200) -> CsvImport:
+    """
+    Streaming CSV-tab import for large exports: pandas' C parser reads `chunksize`
+    rows at a time as text, headers are mapped once from the first chunk, and each
+    chunk is reduced to the template columns (floats) before the next one is read.
+    Problems are collected per cell instead of aborting. `on_progress(rows, fraction)`
+    is called after every chunk (fraction is None when the size is unknown).
+    """
+    size = getattr(source, "size", None)
+    if size is None and isinstance(source, (str, os.PathLike)) and os.path.exists(source):
+        size = os.path.getsize(source)
+    try:
+        report, parts = _read_chunks(source, size, chunksize, on_progress, max_errors, engine="c")
+    except pd.errors.ParserError:
+        # ragged rows the C tokenizer rejects: start over with the (slower) python parser
+        if hasattr(source, "seek"):
+            source.seek(0)
+        report, parts = _read_chunks(source, size, chunksize, on_progress, max_errors, engine="python")
+    if parts:
+        report.df = _finish(pd.concat(parts, ignore_index=True), code_to, name_to)
+    else:
+        report.df = _finish(pd.DataFrame(columns=REQUIRED_COLS), code_to, name_to)
+    return report
+
+
+def prepare_course_table(df_raw: pd.DataFrame, code_to: Dict[str, float],
+                         name_to: Dict[str, float]) -> pd.DataFrame:
+    """
+    The CSV tab's import for an already-loaded table: detect headers, keep the
+    template columns, clean numbers, fill missing/zero Credits from the mappings,
+    and count any still missing as 1.
+    """
+    report = CsvImport(df=pd.DataFrame(columns=REQUIRED_COLS))
+    df = _normalize(df_raw, csv_header_map(df_raw.columns), 1, report, max_errors=0)
+    return _finish(df, code_to, name_to)
@@ -0,0 +1,81 @@
+# course_names.py — course-name cleanup shared by OCR and CSV import (stdlib only)
+# Lives apart from ocr_utils so course_data and the CLI can normalise names without
+# importing PIL / OpenCV / pytesseract.
+
+from __future__ import annotations
+import re
+
+__all__ = ["NAV_JUNK_PREFIXES", "clean_course_name"]
+
+NAV_JUNK_PREFIXES = tuple([
+    "assignments", "calendar", "class forum", "course documents", "grades",
+    "list of my absences", "online classes", "recommended websites",
+    "teachers info", "my services", "team forums", "current average",
+    "omnivox", "léa", "angus beauregard", "john abbott college"
+])
+_HEADING_NAMES = ("current average", "team forums", "assignments", "calendar",
+                  "list of my absences", "teachers info", "recommended websites")
+
+# clean_course_name steps
+_CN_ROWNUM_RE = re.compile(r"^[\s|>•\-]*\d+\.\s*")
+_CN_DOCS_CRUMB_RE = re.compile(r"(?i)course\s*documents\s*>\s*")
+_CN_FORUMS_CRUMB_RE = re.compile(r"(?i)team\s*forums\s*>\s*")
+_CN_FRACTION_RE = re.compile(r"\b\d+(?:[.,]\d+)?\s*/\s*\d+(?:[.,]\d+)?\b")
+_CN_TRAILING_NUM_RE = re.compile(r"(?:\s*\b\d{1,3}(?:[.,]\d{1,2})?\s*%?)+\s*$")
+_CN_LEADING_NUM_RE = re.compile(r"^\s*\d+\s*")
+_CN_DIGITS_RE = re.compile(r"\d+")
+_CN_TRAILING_DASHES_RE = re.compile(r"\s*--+\s*$")
+_CN_NON_ALPHA_RE = re.compile(r"[^A-Za-zÀ-ÿ\s]")
+_WS_RE = re.compile(r"\s+")
+
+
+def clean_course_name(name: str) -> str:
+    if not name:
+        return ""
+    s = str(name)
+
+    # Normalize punctuation
+    s = s.replace("—", "-").replace("–", "-")
+    s = s.replace("|", " ").replace("»", " ").replace("«", " ")
+
+    # Drop row-number prefixes like "1." / "2."
+    s = _CN_ROWNUM_RE.sub("", s)
+
+    # Remove any known left-nav prefixes, headers, or user name artifacts
+    s_low = s.lower().strip()
+    for pref in NAV_JUNK_PREFIXES:
+        if s_low.startswith(pref):
+            s = s[len(pref):].lstrip(" :>-,.|")
+            s_low = s.lower().strip()
+
+    # Remove embedded crumbs such as "Course documents >" or "Team Forums >"
+    s = _CN_DOCS_CRUMB_RE.sub("", s)
+    s = _CN_FORUMS_CRUMB_RE.sub("", s)
+
+    # --- Strip numeric noise from course names ---
+    # 1) Fractions like "19.3/23" anywhere in the string
+    s = _CN_FRACTION_RE.sub("", s)
+    # 2) Trailing percentages or numeric tokens like "84", "84%", "42.2" etc.
+    s = _CN_TRAILING_NUM_RE.sub("", s)
+    # 3) Any stray leading numbers that remain
+    s = _CN_LEADING_NUM_RE.sub("", s)
+
+    # Final guard: drop any remaining digits anywhere in the name
+    s = _CN_DIGITS_RE.sub("", s)
+
+    # Trim trailing dashes and punctuation
+    s = _CN_TRAILING_DASHES_RE.sub("", s)
+    s = s.strip(" .-–—")
+
+    # HARD RULE: allow only letters (incl. accents) and spaces — remove any other symbols
+    # This prevents artifacts like "? . General Chemistry"
+    s = _CN_NON_ALPHA_RE.sub(" ", s)
+
+    # Collapse whitespace (again after symbol stripping)
+    s = _WS_RE.sub(" ", s).strip()
+
+    # Guard against heading-like leftovers becoming names
+    if s.lower() in _HEADING_NAMES:
+        return ""
+
+    return s
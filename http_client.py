@@ -0,0 +1,71 @@
+# http_client.py — one pooled, keep-alive HTTP session for Supabase traffic (no Streamlit)
+# Login, sign-up and the profile fetch all go through the same requests.Session, so
+# TCP+TLS setup is paid once per pooled connection instead of once per call. Every
+# request gets a (connect, read) timeout, and failed connections (plus gateway errors
+# on GET/HEAD) are retried with backoff, so a hung or flapping Supabase can't hold a
+# Streamlit script thread indefinitely.
+
+from __future__ import annotations
+import os
+from typing import Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+__all__ = ["DEFAULT_TIMEOUT", "PooledSession", "make_session"]
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT: Tuple[float, float] = (3.05, 10.0)
+
+# Gateway errors, retried only for idempotent methods: a 504 on a POST (sign-up, row
+# insert) may come after the server committed it, so a retry could duplicate it. urllib3
+# retries connect errors for every method (nothing was sent), so POSTs still get those.
+_RETRY_STATUS = (502, 503, 504)
+_RETRY_METHODS = frozenset({"GET", "HEAD"})
+
+
+class PooledSession(requests.Session):
+    """requests.Session that applies a default timeout to every call."""
+
+    def __init__(self, timeout: Tuple[float, float] = DEFAULT_TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def make_session(pool_size: int | None = None, retries: int = 3, backoff: float = 0.3,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT) -> PooledSession:
+    """
+    Keep-alive session keeping up to `pool_size` connections per host (RSCORE_HTTP_POOL,
+    default 10; a burst beyond that opens short-lived extras rather than queueing) and `retries`
+    attempts on connection errors (any method) and gateway 5xx (GET/HEAD only), sleeping
+    backoff·2^n between them.
+    """
+    size = pool_size or _env_int("RSCORE_HTTP_POOL", 10)
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0,                      # a read timeout is not retried: the call may have landed
+        status=retries,
+        status_forcelist=_RETRY_STATUS,
+        allowed_methods=_RETRY_METHODS,
+        backoff_factor=backoff,
+        respect_retry_after_header=True,
+        raise_on_status=False,       # hand the last 5xx back to the caller like any response
+    )
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=size, pool_block=False, max_retries=retry)
+    session = PooledSession(timeout=timeout)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,144 @@
+# ocr_cache.py — content-addressed cache for OCR results (no Streamlit)
+# Keyed by sha256(image bytes + OCR config + parser version). Memory tier is an
+# LRU bounded by bytes; an optional disk tier keeps results across restarts.
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+__all__ = ["OcrCache", "ocr_cache_key"]
+
+
+def ocr_cache_key(file_bytes: bytes, config: str = "", parser_version: str = "") -> str:
+    """Hash of the image content plus everything that changes the OCR output."""
+    h = hashlib.sha256()
+    h.update(file_bytes)
+    h.update(b"\0")
+    h.update(config.encode("utf-8"))
+    h.update(b"\0")
+    h.update(parser_version.encode("utf-8"))
+    return h.hexdigest()
+
+
+class OcrCache:
+    """Thread-safe two-tier cache of {"text": str, "rows": [dict, ...]} entries.
+
+    - memory: OrderedDict LRU, evicts oldest entries once `max_bytes` is exceeded
+    - disk (optional): one JSON file per key under `disk_dir`
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, disk_dir: str | None = None):
+        self.max_bytes = int(max_bytes)
+        self.disk_dir = disk_dir or None
+        self._mem: "OrderedDict[str, tuple[Dict[str, Any], int]]" = OrderedDict()
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.disk_dir:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+            except Exception:
+                self.disk_dir = None
+
+    # ---------- Public API ----------
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return _copy_entry(hit[0])
+        value = self._disk_get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._mem_put(key, value)
+        return _copy_entry(value)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        value = _copy_entry(value)
+        with self._lock:
+            self._mem_put(key, value)
+        self._disk_put(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._mem_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._mem),
+                "bytes": self._mem_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "disk_dir": self.disk_dir,
+            }
+
+    # ---------- Memory tier ----------
+
+    def _mem_put(self, key: str, value: Dict[str, Any]) -> None:
+        size = _entry_size(value)
+        if size > self.max_bytes:
+            return
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._mem_bytes -= old[1]
+        self._mem[key] = (value, size)
+        self._mem_bytes += size
+        while self._mem_bytes > self.max_bytes and self._mem:
+            _, (_, sz) = self._mem.popitem(last=False)
+            self._mem_bytes -= sz
+
+    # ---------- Disk tier ----------
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir or "", key[:2], f"{key}.json")
+
+    def _disk_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except Exception:
+            return None
+
+    def _disk_put(self, key: str, value: Dict[str, Any]) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(value, fh, ensure_ascii=False)
+            os.replace(tmp, path)  # atomic, so concurrent readers never see half a file
+        except Exception:
+            pass
+
+
+def _entry_size(value: Dict[str, Any]) -> int:
+    try:
+        return len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+    except Exception:
+        return len(str(value))
+
+
+def _copy_entry(value: Dict[str, Any]) -> Dict[str, Any]:
+    """Shallow-copy rows so callers can mutate them without corrupting the cache."""
+    out = dict(value)
+    out["rows"] = [dict(r) for r in value.get("rows") or []]
+    return out
@@ -0,0 +1,336 @@
+# ocr_engine.py — the Import tab's OCR pipeline behind one stable API (no Streamlit)
+# decode → preprocess → recognize → parse → merge, plus batch fan-out, the result
+# cache and engine status. The building blocks stay where they are (ocr_utils for
+# ROI crop / scored Tesseract passes / parsers, ocr_cache, tesseract_pool); pages
+# import this module once and keep a single OcrEngine in st.cache_resource, so a
+# rerun redefines nothing and caching, pooling and benchmarks all hook in here.
+
+from __future__ import annotations
+import io
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+try:
+    import pytesseract  # type: ignore
+except Exception:  # pragma: no cover
+    pytesseract = None  # type: ignore
+
+try:
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover
+    cv2 = None  # type: ignore
+
+try:
+    import tesseract_pool  # type: ignore  # optional persistent workers (needs tesserocr)
+except Exception:  # pragma: no cover
+    tesseract_pool = None  # type: ignore
+
+import ocr_utils
+from ocr_cache import OcrCache, ocr_cache_key
+
+__all__ = [
+    "EngineConfig",
+    "OcrEngine",
+    "configure_tesseract",
+    "default_cache",
+    "detect_tesseract",
+    "engine_ready",
+    "tesseract_status",
+]
+
+# ---------- Tesseract discovery ----------
+
+TESSERACT_BINS = (
+    "/usr/bin/tesseract",
+    "/usr/local/bin/tesseract",
+    "/opt/homebrew/bin/tesseract",                      # macOS (Apple Silicon)
+    "C:\\Program Files\\Tesseract-OCR\\tesseract.exe",  # Windows (optional)
+)
+TESSDATA_DIRS = (
+    "/usr/share/tesseract-ocr/5/tessdata",       # Ubuntu 22.04+ (Streamlit Cloud)
+    "/usr/share/tesseract-ocr/4.00/tessdata",    # Older Linux systems
+    "/usr/share/tesseract-ocr/tessdata",
+    "/usr/local/share/tessdata",                 # Linux local installs
+    "/opt/homebrew/share/tessdata",              # macOS Homebrew
+)
+
+
+def configure_tesseract() -> Dict[str, Any]:
+    """Point pytesseract at the tesseract binary (PATH first) and TESSDATA_PREFIX at
+    the language models, unless the environment already names a valid directory."""
+    found: Dict[str, Any] = {"tesseract_cmd": None, "tessdata": None}
+    if pytesseract is not None:
+        for p in (shutil.which("tesseract"),) + TESSERACT_BINS:
+            if p and os.path.isfile(p):
+                pytesseract.pytesseract.tesseract_cmd = p
+                found["tesseract_cmd"] = p
+                break
+    td = os.environ.get("TESSDATA_PREFIX")
+    if not (td and os.path.isdir(td)):
+        td = next((d for d in TESSDATA_DIRS if os.path.isdir(d)), None)
+        if td:
+            os.environ["TESSDATA_PREFIX"] = td
+    found["tessdata"] = td
+    return found
+
+
+# Runs at import (once per process) and again on tesseract_status(refresh=True).
+TESSERACT_PATHS = configure_tesseract()
+
+
+def _installed_languages(tessdata: str | None) -> List[str] | None:
+    """Language models in the tessdata directory (or its tessdata/ subdirectory, the
+    older parent-directory TESSDATA_PREFIX convention), else from `tesseract
+    --list-langs` (one subprocess); None when none of these can tell."""
+    for d in (tessdata, os.path.join(tessdata, "tessdata") if tessdata else None):
+        if d and os.path.isdir(d):
+            langs = sorted(fn[:-len(".traineddata")] for fn in os.listdir(d) if fn.endswith(".traineddata"))
+            if langs:
+                return langs
+    if pytesseract is not None:
+        try:
+            return sorted(pytesseract.get_languages(config="")) or None
+        except Exception:
+            return None
+    return None
+
+
+def detect_tesseract(lang: str = "eng+fra") -> Dict[str, Any]:
+    """Probe which Tesseract backend is usable: the shared pool of persistent
+    tesserocr workers if installed, else pytesseract + the tesseract binary. Also
+    records the binary, tessdata directory and whether every `lang` model exists.
+    Spawns `tesseract --version` on the pytesseract path — use tesseract_status()."""
+    status: Dict[str, Any] = {"has_pytesseract": pytesseract is not None, "binary_ok": False,
+                              "version": None, "error": None, "backend": None,
+                              "tesseract_cmd": TESSERACT_PATHS.get("tesseract_cmd"),
+                              "tessdata": os.environ.get("TESSDATA_PREFIX") or TESSERACT_PATHS.get("tessdata"),
+                              "languages": None, "missing_langs": []}
+    if tesseract_pool is not None:
+        try:
+            pool = tesseract_pool.get_tesseract_pool(lang)
+        except Exception as e:
+            pool = None
+            status["pool_error"] = str(e)
+        if pool is not None:
+            status.update(binary_ok=True, version=pool.version(), backend="tesserocr-pool")
+        elif tesseract_pool.pool_error(lang):
+            status["pool_error"] = tesseract_pool.pool_error(lang)
+    if status["backend"] is None:
+        if pytesseract is None:
+            status["error"] = "pytesseract not installed in environment"
+            return status
+        try:
+            status["version"] = str(pytesseract.get_tesseract_version())
+            status["binary_ok"] = True
+            status["backend"] = "pytesseract"
+        except Exception as e:
+            status["error"] = str(e)
+            return status
+    langs = _installed_languages(status["tessdata"])
+    status["languages"] = langs
+    if langs is not None:
+        status["missing_langs"] = [code for code in lang.split("+") if code and code not in langs]
+        if status["missing_langs"]:
+            status["error"] = "missing traineddata: " + ", ".join(status["missing_langs"])
+    return status
+
+
+# lang → detect_tesseract() result; detection runs once per process unless refreshed
+_STATUS: Dict[str, Dict[str, Any]] = {}
+_STATUS_LOCK = threading.Lock()
+
+
+def tesseract_status(lang: str = "eng+fra", refresh: bool = False) -> Dict[str, Any]:
+    """Cached detect_tesseract(lang) (a copy; pool counters are live). Concurrent first
+    callers wait for one probe instead of each spawning `tesseract`; refresh=True
+    re-runs configure_tesseract() and re-probes, e.g. after installing the binary
+    or language data."""
+    global TESSERACT_PATHS
+    with _STATUS_LOCK:
+        if refresh:
+            # pick up a binary / tessdata installed since import, and let a failed pool retry
+            TESSERACT_PATHS = configure_tesseract()
+            if tesseract_pool is not None:
+                tesseract_pool.reset_pool_errors()
+        if refresh or lang not in _STATUS:
+            _STATUS[lang] = detect_tesseract(lang)
+        status = dict(_STATUS[lang])
+    if status.get("backend") == "tesserocr-pool":
+        pool = tesseract_pool.get_tesseract_pool(lang)
+        if pool is not None:
+            status["pool"] = pool.stats()
+    return status
+
+
+def engine_ready(status: Dict[str, Any]) -> bool:
+    if status.get("missing_langs"):
+        return False
+    return status.get("backend") == "tesserocr-pool" or bool(status.get("has_pytesseract") and status.get("binary_ok"))
+
+
+# ---------- Configuration ----------
+
+@dataclass(frozen=True)
+class EngineConfig:
+    """Everything that changes OCR output. It is all part of the cache key, so bump
+    parser_version whenever preprocessing or a parser changes behaviour."""
+    lang: str = "eng+fra"
+    configs: Tuple[str, ...] = ("--oem 1 --psm 6", "--oem 1 --psm 4", "--oem 1 --psm 3")
+    threshold: float = ocr_utils.DEFAULT_SCORE_THRESHOLD  # escalate --psm only below this
+    parser_version: str = "3"
+    # "layout" parses Tesseract word boxes by table column, "text" uses the regex
+    # passes in parse_omnivox_text, "auto" tries layout first and falls back to text.
+    parser_mode: str = "auto"
+
+    @classmethod
+    def from_env(cls) -> "EngineConfig":
+        return cls(parser_mode=os.environ.get("RSCORE_OCR_PARSER", "auto"))
+
+    def cache_config(self) -> str:
+        return f"{self.lang}|{'|'.join(self.configs)}|{self.threshold}"
+
+    def cache_version(self) -> str:
+        return f"{self.parser_version}|{self.parser_mode}"
+
+
+def default_cache() -> OcrCache:
+    """OCR result cache sized from RSCORE_OCR_CACHE_MB / RSCORE_OCR_CACHE_DIR."""
+    max_mb = float(os.environ.get("RSCORE_OCR_CACHE_MB", "32"))
+    return OcrCache(
+        max_bytes=int(max_mb * 1024 * 1024),
+        disk_dir=os.environ.get("RSCORE_OCR_CACHE_DIR") or None,
+    )
+
+
+# ---------- Engine ----------
+
+class OcrEngine:
+    """Screenshot bytes → app rows. Stateless apart from the shared cache, so one
+    instance serves every session and worker thread."""
+
+    def __init__(self, config: EngineConfig | None = None, cache: OcrCache | None = None):
+        self.config = config or EngineConfig()
+        self.cache = cache
+
+    # -- stages --
+
+    def decode(self, file_bytes: bytes) -> Image.Image:
+        img = Image.open(io.BytesIO(file_bytes))
+        img.load()
+        return img
+
+    def preprocess(self, pil_img: Image.Image, info: Dict[str, Any] | None = None) -> Image.Image:
+        """Crop to the grades table/cards + light denoise + binarize + upscale.
+        Detected regions are written to info["rois"] when a dict is passed."""
+        img = pil_img.convert("L")
+        if cv2 is None:
+            return img
+        arr = np.array(img)
+        try:
+            # Drop left nav / headers before OCR instead of junk-filtering them afterwards
+            arr = ocr_utils.crop_to_grade_rois(arr, info)
+            arr = cv2.bilateralFilter(arr, d=5, sigmaColor=55, sigmaSpace=55)
+            arr = cv2.adaptiveThreshold(arr, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                        cv2.THRESH_BINARY, 35, 10)
+            h, w = arr.shape
+            if max(h, w) < 1500:
+                arr = cv2.resize(arr, None, fx=1.5, fy=1.5, interpolation=cv2.INTER_CUBIC)
+            return Image.fromarray(arr)
+        except Exception:
+            return img
+
+    def recognize(self, prep: Image.Image) -> ocr_utils.OcrResult:
+        """One image_to_data pass scored by word confidence + course-code hits;
+        other --psm modes only run when the score is below the threshold."""
+        cfg = self.config
+        return ocr_utils.recognize_scored(prep, lang=cfg.lang, configs=cfg.configs, threshold=cfg.threshold)
+
+    def parse(self, res: ocr_utils.OcrResult) -> Tuple[List[Dict[str, Any]], str]:
+        """(rows, parser used) for one recognized screenshot."""
+        mode = self.config.parser_mode
+        if mode in ("auto", "layout") and res.words:
+            rows = ocr_utils.parse_words_layout(res.words)
+            if rows or mode == "layout":
+                return rows, "layout"
+        if mode == "layout":
+            return [], "layout"
+        return ocr_utils.parse_omnivox_text(res.text or ""), "text"
+
+    @staticmethod
+    def merge(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+        return ocr_utils.merge_rows_any(rows)
+
+    # -- pipeline --
+
+    def status(self, refresh: bool = False) -> Dict[str, Any]:
+        """Engine capabilities, detected once per process (refresh=True re-checks)."""
+        return tesseract_status(self.config.lang, refresh=refresh)
+
+    def cache_key(self, file_bytes: bytes) -> str:
+        return ocr_cache_key(file_bytes, self.config.cache_config(), self.config.cache_version())
+
+    def extract(self, file_bytes: bytes) -> Tuple[List[Dict[str, Any]], Dict[str, Any], str]:
+        """
+        OCR one screenshot. Returns (rows, engine_status, text_preview).
+        Repeat uploads of the same image are served from the cache.
+        """
+        status = self.status()
+        if not engine_ready(status):
+            return [], status, ""
+
+        key = self.cache_key(file_bytes) if self.cache is not None else None
+        if key is not None:
+            hit = self.cache.get(key)
+            if hit is not None:
+                return hit["rows"], {**status, "ocr_pass": hit.get("ocr_pass"), "cached": True}, (hit.get("text") or "")[:800]
+
+        info: Dict[str, Any] = {}
+        prep = self.preprocess(self.decode(file_bytes), info)
+        try:
+            res = self.recognize(prep)
+        except Exception as e:
+            return [], {**status, "error": str(e)}, ""
+        rows, parser_used = self.parse(res)
+        text = res.text or ""
+        status = {**status, "ocr_pass": {**res.summary(), "parser": parser_used,
+                                         "rois": info.get("rois", [])}}
+        if key is not None:
+            self.cache.put(key, {"text": text, "rows": rows, "ocr_pass": status["ocr_pass"]})
+        return rows, status, text[:800]
+
+    def extract_many(self, files_bytes, max_workers: Optional[int] = None) -> List[Any]:
+        """
+        Fan the uploads out to a pool sized to the available cores and return one
+        (rows, engine_status, text_preview) tuple per file, in upload order.
+        A file that fails yields its exception instead of a tuple.
+
+        Threads (not processes) are enough here: each pytesseract call already runs
+        in its own `tesseract` subprocess (tesserocr and cv2 release the GIL).
+        """
+        files_bytes = list(files_bytes)
+        if not files_bytes:
+            return []
+
+        def _one(b):
+            try:
+                return self.extract(b)
+            except Exception as e:
+                return e
+
+        workers = max_workers or min(len(files_bytes), os.cpu_count() or 1)
+        if workers <= 1:
+            return [_one(b) for b in files_bytes]
+        # One OpenMP thread per tesseract process, otherwise N parallel runs oversubscribe the cores
+        os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_one, files_bytes))
+
+    def warm_up(self) -> Dict[str, Any]:
+        return ocr_utils.warm_up()
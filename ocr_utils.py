@@ -2,7 +2,6 @@
 # Works locally with Tesseract (eng+fra). No API keys or internet required.
 
 from __future__ import annotations
-import io
 import re
 from dataclasses import dataclass
 from typing import List, Dict, Any, Tuple
@@ -10,6 +9,10 @@ from typing import List, Dict, Any, Tuple
 import numpy as np
 from PIL import Image
 
+# Course-name cleanup is shared with the CSV import (which shouldn't load the
+# imaging stack just to normalise a name); re-exported here for existing callers.
+from course_names import NAV_JUNK_PREFIXES, clean_course_name
+
 try:
     import pytesseract  # type: ignore
 except Exception:  # pragma: no cover
@@ -21,109 +24,233 @@ except Exception:  # pragma: no cover
     cv2 = None  # type: ignore
 
 try:
-    import easyocr  # type: ignore
-    _EASYOCR_READER = easyocr.Reader(['en', 'fr'], gpu=False)
+    import tesseract_pool  # type: ignore  # optional persistent workers (needs tesserocr)
 except Exception:  # pragma: no cover
-    easyocr = None  # type: ignore
-    _EASYOCR_READER = None
+    tesseract_pool = None  # type: ignore
 
 __all__ = [
-    "preprocess_for_ocr",
-    "ocr_text",
-    "extract_courses_from_text",
-    "merge_by_code",
-    "extract_from_image_file",
-    "extract_from_image_file_debug",
-    "CourseRow",
+    "detect_grade_rois",
+    "crop_to_grade_rois",
+    "recognize_scored",
+    "OcrResult",
+    "clean_course_name",
+    "parse_omnivox_text",
+    "split_projected_cards",
+    "parse_words_layout",
+    "merge_rows_any",
+    "row_to_dict_any",
+    "warm_up",
 ]
 
 # ---------- Patterns ----------
-COURSE_CODE = r"\b\d{3}\s*-\s*[A-Z]{2,3}[A-Z]?\s*-\s*[A-Z0-9]{2}\b"  # e.g., 201-SN2-RE
-PCT = r"(\d{1,3}(?:[.,]\d{1,2})?)\s*%?"
+# Looser, case-insensitive code pattern used by the Import tab parsers and OCR scoring
+COURSE_CODE_RE = re.compile(r"\b\d{3}\s*-\s*[A-Z0-9]{2,4}\s*-\s*[A-Z0-9]{2,3}\b", re.I)
+_LABEL_HIT_RE = re.compile(r"(?i)projected\s*grade|class\s*average|moyenne")
 
-# Bilingual labels (lowercased comparisons)
-LABEL_GRADE = r"(?:your\s*current\s*grade|projected\s*grade|current\s*grade|your\s*grade|note|résultat|resultat|grade)"
-LABEL_AVG   = r"(?:class\s*average|moyenne\s*(?:de\s*classe)?|average)"
-LABEL_SD    = r"(?:std\.?\s*dev\.?|ecart[- ]?type|écart[- ]?type|standard\s*deviation)"
+# Segmentation modes tried in order; later ones only run if the score stays low
+DEFAULT_OCR_CONFIGS: Tuple[str, ...] = ("--oem 1 --psm 6", "--oem 1 --psm 4", "--oem 1 --psm 3")
+DEFAULT_SCORE_THRESHOLD = 0.7
 
 # ---------- Data model ----------
 @dataclass
-class CourseRow:
-    course_name: str = ""
-    class_code: str = ""
-    your_grade: float | None = None
-    class_avg:  float | None = None
-    std_dev:    float | None = None
-    credits:    float | None = None
-    source:     str = "ocr"
-
-    def to_app_row(self) -> Dict[str, Any]:
+class OcrResult:
+    text: str = ""
+    config: str = ""              # the Tesseract config that won
+    psm: int | None = None
+    passes: int = 0               # how many Tesseract runs it took
+    score: float = 0.0
+    mean_conf: float = 0.0        # mean word confidence, 0-100
+    code_hits: int = 0
+    words: Dict[str, list] | None = None  # raw image_to_data dict of the winning pass
+    backend: str = ""             # "tesserocr-pool" or "pytesseract"
+
+    def summary(self) -> Dict[str, Any]:
         return {
-            "Course Name": self.course_name,
-            "Your Grade":  self.your_grade,
-            "Class Avg":   self.class_avg,
-            "Std. Dev":    self.std_dev,
-            "Credits":     self.credits,
+            "backend": self.backend,
+            "config": self.config,
+            "psm": self.psm,
+            "passes": self.passes,
+            "score": round(self.score, 3),
+            "mean_conf": round(self.mean_conf, 1),
+            "code_hits": self.code_hits,
         }
 
 # ---------- Image pre-processing ----------
 
-def preprocess_for_ocr(pil_img: Image.Image) -> Image.Image:
-    """Grayscale → light denoise → adaptive threshold → trim → upscale small images."""
-    img = pil_img.convert("L")
+Roi = Tuple[int, int, int, int]  # x, y, w, h
+
+
+def _table_roi(gray: np.ndarray) -> Roi | None:
+    """Bounding box of the Grades table, found from its stack of horizontal row separators."""
+    H, W = gray.shape
+    dark = np.where(gray < 230, 255, 0).astype(np.uint8)
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(W // 4, 40), 1))
+    lines = cv2.morphologyEx(dark, cv2.MORPH_OPEN, kernel)
+    contours, _ = cv2.findContours(lines, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    segs = sorted((cv2.boundingRect(c) for c in contours), key=lambda b: b[1])
+    # Row separators of one table share their left edge and width
+    best: List[Roi] = []
+    for x, y, w, h in segs:
+        group = [b for b in segs if abs(b[0] - x) <= 0.05 * W and abs(b[2] - w) <= 0.1 * W]
+        if len(group) > len(best):
+            best = group
+    if len(best) < 3:
+        return None
+    ys = [b[1] for b in best]
+    gap = int(np.median(np.diff(ys))) if len(ys) > 1 else 0
+    x0 = min(b[0] for b in best)
+    x1 = max(b[0] + b[2] for b in best)
+    y0 = max(0, min(ys) - gap)          # keep the header row above the first separator
+    y1 = min(H, max(ys) + gap)
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def _card_rois(gray: np.ndarray) -> List[Roi]:
+    """White, roughly rectangular panels (mobile "Projected grade" cards) on a darker background."""
+    H, W = gray.shape
+    white = np.where(gray >= 250, 255, 0).astype(np.uint8)
+    contours, _ = cv2.findContours(white, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    out: List[Roi] = []
+    for c in contours:
+        x, y, w, h = cv2.boundingRect(c)
+        area = w * h
+        if w < 0.5 * W or not (0.02 * W * H <= area <= 0.8 * W * H):
+            continue
+        if cv2.contourArea(c) / float(area) < 0.85:
+            continue
+        out.append((x, y, w, h))
+    return sorted(out, key=lambda b: b[1])
+
+
+def detect_grade_rois(gray: np.ndarray) -> List[Roi]:
+    """Regions worth OCRing: the grades table if there is one, else the grade cards, else []."""
     if cv2 is None:
-        return img
-    arr = np.array(img)
+        return []
     try:
-        arr = cv2.bilateralFilter(arr, d=7, sigmaColor=75, sigmaSpace=75)
-        arr = cv2.adaptiveThreshold(arr, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                    cv2.THRESH_BINARY, 35, 10)
-        # Trim large white borders
-        contours, _ = cv2.findContours(255 - arr, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        if contours:
-            x, y, w, h = cv2.boundingRect(np.vstack(contours))
-            pad = 6
-            x = max(0, x - pad); y = max(0, y - pad)
-            arr = arr[y:y + h + 2*pad, x:x + w + 2*pad]
-        # Upscale mobile-size screenshots
-        H, W = arr.shape
-        if max(W, H) < 1500:
-            arr = cv2.resize(arr, None, fx=1.5, fy=1.5, interpolation=cv2.INTER_CUBIC)
-        return Image.fromarray(arr)
+        table = _table_roi(gray)
+        if table is not None:
+            return [table]
+        return _card_rois(gray)
     except Exception:
-        return img
+        return []
+
+
+def crop_to_grade_rois(gray: np.ndarray, info: Dict[str, Any] | None = None) -> np.ndarray:
+    """Crop a grayscale screenshot to its grade regions (cards are stacked vertically).
+
+    Falls back to the full image when nothing is found or the regions cover under 5%
+    of it. Detected boxes are written to info["rois"] for the debug log.
+    """
+    rois = detect_grade_rois(gray)
+    H, W = gray.shape
+    if info is not None:
+        info["rois"] = [list(map(int, r)) for r in rois]
+    if not rois or sum(w * h for _, _, w, h in rois) < 0.05 * W * H:
+        return gray
+    crops = [gray[y:y + h, x:x + w] for x, y, w, h in rois]
+    if len(crops) == 1:
+        return crops[0]
+    width = max(c.shape[1] for c in crops)
+    sep = np.full((20, width), 255, dtype=gray.dtype)
+    parts: List[np.ndarray] = []
+    for c in crops:
+        if c.shape[1] < width:
+            c = np.hstack([c, np.full((c.shape[0], width - c.shape[1]), 255, dtype=gray.dtype)])
+        parts.extend([c, sep])
+    return np.vstack(parts[:-1])
+
 
 # ---------- OCR ----------
 
-def ocr_text(pil_img: Image.Image, lang: str = "eng+fra") -> str:
-    # Prefer EasyOCR if available — tends to be more robust on UI screenshots
-    if _EASYOCR_READER is not None:
+def warm_up() -> Dict[str, Any]:
+    """Preload the OCR engines (e.g. at server start) so the first upload pays no load cost."""
+    return {
+        "tesseract": pytesseract is not None,
+        "tesseract_pool": tesseract_pool is not None and tesseract_pool.get_tesseract_pool() is not None,
+    }
+
+
+def _text_from_data(data: Dict[str, list]) -> str:
+    """Rebuild image_to_string-style text from an image_to_data dict (one line per Tesseract line)."""
+    lines: List[str] = []
+    cur_key = None
+    cur: List[str] = []
+    for i, word in enumerate(data.get("text", [])):
+        word = (word or "").strip()
+        if not word:
+            continue
+        key = (data["page_num"][i], data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        if key != cur_key and cur:
+            lines.append(" ".join(cur))
+            cur = []
+        cur_key = key
+        cur.append(word)
+    if cur:
+        lines.append(" ".join(cur))
+    return "\n".join(lines)
+
+
+def _score_pass(data: Dict[str, list], text: str) -> Tuple[float, float, int]:
+    """Score = 0.8 × mean word confidence (0-1) + 0.2 if the text has course codes or card labels."""
+    confs = []
+    for word, conf in zip(data.get("text", []), data.get("conf", [])):
         try:
-            np_img = np.array(pil_img.convert('RGB'))
-            results = _EASYOCR_READER.readtext(np_img, detail=0, paragraph=True)
-            return "\n".join(results)
+            c = float(conf)
         except Exception:
-            pass  # fall back to Tesseract
-
-    if pytesseract is None:
-        raise ImportError(
-            "No OCR engine available. Install either easyocr or pytesseract (with tesseract-ocr)."
-        )
-    prep = preprocess_for_ocr(pil_img)
-    # Try a couple of segmentation modes for tougher layouts
-    cfgs = ["--oem 1 --psm 6", "--oem 1 --psm 4", "--oem 3 --psm 6"]
-    last_txt = ""
-    for cfg in cfgs:
+            continue
+        if c >= 0 and (word or "").strip():
+            confs.append(c)
+    mean_conf = sum(confs) / len(confs) if confs else 0.0
+    code_hits = len(COURSE_CODE_RE.findall(text))
+    anchored = code_hits > 0 or _LABEL_HIT_RE.search(text) is not None
+    return 0.8 * (mean_conf / 100.0) + (0.2 if anchored else 0.0), mean_conf, code_hits
+
+
+def recognize_scored(
+    pil_img: Image.Image,
+    lang: str = "eng+fra",
+    configs: Tuple[str, ...] = DEFAULT_OCR_CONFIGS,
+    threshold: float = DEFAULT_SCORE_THRESHOLD,
+) -> OcrResult:
+    """Run Tesseract once with image_to_data and only escalate to the next config if the score is low.
+
+    Uses the shared pool of persistent Tesseract workers when tesserocr is installed,
+    otherwise one pytesseract subprocess per pass.
+    Returns the best pass seen, with the winning config and the number of passes that ran.
+    Raises the last Tesseract error if every pass failed.
+    """
+    pool = tesseract_pool.get_tesseract_pool(lang) if tesseract_pool is not None else None
+    if pool is None and pytesseract is None:
+        raise ImportError("No Tesseract backend available. Install pytesseract (with tesseract-ocr) or tesserocr.")
+    backend = "tesserocr-pool" if pool is not None else "pytesseract"
+    best = OcrResult()
+    passes = 0
+    last_err: Exception | None = None
+    for cfg in configs:
+        passes += 1
         try:
-            txt = pytesseract.image_to_string(prep, lang=lang, config=cfg)
-            if txt and len(txt) > len(last_txt):
-                last_txt = txt
-        except Exception:
+            if pool is not None:
+                data = pool.image_to_data(pil_img, config=cfg)
+            else:
+                data = pytesseract.image_to_data(pil_img, lang=lang, config=cfg,
+                                                 output_type=pytesseract.Output.DICT)
+        except Exception as e:
+            last_err = e
             continue
-    if last_txt:
-        return last_txt
-    # Absolute fallback
-    return pytesseract.image_to_string(prep)
+        text = _text_from_data(data)
+        score, mean_conf, code_hits = _score_pass(data, text)
+        if score > best.score or not best.config:
+            m = re.search(r"--psm\s+(\d+)", cfg)
+            best = OcrResult(text=text, config=cfg, psm=int(m.group(1)) if m else None,
+                             score=score, mean_conf=mean_conf, code_hits=code_hits, words=data,
+                             backend=backend)
+        if score >= threshold:
+            break
+    best.passes = passes
+    if not best.config and last_err is not None:
+        raise last_err
+    return best
+
 
 # ---------- Helpers ----------
 
@@ -137,17 +264,6 @@ def _to_float(x: str | None) -> float | None:
         return None
 
 
-def _pct_near_label(text: str, label_pat: str) -> float | None:
-    t = text.lower()
-    m = re.search(rf"{label_pat}[^0-9%]{{0,40}}{PCT}", t)
-    if m:
-        return _to_float(m.group(1))
-    m = re.search(rf"{PCT}[^a-z]{{0,40}}{label_pat}", t)
-    if m:
-        return _to_float(m.group(1))
-    return None
-
-
 def _fraction_to_pct(text: str) -> float | None:
     m = re.search(r"\b(\d+(?:[.,]\d+)?)\s*/\s*(\d+(?:[.,]\d+)?)\b", text)
     if not m:
@@ -157,102 +273,518 @@ def _fraction_to_pct(text: str) -> float | None:
         return None
     return round(100.0 * a / b, 2)
 
-# ---------- Parse OCR text into rows ----------
+# ---------- Parse Omnivox text (Import tab parser) ----------
+# All patterns are compiled once here; nothing below builds a regex per line.
+PCT_RE = re.compile(r"(\d{1,3}(?:[.,]\d{1,2})?)\s*%")
+# Labels used on both desktop and mobile layouts
+LABEL_GRADE_RE = re.compile(r"(?i)(?:projected\s*grade|your\s*grade|current\s*grade|note|resultat|résultat)\s*[:\-]?\s*(\d{1,3}(?:[.,]\d{1,2})?)\s*%")
+LABEL_AVG_RE   = re.compile(r"(?i)(?:class\s*average|moyenne(?:\s*de\s*classe)?)\s*[:\-]?\s*(\d{1,3}(?:[.,]\d{1,2})?)\s*%")
+# Expanded label patterns (cover "avg" shorthand and more EN/FR variants)
+LABEL_GRADE_RE_ALT = re.compile(
+    r"(?i)\b(?:grade|current\s*grade|projected\s*grade|résultat|resultat)\b[^0-9%]{0,40}(\d{1,3}(?:[.,]\d{1,2})?)\s*%"
+)
+LABEL_AVG_RE_ALT = re.compile(
+    r"(?i)\b(?:avg|average|class\s*avg|class\s*average|moyenne(?:\s*de\s*classe)?)\b[^0-9%]{0,40}(\d{1,3}(?:[.,]\d{1,2})?)\s*%"
+)
+_PCT_BEFORE_AVG_RE = re.compile(rf"(?i){PCT_RE.pattern}[^a-z]{{0,40}}(?:avg|average|class\s*average|class\s*avg|moyenne)")
+_GRADE_BEFORE_PCT_RE = re.compile(rf"(?i)(?:grade|current\s*grade|projected\s*grade|résultat|resultat)[^0-9%]{{0,40}}{PCT_RE.pattern}")
+_PROJECTED_RE = re.compile(r"(?i)projected\s*grade")
+_CARD_AVG_LINE_RE = re.compile(r"(?i)(class\s*average|class\s*avg|moyenne)")
+_JUNK_HEADING_RE = re.compile(r"current\s*grade|class\s*average")
+_ROW_NUM_LINE_RE = re.compile(r"^\s*\d+\.(?:\s|$)")
+_ALPHA_WORD_RE = re.compile(r"[A-Za-zÀ-ÿ]{3,}")
+
+def _is_junk_line(s: str) -> bool:
+    t = (s or "").strip().lower()
+    if not t:
+        return True
+    if any(k in t for k in ("omnivox", "john abbott college", "angus beauregard")):
+        return True
+    if t.startswith(NAV_JUNK_PREFIXES):
+        return True
+    # obvious headings
+    if _JUNK_HEADING_RE.search(t):
+        return True
+    # sidebar crumbs with '>'
+    if ">" in t and len(t) <= 40:
+        return True
+    return False
+
+
+def _has_two_words(s: str) -> bool:
+    return len(_ALPHA_WORD_RE.findall(s)) >= 2
+
+
+def _extract_grade_avg_from_block(block: str):
+    """
+    Prefer labeled values; then fractions a/b -> %; then generic percent fallback.
+    This avoids mixing 'Your Grade' and 'Class Avg' and recovers missing avgs.
+    """
+    your_grade = None
+    class_avg = None
+
+    # 1) Labeled values (any of the patterns)
+    mg = LABEL_GRADE_RE.search(block) or LABEL_GRADE_RE_ALT.search(block)
+    ma = LABEL_AVG_RE.search(block)   or LABEL_AVG_RE_ALT.search(block)
+    if mg:
+        your_grade = _to_float(mg.group(1))
+    if ma:
+        class_avg = _to_float(ma.group(1))
+
+    # 2) Fractions like "47.3/89.01" → your grade %
+    if your_grade is None:
+        frac = _fraction_to_pct(block)
+        if frac is not None:
+            your_grade = frac
+
+    # 3) Directional proximity (percent near 'avg' or 'grade' tokens)
+    if class_avg is None:
+        m = _PCT_BEFORE_AVG_RE.search(block)
+        if m:
+            class_avg = _to_float(m.group(1))
+    if your_grade is None:
+        m = _GRADE_BEFORE_PCT_RE.search(block)
+        if m:
+            your_grade = _to_float(m.group(1))
+
+    # 4) Generic fallback: first % = grade, last % = class avg
+    if your_grade is None or class_avg is None:
+        pcts = [ _to_float(p) for p in PCT_RE.findall(block) ]
+        pcts = [p for p in pcts if p is not None and p <= 100]
+        if pcts:
+            if your_grade is None:
+                your_grade = pcts[0]
+            if class_avg is None and len(pcts) >= 2:
+                class_avg = pcts[-1]
+
+    return your_grade, class_avg
+
+
+def _app_row(course_name: str, class_code: str, your_grade, class_avg) -> Dict[str, Any]:
+    return {
+        "Course Name": course_name,
+        "Class Code": class_code,
+        "Your Grade": your_grade,
+        "Class Avg": class_avg,
+        "Std. Dev": None,
+        "Credits": None,
+    }
+
+
+def _last_label_match(primary: re.Pattern, alt: re.Pattern, text: str) -> float | None:
+    """Value of the last `alt` match in text, else the last `primary` match."""
+    last = None
+    for last in alt.finditer(text):
+        pass
+    if last is None:
+        for last in primary.finditer(text):
+            pass
+    return _to_float(last.group(1)) if last is not None else None
+
+
+def split_projected_cards(lines: List[str]) -> List[Tuple[int, int]]:
+    """Mobile card boundaries: [start, end) from each "Projected grade" line to the next one.
+
+    One pass over the lines; every card is then parsed on its own slice.
+    """
+    starts = [i for i, ln in enumerate(lines) if _PROJECTED_RE.search(ln)]
+    return list(zip(starts, starts[1:] + [len(lines)]))
+
 
-def extract_courses_from_text(text: str) -> List[CourseRow]:
+def _parse_projected_card(lines: List[str], idx: int, end: int) -> Dict[str, Any] | None:
+    block_text = "\n".join(lines[idx:end])
+
+    # --- Your grade: the % on the "Projected grade" line itself ---
+    your_grade = None
+    m_pct = PCT_RE.search(lines[idx])
+    if m_pct:
+        your_grade = _to_float(m_pct.group(1))
+    # Fallback to the last labeled 'grade' inside the card only
+    if your_grade is None:
+        your_grade = _last_label_match(LABEL_GRADE_RE, LABEL_GRADE_RE_ALT, block_text)
+        if your_grade is None:
+            # final fallback: a/b → %
+            your_grade = _fraction_to_pct(block_text)
+
+    # --- Class average: look within this card only ---
+    class_avg = None
+    for j in range(idx, end):
+        if _CARD_AVG_LINE_RE.search(lines[j]):
+            m_pct = PCT_RE.search(lines[j])
+            if m_pct:
+                class_avg = _to_float(m_pct.group(1))
+                break
+    if class_avg is None:
+        class_avg = _last_label_match(LABEL_AVG_RE, LABEL_AVG_RE_ALT, block_text)
+
+    # If neither value is found within this card, skip
+    if your_grade is None and class_avg is None:
+        return None
+
+    # --- Class code: search close to the card only (a few lines above or within) ---
+    class_code = ""
+    for j in range(max(0, idx - 5), end):
+        m = COURSE_CODE_RE.search(lines[j])
+        if m:
+            class_code = m.group(0).replace(" ", "")
+            break
+
+    # --- Course name: the nearest clean alpha line above the 'Projected grade' label ---
+    course_name = ""
+    for j in range(idx - 1, max(0, idx - 6) - 1, -1):
+        cand = clean_course_name(lines[j])
+        if cand and not COURSE_CODE_RE.search(cand) and _has_two_words(cand):
+            course_name = cand
+            break
+
+    return _app_row(course_name, class_code, your_grade, class_avg)
+
+
+def parse_omnivox_text(text: str) -> List[Dict[str, Any]]:
+    """Parse Omnivox 'Grades' screenshots text into course rows.
+
+    Strategy:
+      - Pass 1: For each line that contains a Quebec-style class code (e.g., 201-SN2-RE),
+        treat that line as the anchor for the row. Prefer the two percentages found on
+        that same line as (your_grade, class_avg). Course name is taken from the
+        closest previous human-readable line (ignoring left-nav/header junk).
+      - Pass 2: Numbered-row parsing for rows pass 1 missed.
+      - Pass 3: Mobile "Projected grade" cards, segmented once up front and parsed
+        card by card, so the whole parse is linear in the number of lines.
+    """
     lines = [ln for ln in text.splitlines() if ln.strip()]
-    out: List[CourseRow] = []
-    i = 0
-    while i < len(lines):
-        ln = lines[i]
-        code_m = re.search(COURSE_CODE, ln)
-        if not code_m:
-            i += 1
+    rows: List[Dict[str, Any]] = []
+
+    for i, ln in enumerate(lines):
+        m = COURSE_CODE_RE.search(ln)
+        if not m:
             continue
-        start = max(0, i - 2)
-        end   = min(len(lines), i + 8)
-        block = "\n".join(lines[start:end])
 
-        # Course name: prefer prev line with letters; else first texty line above
+        class_code = m.group(0).replace(" ", "")
+
+        # --- Percentages: prefer those on the same line as the code ---
+        pcts_on_line = [ _to_float(p) for p in PCT_RE.findall(ln) ]
+        pcts_on_line = [p for p in pcts_on_line if p is not None and p <= 100]
+
+        # Look a wider surrounding window and use robust extractor
+        start = max(0, i - 4)
+        end   = min(len(lines), i + 8)
+        # Split the neighborhood around the code line into pre/post.
+        # We will **prefer values after the code line** to prevent pulling
+        # the previous card's percentages (which caused a one-row offset).
+        block_pre  = "\n".join(lines[start:i])
+        block_post = "\n".join(lines[i:end])
+
+        # Prefer values that appear after the code line
+        your_grade, class_avg = _extract_grade_avg_from_block(block_post)
+        # Final fallback: if still missing, allow pre-code block (rare)
+        if (your_grade is None or class_avg is None) and block_pre:
+            yg2, ca2 = _extract_grade_avg_from_block(block_pre)
+            if your_grade is None:
+                your_grade = yg2
+            if class_avg is None:
+                class_avg = ca2
+
+        # Fallback: if still missing and two percents are on the code line, map [first,last] → [grade, avg]
+        if (your_grade is None or class_avg is None) and len(pcts_on_line) >= 2:
+            if your_grade is None:
+                your_grade = pcts_on_line[0]
+            if class_avg is None:
+                class_avg = pcts_on_line[-1]
+
+        # --- Course name: search upward for a clean, non-junk line ---
         course_name = ""
-        if i > 0:
-            prev = lines[i-1].strip()
-            if len(re.findall(r"[A-Za-zÀ-ÿ]{3,}", prev)) >= 2:
-                course_name = prev
+        for k in range(i-1, max(-1, i-4), -1):
+            if k < 0:
+                break
+            cand = clean_course_name(lines[k])
+            if cand and not _is_junk_line(cand) and not COURSE_CODE_RE.search(cand):
+                course_name = cand
+                break
+
+        # Last resort: look slightly below, then bail if it smells like junk
         if not course_name:
-            for k in range(start, i):
-                cand = lines[k].strip()
-                if len(re.findall(r"[A-Za-zÀ-ÿ]{3,}", cand)) >= 2 and not re.search(COURSE_CODE, cand):
+            for k in range(i+1, min(len(lines), i+4)):
+                cand = clean_course_name(lines[k])
+                if cand and not _is_junk_line(cand) and not COURSE_CODE_RE.search(cand):
                     course_name = cand
                     break
 
-        class_code = code_m.group(0).replace(" ", "")
-        your_grade = _pct_near_label(block, LABEL_GRADE)
-        class_avg  = _pct_near_label(block, LABEL_AVG)
-        std_dev    = _pct_near_label(block, LABEL_SD)
-        if your_grade is None:
-            frac = _fraction_to_pct(block)
-            if frac is not None:
-                your_grade = frac
+        # Filter out clear junk rows
+        if not course_name or _is_junk_line(course_name):
+            continue
 
-        out.append(CourseRow(course_name=course_name, class_code=class_code,
-                             your_grade=your_grade, class_avg=class_avg, std_dev=std_dev))
-        i = end  # skip ahead to avoid reusing same block
-    return out
+        rows.append(_app_row(course_name, class_code, your_grade, class_avg))
 
-# ---------- Merge duplicates ----------
+    # Build a set of seen keys (class code or normalized name) to avoid duplicates
+    seen_keys = set()
+    for r in rows:
+        key = (r.get("Class Code") or "").strip()
+        if key:
+            seen_keys.add(("code", key))
+        nm = clean_course_name(r.get("Course Name", ""))
+        if nm:
+            seen_keys.add(("name", nm.lower()))
+
+    # ---- Pass 2: numbered rows scan (summary table) ----
+    # We always run this to capture any rows the code-anchored pass missed.
+    blocks, cur = [], []
+    for ln in lines:
+        if _ROW_NUM_LINE_RE.match(ln) and cur:
+            blocks.append("\n".join(cur))
+            cur = []
+        cur.append(ln)
+    if cur:
+        blocks.append("\n".join(cur))
+
+    for block in blocks:
+        bl = [b.strip() for b in block.splitlines() if b.strip()]
+        if not bl:
+            continue
+
+        # Course name: first plausible alpha line after the row number
+        course_name = ""
+        for b in bl[1:5]:
+            cand = clean_course_name(b)
+            if cand and not COURSE_CODE_RE.search(cand) and _has_two_words(cand):
+                course_name = cand
+                break
+        if not course_name:
+            continue
+
+        # Class code within block (optional)
+        class_code = ""
+        for b in bl:
+            m = COURSE_CODE_RE.search(b)
+            if m:
+                class_code = m.group(0).replace(" ", "")
+                break
+
+        # Robust extraction for numbered table blocks
+        your_grade, class_avg = _extract_grade_avg_from_block(block)
+
+        # Skip if we already have this row from pass 1
+        key_code = ("code", class_code) if class_code else None
+        key_name = ("name", course_name.lower())
+        if (key_code and key_code in seen_keys) or key_name in seen_keys:
+            continue
+
+        rows.append(_app_row(course_name, class_code, your_grade, class_avg))
+        if key_code:
+            seen_keys.add(key_code)
+        seen_keys.add(key_name)
 
-def merge_by_code(rows: List[CourseRow]) -> List[CourseRow]:
-    by: Dict[str, CourseRow] = {}
+    # ---- Pass 3: mobile "Projected grade" cards ----
+    # Anchor each card to its own label lines to avoid leaking % from neighboring cards.
+    for idx, end in split_projected_cards(lines):
+        row = _parse_projected_card(lines, idx, end)
+        if row is None:
+            continue
+        key_code = ("code", row["Class Code"]) if row["Class Code"] else None
+        key_name = ("name", row["Course Name"].lower()) if row["Course Name"] else None
+        if (key_code and key_code in seen_keys) or (key_name and key_name in seen_keys):
+            continue
+        rows.append(row)
+        if key_code:
+            seen_keys.add(key_code)
+        if key_name:
+            seen_keys.add(key_name)
+    return rows
+
+# ---------- Parse word boxes (layout-aware) ----------
+
+_ROW_NUM_RE = re.compile(r"^\d{1,2}\.$")
+_VALUE_RE = re.compile(r"^\(?(\d{1,3}(?:[.,]\d{1,2})?)\s*%?\)?$")
+_FRAC_RE = re.compile(r"^\(?(\d+(?:[.,]\d+)?)\s*/\s*(\d+(?:[.,]\d+)?)\)?$")
+_HDR_SD_RE = re.compile(r"(?i)std|[ée]cart|deviation")
+_HDR_GRADE_RE = re.compile(r"(?i)grade|note|r[ée]sultat")
+_HDR_AVG_RE = re.compile(r"(?i)average|moyenne|avg")
+
+
+def _word_tokens(data: Dict[str, list]) -> List[Dict[str, Any]]:
+    toks = []
+    texts = data.get("text", [])
+    for i, word in enumerate(texts):
+        word = (word or "").strip()
+        if not word:
+            continue
+        left, top = int(data["left"][i]), int(data["top"][i])
+        w, h = int(data["width"][i]), int(data["height"][i])
+        toks.append({"text": word, "left": left, "right": left + w,
+                     "cx": left + w / 2.0, "cy": top + h / 2.0, "h": max(h, 1)})
+    return toks
+
+
+def _group_rows(toks: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Cluster tokens into visual rows by vertical centre (one pass over y-sorted tokens)."""
+    rows: List[List[Dict[str, Any]]] = []
+    row_cy = row_h = 0.0
+    for t in sorted(toks, key=lambda t: (t["cy"], t["left"])):
+        if rows and abs(t["cy"] - row_cy) <= 0.5 * max(t["h"], row_h):
+            rows[-1].append(t)
+            n = len(rows[-1])
+            row_cy += (t["cy"] - row_cy) / n
+            row_h = max(row_h, t["h"])
+        else:
+            rows.append([t])
+            row_cy, row_h = t["cy"], t["h"]
     for r in rows:
-        key = r.class_code or r.course_name.strip().lower()
-        if key not in by:
-            by[key] = r
+        r.sort(key=lambda t: t["left"])
+    return rows
+
+
+def _header_columns(row: List[Dict[str, Any]]) -> Dict[str, Tuple[float, float]]:
+    """Split a header row into phrases by horizontal gaps and map them to value columns."""
+    if not row:
+        return {}
+    gap = 1.2 * sorted(t["h"] for t in row)[len(row) // 2]
+    phrases: List[List[Dict[str, Any]]] = [[row[0]]]
+    for t in row[1:]:
+        if t["left"] - phrases[-1][-1]["right"] > gap:
+            phrases.append([t])
         else:
-            dst = by[key]
-            if not dst.course_name and r.course_name: dst.course_name = r.course_name
-            if dst.your_grade is None and r.your_grade is not None: dst.your_grade = r.your_grade
-            if dst.class_avg  is None and r.class_avg  is not None: dst.class_avg  = r.class_avg
-            if dst.std_dev    is None and r.std_dev    is not None: dst.std_dev    = r.std_dev
-            if dst.credits    is None and r.credits    is not None: dst.credits    = r.credits
-    return list(by.values())
-
-# ---------- Public entry points ----------
-
-def extract_from_image_file_debug(file_bytes: bytes) -> Tuple[List[CourseRow], Dict[str, Any]]:
-    """OCR an image and return (rows, debug dict) for logging in the UI."""
-    dbg: Dict[str, Any] = {}
-    orig = Image.open(io.BytesIO(file_bytes))
-    dbg["orig_size"] = orig.size
-    dbg["orig_mode"] = orig.mode
-
-    pre = preprocess_for_ocr(orig)
-    dbg["pre_size"] = pre.size
-    try:
-        buf = io.BytesIO()
-        pre.save(buf, format="PNG")
-        dbg["pre_png"] = buf.getvalue()
-    except Exception:
-        dbg["pre_png"] = None
-
-    dbg["engine"] = "easyocr" if _EASYOCR_READER is not None else ("tesseract" if pytesseract is not None else "none")
-    text = ocr_text(pre)
-    dbg["text_len"] = len(text)
-    dbg["ocr_sample"] = text[:800]
-    dbg["course_code_hits"] = re.findall(COURSE_CODE, text)
-
-    rows = extract_courses_from_text(text)
-    dbg["rows_count"] = len(rows)
-    dbg["rows_missing"] = {
-        "your_grade_missing": sum(1 for r in rows if r.your_grade is None),
-        "class_avg_missing":  sum(1 for r in rows if r.class_avg is None),
-        "std_dev_missing":    sum(1 for r in rows if r.std_dev is None),
-    }
-    dbg["rows_preview"] = [r.to_app_row() for r in rows[:5]]
-    return rows, dbg
+            phrases[-1].append(t)
+    cols: Dict[str, Tuple[float, float]] = {}
+    for ph in phrases:
+        label = " ".join(t["text"] for t in ph)
+        span = (float(ph[0]["left"]), float(ph[-1]["right"]))
+        if _HDR_SD_RE.search(label):
+            cols.setdefault("Std. Dev", span)
+        elif _HDR_GRADE_RE.search(label):
+            cols.setdefault("Your Grade", span)
+        elif _HDR_AVG_RE.search(label):
+            cols.setdefault("Class Avg", span)
+    return cols
+
+
+def _nearest_column(cx: float, cols: Dict[str, Tuple[float, float]]) -> str | None:
+    best, best_d = None, None
+    for name, (lo, hi) in cols.items():
+        d = 0.0 if lo <= cx <= hi else min(abs(cx - lo), abs(cx - hi))
+        if best_d is None or d < best_d:
+            best, best_d = name, d
+    return best
+
+
+def parse_words_layout(data: Dict[str, list]) -> List[Dict[str, Any]]:
+    """Parse the desktop Grades table from Tesseract word boxes (image_to_data dict).
+
+    Words are clustered into rows by y, the header row gives the x-span of the
+    grade / class average / std dev columns, and every value token below it is
+    assigned to the column it sits under. Records start at a row number ("3.")
+    or, for tables without numbering, at a course code. Returns [] when no
+    header row is found so callers can fall back to the text parser.
+    """
+    rows = _group_rows(_word_tokens(data or {}))
+
+    cols: Dict[str, Tuple[float, float]] = {}
+    start = 0
+    for idx, row in enumerate(rows):
+        text = " ".join(t["text"] for t in row)
+        if _HDR_GRADE_RE.search(text) and _HDR_AVG_RE.search(text):
+            cols = _header_columns(row)
+            if "Your Grade" in cols and "Class Avg" in cols:
+                start = idx + 1
+                break
+            cols = {}
+    if not cols:
+        return []
+    left_bound = min(lo for lo, _ in cols.values()) - 0.5 * sorted(t["h"] for t in rows[start - 1])[0]
+
+    body = rows[start:]
+    numbered = any(row and _ROW_NUM_RE.match(row[0]["text"]) for row in body)
+
+    out: List[Dict[str, Any]] = []
+    cur: Dict[str, Any] | None = None
+
+    def flush():
+        if cur and (cur["Class Code"] or any(cur[k] is not None for k in cols)) and cur["Course Name"]:
+            out.append(cur)
+
+    for row in body:
+        name_toks = [t for t in row if t["cx"] < left_bound]
+        name_text = " ".join(t["text"] for t in name_toks)
+        code_m = COURSE_CODE_RE.search(name_text)
+        starts_record = (_ROW_NUM_RE.match(row[0]["text"]) is not None) if numbered else code_m is not None
+        if cur is None or starts_record:
+            flush()
+            cur = {"Course Name": "", "Class Code": "", "Your Grade": None,
+                   "Class Avg": None, "Std. Dev": None, "Credits": None}
+        if code_m and not cur["Class Code"]:
+            cur["Class Code"] = code_m.group(0).replace(" ", "").upper()
+        if not cur["Course Name"]:
+            nm = COURSE_CODE_RE.sub(" ", name_text)
+            nm = re.sub(r"^\s*\d+\.\s*", "", nm)
+            nm = re.sub(r"[^A-Za-zÀ-ÿ\s]", " ", nm)
+            nm = re.sub(r"\s+", " ", nm).strip()
+            if len(re.findall(r"[A-Za-zÀ-ÿ]{3,}", nm)) >= 2 and not nm.lower().startswith("sect"):
+                cur["Course Name"] = nm
+        for t in row:
+            if t["cx"] < left_bound:
+                continue
+            val = None
+            m = _VALUE_RE.match(t["text"])
+            if m:
+                val = _to_float(m.group(1))
+            else:
+                fm = _FRAC_RE.match(t["text"])
+                if fm:
+                    val = _fraction_to_pct(t["text"])
+            if val is None or val > 100:
+                continue
+            col = _nearest_column(t["cx"], cols)
+            if col and cur[col] is None:
+                cur[col] = val
+    flush()
+    return out
+
+# ---------- Merge duplicates ----------
+
+APP_ROW_FIELDS = ["Course Name","Class Code","Your Grade","Class Avg","Std. Dev","Credits"]
+
+def row_to_dict_any(r) -> Dict[str, Any]:
+    """Return a uniform dict regardless of input row type."""
+    if isinstance(r, dict):
+        d = {k: v for k, v in r.items()}
+        # normalize common alt keys
+        d.setdefault("Course Name", d.get("course_name", ""))
+        d.setdefault("Class Code", d.get("class_code", ""))
+        d.setdefault("Your Grade", d.get("your_grade"))
+        d.setdefault("Class Avg",  d.get("class_avg"))
+        d.setdefault("Std. Dev",   d.get("std_dev"))
+        d.setdefault("Credits",    d.get("credits"))
+    else:
+        d = {
+            "Course Name": getattr(r, "Course Name", None) or getattr(r, "course_name", ""),
+            "Class Code": getattr(r, "Class Code", None) or getattr(r, "class_code", ""),
+            "Your Grade": getattr(r, "Your Grade", None) or getattr(r, "your_grade", None),
+            "Class Avg":  getattr(r, "Class Avg",  None) or getattr(r, "class_avg",  None),
+            "Std. Dev":   getattr(r, "Std. Dev",   None) or getattr(r, "std_dev",   None),
+            "Credits":    getattr(r, "Credits",    None) or getattr(r, "credits",    None),
+        }
+    # string cleanups
+    d["Course Name"] = (d.get("Course Name") or "").strip()
+    d["Class Code"]  = (d.get("Class Code")  or "").strip()
+    return {k: d.get(k) for k in APP_ROW_FIELDS}
 
 
-def extract_from_image_file(file_bytes: bytes) -> List[CourseRow]:
-    """OCR an image (PNG/JPG bytes) and return parsed CourseRow list."""
-    rows, _ = extract_from_image_file_debug(file_bytes)
-    return rows
\ No newline at end of file
+def merge_rows_any(rows) -> List[Dict[str, Any]]:
+    """Merge rows by Class Code (fallback Course Name) filling missing values.
+    Works whether rows are dicts or objects with snake_case attributes.
+    """
+    merged = {}
+    for r in rows:
+        dr = row_to_dict_any(r)
+        key = dr.get("Class Code") or dr.get("Course Name", "").lower()
+        if not key:
+            continue
+        if key not in merged:
+            merged[key] = dr
+        else:
+            dst = merged[key]
+            if not dst.get("Course Name") and dr.get("Course Name"):
+                dst["Course Name"] = dr["Course Name"]
+            for fld in ["Your Grade","Class Avg","Std. Dev","Credits"]:
+                if (dst.get(fld) is None or dst.get(fld) == "") and (dr.get(fld) not in (None, "")):
+                    dst[fld] = dr[fld]
+    return list(merged.values())
@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 
+import rscore
+
 # ---------- PAGE CONFIG ----------
 st.set_page_config(page_title="R-Score Dashboard (Free)", layout="wide")
 
@@ -190,17 +192,12 @@ with tab_results:
         df["Credits"] = df["Credits"].fillna(1)
         df.loc[df["Credits"] == 0, "Credits"] = 1
 
-        def zscore_row(row):
-            g, a, s = row["Your Grade"], row["Class Avg"], row["Std. Dev"]
-            if pd.isna(g) or pd.isna(a) or pd.isna(s) or s == 0:
-                return 0.0
-            return (g - a) / s
-
-        df["Z"] = df.apply(zscore_row, axis=1)
-        df["R (central)"] = 35 + 5 * df["Z"]
-
-        total_credits = df["Credits"].sum() or 1
-        overall_r = (df["R (central)"] * df["Credits"]).sum() / total_credits
+        # a course with a missing value counts as Z = 0 (R = 35) on the free page
+        scores = rscore.score_courses(df["Your Grade"], df["Class Avg"], df["Std. Dev"], df["Credits"],
+                                      missing_z=0.0)
+        df["Z"] = scores.z
+        df["R (central)"] = scores.r_central
+        overall_r = scores.overall_central
 
         st.markdown(f"### Your R (central): **{overall_r:.2f}**")
         st.dataframe(
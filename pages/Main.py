@@ -1,20 +1,54 @@
 import os
-import shutil
-import io
-import re
-from typing import List, Dict, Any
-
-import numpy as np
-import pandas as pd
-import requests
-import streamlit as st
-import plotly.express as px
+import threading
+from typing import Dict, Any
+
+# RSCORE_STARTUP_REPORT=1 prints what the first run of this page spent its time on.
+# Heavy optional pieces are not imported here: plotly when a chart view opens, the
+# OCR stack (PIL / OpenCV / Tesseract discovery) when Import opens, or in a
+# background thread at load with RSCORE_OCR_WARMUP=1.
+import startup_timing
+
+with startup_timing.phase("import numpy, pandas"):
+    import numpy as np
+    import pandas as pd
+with startup_timing.phase("import streamlit"):
+    import streamlit as st
+with startup_timing.phase("import requests, app modules"):
+    import requests
+
+    import http_client
+    import profiles
+    import programs
+    import rscore
+    import snapshots
 
 # -------------------------------------------------
 # basic page config
 # -------------------------------------------------
 st.set_page_config(page_title="R-Score Dashboard", layout="wide")
 qp = st.query_params
+
+# Optional OCR preload (set RSCORE_OCR_WARMUP=1 in the deployment): the first run
+# of this page in the process, whatever view it lands on (or the login screen),
+# starts importing the OCR stack and building the tesserocr pool in a background
+# thread, so the first upload pays no load cost and the page doesn't wait for it.
+# Without the flag everything is built lazily on the first OCR call.
+def _warm_ocr():
+    try:
+        import ocr_engine
+        ocr_engine.tesseract_status()
+        ocr_engine.ocr_utils.warm_up()
+    except Exception:
+        pass    # the Import view reports the same failure through the engine status
+
+@st.cache_resource
+def _start_ocr_warmup():
+    t = threading.Thread(target=_warm_ocr, name="rscore-ocr-warmup", daemon=True)
+    t.start()
+    return t
+
+if os.environ.get("RSCORE_OCR_WARMUP"):
+    _start_ocr_warmup()
 # -------------------------------------------------
 # Supabase creds from Streamlit secrets
 # -------------------------------------------------
@@ -29,6 +63,13 @@ AUTH_HEADERS = {
     "apikey": SUPABASE_KEY,
     "Content-Type": "application/json",
 }
+
+# One keep-alive, connection-pooled session (timeouts + retries on gateway errors)
+# for every Supabase call this page makes, shared by all sessions in the process
+@st.cache_resource
+def get_http():
+    return http_client.make_session()
+
 if "tos_accepted" not in st.session_state:
     st.session_state["tos_accepted"] = False
 
@@ -45,7 +86,11 @@ def show_login():
         if st.button("Sign in"):
             url = f"{SUPABASE_URL}/auth/v1/token?grant_type=password"
             payload = {"email": email, "password": password}
-            r = requests.post(url, json=payload, headers=AUTH_HEADERS)
+            try:
+                r = get_http().post(url, json=payload, headers=AUTH_HEADERS)
+            except requests.RequestException as e:
+                st.error(f"Login failed: {e}")
+                st.stop()
             if r.status_code == 200:
                 data = r.json()
                 st.session_state["auth"] = data
@@ -59,7 +104,11 @@ def show_login():
         if st.button("Create account"):
             url = f"{SUPABASE_URL}/auth/v1/signup"
             payload = {"email": email, "password": password}
-            r = requests.post(url, json=payload, headers=AUTH_HEADERS)
+            try:
+                r = get_http().post(url, json=payload, headers=AUTH_HEADERS)
+            except requests.RequestException as e:
+                st.error(f"Signup failed: {e}")
+                st.stop()
             if r.status_code in (200, 201):
                 st.success("Account created. Check your email to confirm.")
             else:
@@ -75,24 +124,29 @@ auth = st.session_state["auth"]
 access_token = auth["access_token"]
 user_id = auth["user"]["id"]
 
-# get profile row from Supabase
-profiles_url = f"{SUPABASE_URL}/rest/v1/profiles"
-headers_authed = {
-    "apikey": SUPABASE_KEY,
-    "Authorization": f"Bearer {access_token}",
-}
-params = {
-    "id": f"eq.{user_id}",
-    # 👇 pull tos_accepted too
-    "select": "id,is_premium,tos_accepted",
-}
-resp = requests.get(profiles_url, headers=headers_authed, params=params)
-rows = resp.json() if resp.ok else []
+# get profile row from Supabase — through a process-wide TTL cache, so reruns
+# (every click / editor keystroke) don't each make a REST round trip
+@st.cache_resource
+def get_profile_cache():
+    return profiles.ProfileCache(ttl=profiles.default_profile_ttl())
+
+with startup_timing.phase("profile lookup"):
+    profile = get_profile_cache().get(
+        user_id, lambda: profiles.fetch_profile(SUPABASE_URL, SUPABASE_KEY, access_token, user_id, session=get_http())
+    )
+# The profile row is authoritative for premium: it grants and revokes. An empty
+# result (no row, or a failed fetch cached briefly) leaves the session as it is.
+# TOS acceptance is only recorded in the session (nothing writes it back), so the
+# row can confirm an earlier acceptance but never un-accept this session's.
+if profile:
+    st.session_state["is_premium"] = bool(profile.get("is_premium"))
+    if profile.get("tos_accepted"):
+        st.session_state["tos_accepted"] = True
 
 # ✅ handle Stripe return (?session_id=...)
 if "session_id" in qp:
-    # OPTIONAL: re-fetch profile from Supabase here, if you have that function
-    # e.g. refresh_user_profile()
+    # premium status just changed: drop the cached profile so the rerun re-fetches it
+    get_profile_cache().invalidate(user_id)
     st.query_params.clear()
     st.rerun()
 
@@ -110,7 +164,7 @@ def show_tos():
         if accepted:
             # 1. Set the session state to indicate acceptance
             st.session_state["tos_accepted"] = True
-            
+
             # 2. ✅ FIX: Force the app to re-run from the top.
             # This makes the app check the new st.session_state["tos_accepted"] value
             # and render your main content instead of the TOS screen.
@@ -124,910 +178,43 @@ def require_premium():
         st.markdown("### 🔒 Premium feature")
         st.write("This section is for premium accounts.")
         st.stop()
-# --- Ensure Tesseract finds its language data ---
-# Check common tessdata directories across macOS and Linux
-for td in (
-    "/opt/homebrew/share/tessdata",              # macOS Homebrew
-    "/usr/local/share/tessdata",                 # Linux local installs
-    "/usr/share/tesseract-ocr/5/tessdata",       # Ubuntu 22.04+ (Streamlit Cloud)
-    "/usr/share/tesseract-ocr/4.00/tessdata",    # Older Linux systems
-):
-    if os.path.isdir(td):
-        os.environ.setdefault("TESSDATA_PREFIX", td)
-        print(f"[INFO] Tesseract data found at: {td}")
-        break
-try:
-    import pytesseract  # type: ignore
-    # Prefer PATH first, then common Linux, then macOS:
-    candidates = [
-        shutil.which("tesseract"),
-        "/usr/bin/tesseract",
-        "/usr/local/bin/tesseract",
-        "/opt/homebrew/bin/tesseract",          # macOS (Apple Silicon)
-        "C:\\Program Files\\Tesseract-OCR\\tesseract.exe",  # Windows (optional)
-    ]
-    for p in candidates:
-        if p and os.path.isfile(p):
-            pytesseract.pytesseract.tesseract_cmd = p
-            break
-
-    # Find tessdata (language models) – Linux, then others:
-    td_candidates = [
-        os.environ.get("TESSDATA_PREFIX"),
-        "/usr/share/tesseract-ocr/5/tessdata",
-        "/usr/share/tesseract-ocr/4.00/tessdata",
-        "/usr/share/tesseract-ocr/tessdata",
-        "/usr/local/share/tessdata",
-        "/opt/homebrew/share/tessdata",
-    ]
-    for td in td_candidates:
-        if td and os.path.isdir(td):
-            os.environ["TESSDATA_PREFIX"] = td
-            break
-except Exception:
-    pass
-# --- OCR import and fallback ---
-# === Local OCR helpers (self-contained; do NOT rely on ocr_utils) ===
-import re, io
-from typing import List, Dict, Any
-try:
-    from PIL import Image
-except Exception:
-    Image = None  # type: ignore
-try:
-    import cv2  # type: ignore
-except Exception:
-    cv2 = None  # type: ignore
-
-def _local_tesseract_status():
-    """Report whether pytesseract and the tesseract binary are usable."""
-    status = {"has_pytesseract": False, "binary_ok": False, "version": None, "error": None}
-    try:
-        import pytesseract as _pt
-        status["has_pytesseract"] = True
-        try:
-            v = _pt.get_tesseract_version()
-            status["binary_ok"] = True
-            status["version"] = str(v)
-        except Exception as e:
-            status["error"] = str(e)
-    except Exception as e:
-        status["error"] = str(e)
-    return status
-
-def _preprocess_gray(pil_img):
-    """Light denoise + binarize + upscale for better OCR."""
-    if Image is None:
-        return None
-    img = pil_img.convert("L")
-    if cv2 is None:
-        return img
-    import numpy as _np
-    arr = _np.array(img)
-    try:
-        arr = cv2.bilateralFilter(arr, d=5, sigmaColor=55, sigmaSpace=55)
-        arr = cv2.adaptiveThreshold(arr, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                    cv2.THRESH_BINARY, 35, 10)
-        h, w = arr.shape
-        if max(h, w) < 1500:
-            arr = cv2.resize(arr, None, fx=1.5, fy=1.5, interpolation=cv2.INTER_CUBIC)
-        return Image.fromarray(arr)
-    except Exception:
-        return img
-
-COURSE_CODE_RE = re.compile(
-    r"\b\d{3}\s*-\s*[A-Z0-9]{2,4}\s*-\s*[A-Z0-9]{2,3}\b",
-    re.I,
-)
-NAV_JUNK_PREFIXES = tuple([
-    "assignments", "calendar", "class forum", "course documents", "grades",
-    "list of my absences", "online classes", "recommended websites",
-    "teachers info", "my services", "team forums", "current average",
-    "omnivox", "léa", "angus beauregard", "john abbott college"
-])
-def _clean_course_name(name: str) -> str:
-    if not name:
-        return ""
-    s = str(name)
-
-    # Normalize punctuation
-    s = s.replace("—", "-").replace("–", "-")
-    s = s.replace("|", " ").replace("»", " ").replace("«", " ")
-
-    # Drop row-number prefixes like "1." / "2."
-    s = re.sub(r"^[\s|>•\-]*\d+\.\s*", "", s)
-
-    # Remove any known left-nav prefixes, headers, or user name artifacts
-    s_low = s.lower().strip()
-    for pref in NAV_JUNK_PREFIXES:
-        if s_low.startswith(pref):
-            s = s[len(pref):].lstrip(" :>-,.|")
-            s_low = s.lower().strip()
-
-    # Remove embedded crumbs such as "Course documents >" or "Team Forums >"
-    s = re.sub(r"(?i)course\s*documents\s*>\s*", "", s)
-    s = re.sub(r"(?i)team\s*forums\s*>\s*", "", s)
-
-    # --- Strip numeric noise from course names ---
-    # 1) Fractions like "19.3/23" anywhere in the string
-    s = re.sub(r"\b\d+(?:[.,]\d+)?\s*/\s*\d+(?:[.,]\d+)?\b", "", s)
-    # 2) Trailing percentages or numeric tokens like "84", "84%", "42.2" etc.
-    s = re.sub(r"(?:\s*\b\d{1,3}(?:[.,]\d{1,2})?\s*%?)+\s*$", "", s)
-    # 3) Any stray leading numbers that remain
-    s = re.sub(r"^\s*\d+\s*", "", s)
-
-    # Final guard: drop any remaining digits anywhere in the name
-    s = re.sub(r"\d+", "", s)
-
-    # Trim trailing dashes and punctuation
-    s = re.sub(r"\s*--+\s*$", "", s)
-    s = s.strip(" .-–—")
-
-    # HARD RULE: allow only letters (incl. accents) and spaces — remove any other symbols
-    # This prevents artifacts like "? . General Chemistry"
-    s = re.sub(r"[^A-Za-zÀ-ÿ\s]", " ", s)
-
-    # Collapse whitespace (again after symbol stripping)
-    s = re.sub(r"\s+", " ", s).strip()
-
-    # Guard against heading-like leftovers becoming names
-    if s.lower() in ("current average", "team forums", "assignments", "calendar",
-                     "list of my absences", "teachers info", "recommended websites"):
-        return ""
-
-    return s
-
-PCT_RE = re.compile(r"(\d{1,3}(?:[.,]\d{1,2})?)\s*%")
-# Labels used on both desktop and mobile layouts
-LABEL_GRADE_RE = re.compile(r"(?i)(?:projected\s*grade|your\s*grade|current\s*grade|note|resultat|résultat)\s*[:\-]?\s*(\d{1,3}(?:[.,]\d{1,2})?)\s*%")
-LABEL_AVG_RE   = re.compile(r"(?i)(?:class\s*average|moyenne(?:\s*de\s*classe)?)\s*[:\-]?\s*(\d{1,3}(?:[.,]\d{1,2})?)\s*%")
-# Expanded label patterns (cover "avg" shorthand and more EN/FR variants)
-LABEL_GRADE_RE_ALT = re.compile(
-    r"(?i)\b(?:grade|current\s*grade|projected\s*grade|résultat|resultat)\b[^0-9%]{0,40}(\d{1,3}(?:[.,]\d{1,2})?)\s*%"
-)
-LABEL_AVG_RE_ALT = re.compile(
-    r"(?i)\b(?:avg|average|class\s*avg|class\s*average|moyenne(?:\s*de\s*classe)?)\b[^0-9%]{0,40}(\d{1,3}(?:[.,]\d{1,2})?)\s*%"
-)
-
-def _extract_grade_avg_from_block(block: str):
-    """
-    Prefer labeled values; then fractions a/b -> %; then generic percent fallback.
-    This avoids mixing 'Your Grade' and 'Class Avg' and recovers missing avgs.
-    """
-    your_grade = None
-    class_avg = None
-
-    # 1) Labeled values (any of the patterns)
-    mg = LABEL_GRADE_RE.search(block) or LABEL_GRADE_RE_ALT.search(block)
-    ma = LABEL_AVG_RE.search(block)   or LABEL_AVG_RE_ALT.search(block)
-    if mg:
-        your_grade = _to_float(mg.group(1))
-    if ma:
-        class_avg = _to_float(ma.group(1))
-
-    # 2) Fractions like "47.3/89.01" → your grade %
-    if your_grade is None:
-        frac = _fraction_to_pct(block)
-        if frac is not None:
-            your_grade = frac
-
-    # 3) Directional proximity (percent near 'avg' or 'grade' tokens)
-    if class_avg is None:
-        m = re.search(rf"(?i){PCT_RE.pattern}[^a-z]{{0,40}}(?:avg|average|class\s*average|class\s*avg|moyenne)", block)
-        if m:
-            class_avg = _to_float(m.group(1))
-    if your_grade is None:
-        m = re.search(rf"(?i)(?:grade|current\s*grade|projected\s*grade|résultat|resultat)[^0-9%]{{0,40}}{PCT_RE.pattern}", block)
-        if m:
-            your_grade = _to_float(m.group(1))
-
-    # 4) Generic fallback: first % = grade, last % = class avg
-    if your_grade is None or class_avg is None:
-        pcts = [ _to_float(p) for p in PCT_RE.findall(block) ]
-        pcts = [p for p in pcts if p is not None and p <= 100]
-        if pcts:
-            if your_grade is None:
-                your_grade = pcts[0]
-            if class_avg is None and len(pcts) >= 2:
-                class_avg = pcts[-1]
-
-    return your_grade, class_avg
-def _to_float(s):
-    if not s: return None
-    s = s.replace(",", ".").replace("%", "").strip()
-    try:
-        return float(s)
-    except Exception:
-        return None
-
-def _fraction_to_pct(text):
-    m = re.search(r"\b(\d+(?:[.,]\d+)?)\s*/\s*(\d+(?:[.,]\d+)?)\b", text)
-    if not m: return None
-    a = _to_float(m.group(1)); b = _to_float(m.group(2))
-    if a is None or not b: return None
-    if b == 0: return None
-    return round(100.0 * a / b, 2)
-
-def _parse_omnivox_text(text: str) -> List[Dict[str, Any]]:
-    """Parse Omnivox 'Grades' screenshots text into course rows.
-
-    Strategy:
-      - Pass 1: For each line that contains a Quebec-style class code (e.g., 201-SN2-RE),
-        treat that line as the anchor for the row. Prefer the two percentages found on
-        that same line as (your_grade, class_avg). Course name is taken from the
-        closest previous human-readable line (ignoring left-nav/header junk).
-      - Pass 2: If very few rows were found, fall back to numbered-row parsing.
-    """
-    lines = [ln for ln in text.splitlines() if ln.strip()]
-    rows: List[Dict[str, Any]] = []
-
-    def is_junk_line(s: str) -> bool:
-        t = (s or "").strip().lower()
-        if not t:
-            return True
-        if any(k in t for k in ("omnivox", "john abbott college", "angus beauregard")):
-            return True
-        if any(t.startswith(p) for p in NAV_JUNK_PREFIXES):
-            return True
-        # obvious headings
-        if re.search(r"current\s*grade", t) or re.search(r"class\s*average", t):
-            return True
-        # sidebar crumbs with '>'
-        if ">" in t and len(t) <= 40:
-            return True
-        return False
-
-    i = 0
-    while i < len(lines):
-        ln = lines[i]
-        m = COURSE_CODE_RE.search(ln)
-        if not m:
-            i += 1
-            continue
-
-        class_code = m.group(0).replace(" ", "")
-
-        # --- Percentages: prefer those on the same line as the code ---
-        pcts_on_line = [ _to_float(p) for p in PCT_RE.findall(ln) ]
-        pcts_on_line = [p for p in pcts_on_line if p is not None and p <= 100]
-        your_grade = None
-        class_avg  = None
-
-        # Look a wider surrounding window and use robust extractor
-        start = max(0, i - 4)
-        end   = min(len(lines), i + 8)
-        # Split the neighborhood around the code line into pre/post.
-        # We will **prefer values after the code line** to prevent pulling
-        # the previous card's percentages (which caused a one-row offset).
-        block_pre  = "\n".join(lines[start:i])
-        block_post = "\n".join(lines[i:end])
-
-        # Prefer values that appear after the code line
-        yg, ca = _extract_grade_avg_from_block(block_post)
-        if your_grade is None:
-            your_grade = yg
-        if class_avg is None:
-            class_avg = ca
-        # Final fallback: if still missing, allow pre-code block (rare)
-        if (your_grade is None or class_avg is None) and block_pre:
-            yg2, ca2 = _extract_grade_avg_from_block(block_pre)
-            if your_grade is None:
-                your_grade = yg2
-            if class_avg is None:
-                class_avg = ca2
-
-        # Fallback: if still missing and two percents are on the code line, map [first,last] → [grade, avg]
-        if (your_grade is None or class_avg is None) and len(pcts_on_line) >= 2:
-            if your_grade is None:
-                your_grade = pcts_on_line[0]
-            if class_avg is None:
-                class_avg = pcts_on_line[-1]
-
-        # --- Course name: search upward for a clean, non-junk line ---
-        course_name = ""
-        for k in range(i-1, max(-1, i-4), -1):
-            if k < 0:
-                break
-            cand = _clean_course_name(lines[k])
-            if cand and not is_junk_line(cand) and not COURSE_CODE_RE.search(cand):
-                course_name = cand
-                break
-
-        # Last resort: look slightly below, then bail if it smells like junk
-        if not course_name:
-            for k in range(i+1, min(len(lines), i+4)):
-                cand = _clean_course_name(lines[k])
-                if cand and not is_junk_line(cand) and not COURSE_CODE_RE.search(cand):
-                    course_name = cand
-                    break
-
-        # Filter out clear junk rows
-        if not course_name or is_junk_line(course_name):
-            i += 1
-            continue
-
-        rows.append({
-            "Course Name": course_name,
-            "Class Code": class_code,
-            "Your Grade": your_grade,
-            "Class Avg": class_avg,
-            "Std. Dev": None,
-            "Credits": None,
-        })
-        i += 1
-
-    # Build a set of seen keys (class code or normalized name) to avoid duplicates
-    seen_keys = set()
-    for r in rows:
-        key = (r.get("Class Code") or "").strip()
-        if key:
-            seen_keys.add(("code", key))
-        nm = _clean_course_name(r.get("Course Name", ""))
-        if nm:
-            seen_keys.add(("name", nm.lower()))
-
-    # ---- Pass 2: numbered rows scan (summary table) ----
-    # We always run this to capture any rows the code-anchored pass missed.
-    blocks, cur = [], []
-    for ln in lines:
-        if re.match(r"^\s*\d+\.\s*$", ln) or re.match(r"^\s*\d+\.\s", ln):
-            if cur:
-                blocks.append("\n".join(cur))
-                cur = []
-            cur.append(ln)
-        else:
-            cur.append(ln)
-    if cur:
-        blocks.append("\n".join(cur))
-
-    for block in blocks:
-        bl = [b.strip() for b in block.splitlines() if b.strip()]
-        if not bl:
-            continue
-
-        # Course name: first plausible alpha line after the row number
-        course_name = ""
-        for b in bl[1:5]:
-            cand = _clean_course_name(b)
-            if cand and not COURSE_CODE_RE.search(cand) and len(re.findall(r"[A-Za-zÀ-ÿ]{3,}", cand)) >= 2:
-                course_name = cand
-                break
-        if not course_name:
-            continue
-
-        # Class code within block (optional)
-        class_code = ""
-        for b in bl:
-            m = COURSE_CODE_RE.search(b)
-            if m:
-                class_code = m.group(0).replace(" ", "")
-                break
-
-        # Robust extraction for numbered table blocks
-        your_grade, class_avg = _extract_grade_avg_from_block(block)
-
-        # Skip if we already have this row from pass 1
-        key_code = ("code", class_code) if class_code else None
-        key_name = ("name", course_name.lower())
-        if (key_code and key_code in seen_keys) or key_name in seen_keys:
-            continue
-
-        rows.append({
-            "Course Name": course_name,
-            "Class Code": class_code,
-            "Your Grade": your_grade,
-            "Class Avg": class_avg,
-            "Std. Dev": None,
-            "Credits": None,
-        })
-        if key_code:
-            seen_keys.add(key_code)
-        seen_keys.add(key_name)
-
-    # ---- Pass 3: mobile "Projected grade" cards ----
-    # Anchor each card to its own label lines to avoid leaking % from neighboring cards.
-    for idx, ln in enumerate(lines):
-        if not re.search(r"(?i)projected\s*grade", ln):
-            continue
-
-        # Card bounds: from this "Projected grade" to the next one (exclusive)
-        next_proj = len(lines)
-        for k in range(idx + 1, len(lines)):
-            if re.search(r"(?i)projected\s*grade", lines[k]):
-                next_proj = k
-                break
-
-        # Tight block just for this card
-        block_lines = lines[idx:next_proj]
-        block_text = "\n".join(block_lines)
-
-        # --- Your grade: prefer the % on the same (or immediate next) "Projected grade" line ---
-        your_grade = None
-        for j in range(idx, min(next_proj, idx + 3)):
-            if re.search(r"(?i)projected\s*grade", lines[j]):
-                m_pct = PCT_RE.search(lines[j])
-                if m_pct:
-                    your_grade = _to_float(m_pct.group(1))
-                    break
-        # Fallback to the last labeled 'grade' inside the card only
-        if your_grade is None:
-            m_all = list(LABEL_GRADE_RE.finditer(block_text)) + list(LABEL_GRADE_RE_ALT.finditer(block_text))
-            if m_all:
-                your_grade = _to_float(m_all[-1].group(1))
-            else:
-                # final fallback: a/b → %
-                frac = _fraction_to_pct(block_text)
-                if frac is not None:
-                    your_grade = frac
-
-        # --- Class average: look within this card only ---
-        class_avg = None
-        for j in range(idx, next_proj):
-            if re.search(r"(?i)(class\s*average|class\s*avg|moyenne)", lines[j]):
-                m_pct = PCT_RE.search(lines[j])
-                if m_pct:
-                    class_avg = _to_float(m_pct.group(1))
-                    break
-        if class_avg is None:
-            m_all = list(LABEL_AVG_RE.finditer(block_text)) + list(LABEL_AVG_RE_ALT.finditer(block_text))
-            if m_all:
-                class_avg = _to_float(m_all[-1].group(1))
-
-        # If neither value is found within this card, skip
-        if your_grade is None and class_avg is None:
-            continue
-
-        # --- Class code: search close to the card only (a few lines above or within) ---
-        class_code = ""
-        for j in range(max(0, idx - 5), next_proj):
-            m = COURSE_CODE_RE.search(lines[j])
-            if m:
-                class_code = m.group(0).replace(" ", "")
-                break
-
-        # --- Course name: the nearest clean alpha line above the 'Projected grade' label ---
-        course_name = ""
-        for j in range(idx - 1, max(0, idx - 6) - 1, -1):
-            cand = _clean_course_name(lines[j])
-            if cand and not COURSE_CODE_RE.search(cand) and len(re.findall(r"[A-Za-zÀ-ÿ]{3,}", cand)) >= 2:
-                course_name = cand
-                break
-
-        key_code = ("code", class_code) if class_code else None
-        key_name = ("name", course_name.lower()) if course_name else None
-        if (key_code and key_code in seen_keys) or (key_name and key_name in seen_keys):
-            continue
-
-        rows.append({
-            "Course Name": course_name,
-            "Class Code": class_code,
-            "Your Grade": your_grade,
-            "Class Avg": class_avg,
-            "Std. Dev": None,
-            "Credits": None,
-        })
-        if key_code:
-            seen_keys.add(key_code)
-        if key_name:
-            seen_keys.add(key_name)
-    return rows
-
-def app_extract_from_image_bytes(file_bytes: bytes):
-    """
-    Always-available OCR path used by the Import tab.
-    Returns (rows, engine_status, text_preview).
-    """
-    status = _local_tesseract_status()
-    if Image is None:
-        return [], {**status, "error": "Pillow not available"}, ""
-    if not (status["has_pytesseract"] and status["binary_ok"]):
-        return [], status, ""
-    import pytesseract as _pt
-    img = Image.open(io.BytesIO(file_bytes))
-    prep = _preprocess_gray(img)
-    text = ""
-    last_err = None
-    for cfg in ["--oem 1 --psm 6", "--oem 1 --psm 4", "--oem 1 --psm 3"]:
-        try:
-            t = _pt.image_to_string(prep, lang="eng+fra", config=cfg)
-            text = t or ""
-            # Accept as soon as we see a class code or labeled fields
-            if COURSE_CODE_RE.search(text) or re.search(r"(?i)projected\s*grade", text):
-                break
-        except Exception as e:
-            last_err = e
-    if text == "" and last_err is not None:
-        return [], {**status, "error": str(last_err)}, ""
-    rows = _parse_omnivox_text(text or "")
-    return rows, status, (text or "")[:800]
-
-# ---- Normalize & merge (works for dicts *or* dataclass objects) ----
-_DEF_FIELDS = ["Course Name","Class Code","Your Grade","Class Avg","Std. Dev","Credits"]
-
-def _row_to_dict_any(r):
-    """Return a uniform dict regardless of input row type."""
-    if isinstance(r, dict):
-        d = {k: v for k, v in r.items()}
-        # normalize common alt keys
-        d.setdefault("Course Name", d.get("course_name", ""))
-        d.setdefault("Class Code", d.get("class_code", ""))
-        d.setdefault("Your Grade", d.get("your_grade"))
-        d.setdefault("Class Avg",  d.get("class_avg"))
-        d.setdefault("Std. Dev",   d.get("std_dev"))
-        d.setdefault("Credits",    d.get("credits"))
-    else:
-        d = {
-            "Course Name": getattr(r, "Course Name", None) or getattr(r, "course_name", ""),
-            "Class Code": getattr(r, "Class Code", None) or getattr(r, "class_code", ""),
-            "Your Grade": getattr(r, "Your Grade", None) or getattr(r, "your_grade", None),
-            "Class Avg":  getattr(r, "Class Avg",  None) or getattr(r, "class_avg",  None),
-            "Std. Dev":   getattr(r, "Std. Dev",   None) or getattr(r, "std_dev",   None),
-            "Credits":    getattr(r, "Credits",    None) or getattr(r, "credits",    None),
-        }
-    # string cleanups
-    d["Course Name"] = (d.get("Course Name") or "").strip()
-    d["Class Code"]  = (d.get("Class Code")  or "").strip()
-    return {k: d.get(k) for k in _DEF_FIELDS}
+# --- OCR engine ---
+# The whole import pipeline (Tesseract discovery, decode → preprocess → recognize →
+# parse → merge, batching, result cache) lives in ocr_engine. It is imported the
+# first time the Import view opens, or by the warm-up thread above (that import also
+# runs Tesseract discovery, once per process), and the engine object is shared through st.cache_resource, so a
+# rerun only looks it up instead of redefining or reloading the OCR code.
+from course_names import clean_course_name as _clean_course_name
+
+def _ocr():
+    """The ocr_engine module (PIL, OpenCV, pytesseract), imported on first use."""
+    return startup_timing.timed_import("ocr_engine")
+
+def _px():
+    """plotly.express, imported the first time a view draws a chart."""
+    return startup_timing.timed_import("plotly.express")
 
+@st.cache_resource
+def get_ocr_engine():
+    """Process-wide OCR engine (and result cache) shared by every session and rerun."""
+    ocr_engine = _ocr()
+    # the tesserocr pool is process-wide: built by the RSCORE_OCR_WARMUP thread at
+    # page load if enabled, else lazily on the first OCR call
+    return ocr_engine.OcrEngine(ocr_engine.EngineConfig.from_env(), cache=ocr_engine.default_cache())
+
+def app_extract_many(files_bytes, max_workers=None):
+    """Batch OCR for the Import tab: one (rows, engine_status, text_preview) tuple
+    (or the exception) per upload, in upload order."""
+    return get_ocr_engine().extract_many(files_bytes, max_workers=max_workers)
 
 def app_merge_rows_any(rows):
-    """Merge rows by Class Code (fallback Course Name) filling missing values.
-    Works whether rows are dicts or dataclass CourseRow objects.
-    """
-    merged = {}
-    for r in rows:
-        dr = _row_to_dict_any(r)
-        key = dr.get("Class Code") or dr.get("Course Name", "").lower()
-        if not key:
-            continue
-        if key not in merged:
-            merged[key] = dr
-        else:
-            dst = merged[key]
-            if not dst.get("Course Name") and dr.get("Course Name"):
-                dst["Course Name"] = dr["Course Name"]
-            for fld in ["Your Grade","Class Avg","Std. Dev","Credits"]:
-                if (dst.get(fld) is None or dst.get(fld) == "") and (dr.get(fld) not in (None, "")):
-                    dst[fld] = dr[fld]
-    return list(merged.values())
-# Try to use external ocr_utils if it exists; otherwise shim to our local OCR.
-try:
-    import importlib
-    import ocr_utils as _ocr_utils
-    ocr_utils = importlib.reload(_ocr_utils)
-except Exception:
-    import types
-    ocr_utils = types.SimpleNamespace()
-
-    # Use our local pipeline so callers can keep using the legacy functions.
-    def _shim_extract_from_image_file(file_bytes: bytes):
-        rows, _status, _preview = app_extract_from_image_bytes(file_bytes)
-        return rows
-
-    def _shim_merge_by_code(rows):
-        return app_merge_rows_any(rows)
-
-    ocr_utils.extract_from_image_file = _shim_extract_from_image_file
-    ocr_utils.merge_by_code = _shim_merge_by_code
-# --- OCR aliases for legacy call sites ---
-# If any old code still calls the bare function names, route them to the module.
-def extract_from_image_file(file_bytes):
-    return ocr_utils.extract_from_image_file(file_bytes)
-
-def merge_by_code(rows):
-    return ocr_utils.merge_by_code(rows)
-
-# ---- Fallback OCR implementation if ocr_utils lacks the expected API ----
-try:
-    import re, io
-    from dataclasses import dataclass
-    from typing import List, Dict, Any
-    from PIL import Image
-    try:
-        import pytesseract  # type: ignore
-    except Exception:  # pragma: no cover
-        pytesseract = None  # type: ignore
-    try:
-        import cv2  # type: ignore
-    except Exception:  # pragma: no cover
-        cv2 = None  # type: ignore
-
-    if not hasattr(ocr_utils, 'extract_from_image_file') or not hasattr(ocr_utils, 'merge_by_code'):
-        COURSE_CODE = r"\b\d{3}\s*-\s*[A-Z0-9]{2,4}\s*-\s*[A-Z0-9]{2,3}\b"
-        PCT = r"(\d{1,3}(?:[.,]\d{1,2})?)\s*%"
-        LABEL_GRADE = r"(?:your\s*current\s*grade|projected\s*grade|current\s*grade|note|resultat|result)"
-        LABEL_AVG   = r"(?:class\s*average|moyenne\s*de\s*classe|moyenne|average)"
-        LABEL_SD    = r"(?:std\.?\s*dev\.?|ecart[- ]?type|standard\s*deviation)"
-
-        @dataclass
-        class CourseRow:
-            course_name: str = ""
-            class_code: str = ""
-            your_grade: float | None = None
-            class_avg:  float | None = None
-            std_dev:    float | None = None
-            credits:    float | None = None
-            source:     str = "ocr"
-            def to_app_row(self) -> Dict[str, Any]:
-                return {
-                    "Course Name": self.course_name,
-                    "Your Grade":  self.your_grade,
-                    "Class Avg":   self.class_avg,
-                    "Std. Dev":    self.std_dev,
-                    "Credits":     self.credits,
-                }
-
-        def _preprocess_for_ocr(pil_img: Image.Image) -> Image.Image:
-            img = pil_img.convert("L")
-            if cv2 is None:
-                return img
-            arr = np.array(img)
-            try:
-                arr = cv2.bilateralFilter(arr, d=5, sigmaColor=55, sigmaSpace=55)
-                arr = cv2.adaptiveThreshold(arr, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                            cv2.THRESH_BINARY, 35, 10)
-                # trim borders
-                contours, _ = cv2.findContours(255 - arr, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-                if contours:
-                    x, y, w, h = cv2.boundingRect(np.vstack(contours))
-                    pad = 6
-                    x = max(0, x - pad); y = max(0, y - pad)
-                    arr = arr[y:y + h + 2*pad, x:x + w + 2*pad]
-                h_, w_ = arr.shape
-                if max(w_, h_) < 1500:
-                    arr = cv2.resize(arr, None, fx=1.5, fy=1.5, interpolation=cv2.INTER_CUBIC)
-                return Image.fromarray(arr)
-            except Exception:
-                return img
-
-        def _ocr_text(pil_img: Image.Image, lang: str = "eng+fra") -> str:
-            if pytesseract is None:
-                return ""
-            prep = _preprocess_for_ocr(pil_img)
-            cfg = "--oem 1 --psm 6"
-            try:
-                return pytesseract.image_to_string(prep, lang=lang, config=cfg)
-            except Exception:
-                return pytesseract.image_to_string(prep)  # fallback
-
-        def _tesseract_status():
-            status = {"has_pytesseract": pytesseract is not None, "binary_ok": False, "version": None, "error": None}
-            if pytesseract is None:
-                status["error"] = "pytesseract not installed in environment"
-                return status
-            try:
-                # Will raise if the binary is not found
-                v = pytesseract.get_tesseract_version()
-                status["binary_ok"] = True
-                status["version"] = str(v)
-            except Exception as e:
-                status["error"] = str(e)
-            return status
+    return _ocr().OcrEngine.merge(rows)
 
-        def _debug_ocr(file_bytes: bytes) -> Dict[str, Any]:
-            info: Dict[str, Any] = {}
-            try:
-                pil = Image.open(io.BytesIO(file_bytes))
-                info["image_mode"] = pil.mode
-                info["image_size"] = pil.size
-            except Exception as e:
-                info["open_error"] = str(e)
-                return info
-            try:
-                prep = _preprocess_for_ocr(pil)
-                info["preprocessed_size"] = getattr(prep, "size", None)
-            except Exception as e:
-                info["preprocess_error"] = str(e)
-            txt = ""
-            try:
-                txt = _ocr_text(pil)
-            except Exception as e:
-                info["ocr_error"] = str(e)
-            info["tesseract_status"] = _tesseract_status()
-            info["text_len"] = len(txt or "")
-            preview = (txt or "")[:800]
-            info["text_preview"] = preview
-            try:
-                codes = re.findall(COURSE_CODE, txt or "")
-                info["codes_found"] = codes
-            except Exception:
-                info["codes_found"] = []
-            try:
-                pcts = re.findall(PCT, txt or "")
-                info["percents_found"] = pcts[:20]
-            except Exception:
-                info["percents_found"] = []
-            try:
-                rows = extract_courses_from_text(txt or "")
-                info["rows_parsed"] = [getattr(r, "course_name", "") for r in rows][:10]
-                info["rows_count"] = len(rows)
-            except Exception as e:
-                info["parse_error"] = str(e)
-            return info
-
-        def _to_float(x: str | None) -> float | None:
-            if not x: return None
-            x = x.replace(",", ".").replace("%", "").strip()
-            try:
-                return float(x)
-            except Exception:
-                return None
-
-        def _pct_near_label(text: str, label_pat: str) -> float | None:
-            t = text.lower()
-            m = re.search(rf"{label_pat}[^0-9%]{{0,40}}{PCT}", t)
-            if m:
-                return _to_float(m.group(1))
-            m = re.search(rf"{PCT}[^a-z]{{0,40}}{label_pat}", t)
-            if m:
-                return _to_float(m.group(1))
-            return None
-
-        def _fraction_to_pct(text: str) -> float | None:
-            m = re.search(r"\b(\d+(?:[.,]\d+)?)\s*/\s*(\d+(?:[.,]\d+)?)\b", text)
-            if not m: return None
-            a = _to_float(m.group(1)); b = _to_float(m.group(2))
-            if a is None or not b: return None
-            if b == 0: return None
-            return round(100.0 * a / b, 2)
-
-        def extract_courses_from_text(text: str) -> List[CourseRow]:
-            """
-            Two-pass parser:
-              Pass 1: anchor on Quebec course codes like 109-102-MQ (most reliable).
-              Pass 2: if few/none found, split by row numbers '1.', '2.', ... and
-                      treat the first percent in the block as 'your grade' and the
-                      last percent as 'class average'. Also accepts 'a/b' → %.
-            """
-            lines = [ln for ln in text.splitlines() if ln.strip()]
-            rows: List[CourseRow] = []
-
-            # ---- Pass 1: by course code anchor ----
-            i = 0
-            while i < len(lines):
-                ln = lines[i]
-                code_match = re.search(COURSE_CODE, ln)
-                if not code_match:
-                    i += 1
-                    continue
-
-                start = max(0, i - 2)
-                end   = min(len(lines), i + 8)
-                block = "\n".join(lines[start:end])
-
-                # Course name: prefer previous line or earlier alpha line not containing a code
-                course_name = ""
-                if i > 0:
-                    prev = lines[i-1].strip()
-                    if len(re.findall(r"[A-Za-zÀ-ÿ]{3,}", prev)) >= 2 and "sect" not in prev.lower():
-                        course_name = prev
-                if not course_name:
-                    for k in range(start, i):
-                        cand = lines[k].strip()
-                        if len(re.findall(r"[A-Za-zÀ-ÿ]{3,}", cand)) >= 2 and not re.search(COURSE_CODE, cand) and "sect" not in cand.lower():
-                            course_name = cand
-                            break
-
-                class_code = code_match.group(0).replace(" ", "")
-
-                # Try labeled extraction first
-                your_grade = _pct_near_label(block, LABEL_GRADE)
-                class_avg  = _pct_near_label(block, LABEL_AVG)
-                std_dev    = _pct_near_label(block, LABEL_SD)
-
-                # If no explicit 'your grade' label, try fraction a/b → %
-                if your_grade is None:
-                    frac = _fraction_to_pct(block)
-                    if frac is not None:
-                        your_grade = frac
-
-                # If still missing avg, take last percentage in block as class average
-                if class_avg is None:
-                    pcts = [ _to_float(p) for p in re.findall(PCT, block) ]
-                    pcts = [p for p in pcts if p is not None and p <= 100]
-                    if pcts:
-                        if your_grade is None:
-                            your_grade = pcts[0]
-                        class_avg = pcts[-1] if len(pcts) > 1 else None
-
-                rows.append(CourseRow(
-                    course_name=course_name,
-                    class_code=class_code,
-                    your_grade=your_grade,
-                    class_avg=class_avg,
-                    std_dev=std_dev
-                ))
-
-                i += 1  # jump past this block
-
-            # ---- Pass 2: numbered rows fallback (works for the big 'Grades' table) ----
-            if len(rows) < 2:
-                # Build row blocks split on "1.", "2.", ...
-                blocks: list[str] = []
-                cur: list[str] = []
-                for ln in lines:
-                    if re.match(r"^\s*\d+\.\s*$", ln) or re.match(r"^\s*\d+\.\s", ln):
-                        if cur:
-                            blocks.append("\n".join(cur))
-                            cur = []
-                        cur.append(ln)
-                    else:
-                        cur.append(ln)
-                if cur:
-                    blocks.append("\n".join(cur))
-
-                for block in blocks:
-                    blines = [b.strip() for b in block.splitlines() if b.strip()]
-                    # Course name: first good alpha line after the row number
-                    course_name = ""
-                    for b in blines[1:4]:
-                        if len(re.findall(r"[A-Za-zÀ-ÿ]{3,}", b)) >= 2 and "sect" not in b.lower():
-                            course_name = _clean_course_name(b)
-                            if course_name:
-                                break
-
-                    # Course code within block (optional)
-                    class_code = ""
-                    for b in blines:
-                        m = re.search(COURSE_CODE, b)
-                        if m:
-                            class_code = m.group(0).replace(" ", "")
-                            break
-
-                    # Percentages in block
-                    pcts = [ _to_float(p) for p in re.findall(PCT, block) ]
-                    pcts = [p for p in pcts if p is not None and p <= 100]
-                    your_grade = None
-                    class_avg  = None
-
-                    frac = _fraction_to_pct(block)
-                    if frac is not None:
-                        your_grade = frac
-                    if pcts:
-                        if your_grade is None:
-                            your_grade = pcts[0]
-                        if len(pcts) >= 2:
-                            class_avg = pcts[-1]
-
-                    if course_name or class_code or (your_grade is not None or class_avg is not None):
-                        rows.append(CourseRow(
-                            course_name=course_name,
-                            class_code=class_code,
-                            your_grade=your_grade,
-                            class_avg=class_avg,
-                            std_dev=None
-                        ))
-
-            return rows
-
-        def merge_by_code(rows: List[CourseRow]) -> List[CourseRow]:
-            by: Dict[str, CourseRow] = {}
-            for r in rows:
-                key = r.class_code or r.course_name.lower()
-                if key not in by:
-                    by[key] = r
-                else:
-                    dst = by[key]
-                    if not dst.course_name and r.course_name: dst.course_name = r.course_name
-                    if dst.your_grade is None and r.your_grade is not None: dst.your_grade = r.your_grade
-                    if dst.class_avg  is None and r.class_avg  is not None: dst.class_avg  = r.class_avg
-                    if dst.std_dev    is None and r.std_dev    is not None: dst.std_dev    = r.std_dev
-                    if dst.credits    is None and r.credits    is not None: dst.credits    = r.credits
-            return list(by.values())
-
-        def extract_from_image_file(file_bytes: bytes) -> List[CourseRow]:
-            img = Image.open(io.BytesIO(file_bytes))
-            text = _ocr_text(img)
-            return extract_courses_from_text(text)
-
-        # Attach fallbacks to the imported module namespace so the rest of the app can call them
-        ocr_utils.extract_from_image_file = extract_from_image_file  # type: ignore
-        ocr_utils.merge_by_code = merge_by_code  # type: ignore
-        ocr_utils._debug_ocr = _debug_ocr  # type: ignore
-        ocr_utils._tesseract_status = _tesseract_status  # type: ignore
-except Exception:
-    # If anything above fails, we'll surface the error during the first OCR call
-    pass
+def _recheck_engine_button(key):
+    """Engine detection is cached per process; this re-probes after installing Tesseract/language data."""
+    if st.button("↻ Re-check OCR engine", key=key):
+        get_ocr_engine().status(refresh=True)
+        st.rerun()
 
 # ================== PAGE & THEME ==================
 st.set_page_config(page_title="R-Score Dashboard", layout="wide")
@@ -1068,48 +255,6 @@ header, div[data-testid="stToolbar"] {
   padding: 1rem 1.25rem;
   box-shadow: 0 12px 30px rgba(0,0,0,0.3);
 }
-import streamlit as st
-from supabase import create_client, Client
-
-@st.cache_resource
-def get_supabase_client() -> Client:
-    url = st.secrets["SUPABASE_URL"]
-    key = st.secrets["SUPABASE_KEY"]
-    return create_client(url, key)
-
-supabase = get_supabase_client()
-
-def show_login():
-    st.title("Sign in or Sign up to RScoreCalc")
-
-    email = st.text_input("Email")
-    password = st.text_input("Password", type="password")
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        if st.button("Sign in"):
-            try:
-                res = supabase.auth.sign_in_with_password({"email": email, "password": password})
-                user = res.user
-                if user:
-                    st.session_state["user"] = user
-                    # fetch profile
-                    prof = supabase.table("profiles").select("*").eq("id", user.id).single().execute()
-                    st.session_state["is_premium"] = prof.data.get("is_premium", False)
-                    st.rerun()
-                else:
-                    st.error("Login failed.")
-            except Exception as e:
-                st.error(f"Auth error: {e}")
-
-    with col2:
-        if st.button("Create account"):
-            try:
-                res = supabase.auth.sign_up({"email": email, "password": password})
-                st.success("✅ Account created! Check your email to confirm before logging in.")
-            except Exception as e:
-                st.error(f"Sign-up error: {e}")
 /* ===== tabs ===== */
 .stTabs [data-baseweb="tab-list"] {
   background: rgba(255,255,255,0.85);
@@ -1172,6 +317,31 @@ def show_login():
   box-shadow: 0 4px 10px rgba(0,0,0,0.04);
 }
 
+/* ===== view switcher (the "view" radio, styled like the tab pills) ===== */
+.st-key-view div[role="radiogroup"] {
+  background: rgba(255,255,255,0.85);
+  border-radius: 9999px;
+  padding: 0.35rem;
+  box-shadow: 0 8px 24px rgba(15, 23, 42, 0.06);
+  gap: 0.5rem;
+  flex-wrap: wrap;
+}
+.st-key-view div[role="radiogroup"] label {
+  border-radius: 9999px;
+  padding: 0.45rem 1.1rem;
+  margin: 0;
+  color: #4b5563;
+  font-weight: 500;
+  transition: all .2s ease-in-out;
+}
+.st-key-view div[role="radiogroup"] label > div:first-child { display: none; }
+.st-key-view div[role="radiogroup"] label:hover { background: rgba(255,255,255,0.5); }
+.st-key-view div[role="radiogroup"] label:has(input:checked) {
+  background: #ffffff;
+  color: #111827;
+  box-shadow: 0 4px 10px rgba(0,0,0,0.04);
+}
+
 /* ===== tables ===== */
 [data-testid="stDataFrame"] {
   border-radius: 16px;
@@ -1222,254 +392,102 @@ div[data-testid="stToolbar"] {
 </style>
 """, unsafe_allow_html=True)
 # ================== CONSTANTS ==================
-REQUIRED_COLS = ["Course Name", "Your Grade", "Class Avg", "Std. Dev", "Credits"]
-ALL_COLS = REQUIRED_COLS
-
-# maps from messy CSV headers -> ours
-HEADER_ALIASES = {
-    "course": "Course Name",
-    "course name": "Course Name",
-    "class": "Course Name",
-    "grade": "Your Grade",
-    "your grade": "Your Grade",
-    "note": "Your Grade",
-    "mark": "Your Grade",
-    "average": "Class Avg",
-    "class avg": "Class Avg",
-    "std": "Std. Dev",
-    "std dev": "Std. Dev",
-    "standard deviation": "Std. Dev",
-    "credits": "Credits",
-    "credit": "Credits",
-}
-# ---------- Credit lookup helpers ----------
-import re as _re
-
-def _norm_code(code: str) -> str:
-    if not code:
-        return ""
-    return _re.sub(r"\s+", "", str(code).upper())
+# CSV headers, numeric cleaning and credit autofill are shared with rscore_cli
+from course_data import REQUIRED_COLS, CREDIT_MAPPING_FILES, clean_numeric
+import course_data
 
-def _norm_name(name: str) -> str:
-    # reuse your _clean_course_name if present
-    try:
-        return _clean_course_name(name).lower()
-    except NameError:
-        # fallback: letters+spaces only
-        s = _re.sub(r"[^A-Za-zÀ-ÿ\s]", " ", str(name) or "")
-        s = _re.sub(r"\s+", " ", s).strip()
-        return s.lower()
+# Class Code is optional (blank when unknown); it feeds credit lookups and the
+# course-family priors of the uncertainty bands
+ALL_COLS = REQUIRED_COLS + ["Class Code"]
 
+# ---------- Credit lookup helpers ----------
 @st.cache_data(show_spinner=False)
 def load_credit_mappings(mtime_sig: float | None = None):
     """
-    Loads one or more mapping files and returns:
-      - code_to_credits: dict["201-SN2-RE"] -> 2.0
-      - name_to_credits: dict["differential calculus"] -> 2.0
-    Recognized filenames/columns are flexible.
-
+    (code_to_credits, name_to_credits) from the mapping files, see course_data.
     mtime_sig is a cache-buster; pass _credit_mapping_mtime_sig() so edits to the CSV invalidate cache.
     """
-    candidates = [
-        "course_credits_mapping.csv",
-        "data/course_credits_mapping.csv",
-        "credits_map.csv",
-        "ministerial_credits.csv",
-        "data/ministerial_credits.csv",
-    ]
-    code_to, name_to = {}, {}
-
-    for fn in candidates:
-        if not os.path.exists(fn):
-            continue
-        try:
-            m = pd.read_csv(fn)
-        except Exception:
-            continue
-
-        # lenient column discovery
-        cols = {c.strip().lower(): c for c in m.columns}
-        col_code = cols.get("class code") or cols.get("code") or cols.get("class_code") or cols.get("course code") or cols.get("ministerial code")
-        col_name = cols.get("course name") or cols.get("name") or cols.get("course") or cols.get("title")
-        col_cred = cols.get("credits") or cols.get("credit") or cols.get("cr")
-        if not col_cred:
-            continue
-
-        mm = m.copy()
-        for c in (col_code, col_name, col_cred):
-            if c and c in mm.columns:
-                mm[c] = mm[c].astype(str)
-
-        # coerce credits
-        mm["_credits_"] = pd.to_numeric(mm[col_cred], errors="coerce")
-        mm = mm[pd.notna(mm["_credits_"]) & (mm["_credits_"] > 0)]
-
-        # helpers
-        def _norm_code_local(v: str) -> str:
-            return _re.sub(r"\s+", "", str(v or "")).upper()
-
-        def _norm_name_local(v: str) -> str:
-            try:
-                return _clean_course_name(v).lower()
-            except Exception:
-                s = _re.sub(r"[^A-Za-zÀ-ÿ\s]", " ", str(v) or "")
-                s = _re.sub(r"\s+", " ", s).strip()
-                return s.lower()
-
-        if col_code and col_code in mm.columns:
-            for v, cr in zip(mm[col_code], mm["_credits_"]):
-                code_to[_norm_code_local(v)] = float(cr)
-
-        if col_name and col_name in mm.columns:
-            for v, cr in zip(mm[col_name], mm["_credits_"]):
-                name_to[_norm_name_local(v)] = float(cr)
-
     # reference mtime_sig to bind it into cache key
     _ = mtime_sig
-    return code_to, name_to
+    return course_data.load_credit_mappings()
 
-# Helper: cache-busting signature for mapping files
 def _credit_mapping_mtime_sig() -> float:
-    """Return a combined mtime signature for known mapping files."""
-    paths = [
-        "course_credits_mapping.csv",
-        "data/course_credits_mapping.csv",
-        "credits_map.csv",
-        "ministerial_credits.csv",
-        "data/ministerial_credits.csv",
-    ]
-    mtimes = []
-    for pth in paths:
-        try:
-            if os.path.exists(pth):
-                mtimes.append(os.path.getmtime(pth))
-        except Exception:
-            pass
-    return float(sum(mtimes)) if mtimes else 0.0
+    return course_data.credit_mapping_mtime_sig()
 
 def autofill_credits_df(df_in: pd.DataFrame) -> pd.DataFrame:
-    """
-    Returns a copy with Credits filled where missing/zero using:
-      1) Class Code match
-      2) Cleaned Course Name match
-    Adds a readonly 'Credits Source' column for debugging.
-    """
+    """Credits filled where missing/zero (by Class Code, then Course Name) + 'Credits Source'."""
     code_to, name_to = load_credit_mappings(_credit_mapping_mtime_sig())
-    df = df_in.copy()
-    if "Credits" not in df.columns:
-        df["Credits"] = np.nan
-
-    # If empty, ensure debug column exists and return immediately
-    if df.empty:
-        if "Credits Source" not in df.columns:
-            df["Credits Source"] = None
-        return df
-
-    def choose(row):
-        cr = row.get("Credits", np.nan)
-        if pd.notna(cr) and float(cr or 0) > 0:
-            return cr, None
-        # try code
-        code = _norm_code(row.get("Class Code", ""))
-        if code and code in code_to:
-            return code_to[code], "code"
-        # try name
-        nm = _norm_name(row.get("Course Name", ""))
-        if nm and nm in name_to:
-            return name_to[nm], "name"
-        return np.nan, None
-
-    # Build a 2-column frame in a robust way (works across pandas versions)
-    picked = df.apply(lambda r: pd.Series(choose(r), index=["_credits", "_source"]), axis=1)
-
-    # Assign back with proper dtypes
-    df["Credits"] = pd.to_numeric(picked["_credits"], errors="coerce")
-    df["Credits Source"] = picked["_source"].astype("string")
-    return df
+    return course_data.autofill_credits(df_in, code_to, name_to)
 # ================== HELPERS ==================
-def zscore(grade, avg, sd):
-    try:
-        grade = float(grade); avg = float(avg); sd = float(sd)
-        if sd == 0:
-            return 0.0
-        return (grade - avg) / sd
-    except Exception:
-        return 0.0
-
-def clean_numeric(df: pd.DataFrame, cols):
-    for c in cols:
-        if c not in df.columns:
-            df[c] = np.nan
-        df[c] = (
-            df[c].astype(str)
-            .str.replace(",", ".", regex=False)
-            .str.extract(r"([0-9.]+)")[0]
-            .astype(float)
-        )
-    return df
-
 def ensure_columns(df: pd.DataFrame) -> pd.DataFrame:
     for c in ALL_COLS:
         if c not in df.columns:
             df[c] = ""
     return df[ALL_COLS]
 
-def load_uni_csv(path="uni_acceptance.csv") -> pd.DataFrame:
-    if os.path.exists(path):
-        df = pd.read_csv(path)
-    else:
-        # fallback sample with min & recommended thresholds
-        df = pd.DataFrame([
-            ("McGill","Bachelor of Engineering",31.0,32.5,"https://www.mcgill.ca/engineering/"),
-            ("McGill","Desautels BCom (Management)",30.0,31.0,"https://www.mcgill.ca/desautels/programs/bcom"),
-            ("McGill","BSc (Science)",28.5,30.0,"https://www.mcgill.ca/science/"),
-            ("Concordia","BCompSci (Computer Science)",27.0,28.0,"https://www.concordia.ca/academics/undergraduate/computer-science.html"),
-            ("Concordia","BEng (Mechanical)",28.0,29.5,"https://www.concordia.ca/academics/undergraduate/mechanical-engineering.html"),
-            ("Université de Montréal","BSc (Sciences)",27.5,28.5,"https://admission.umontreal.ca/programmes/"),
-            ("Polytechnique Montréal","BEng",29.0,30.5,"https://www.polymtl.ca/futurs/"),
-            ("ÉTS","BEng (Génie)",26.5,27.5,"https://www.etsmtl.ca/programmes/1er-cycle"),
-            ("Université Laval","Bachelor programs (sample)",26.0,27.0,"https://www.ulaval.ca/etudes"),
-            ("Université de Sherbrooke","BEng",27.0,28.0,"https://www.usherbrooke.ca/programmes"),
-            ("UQAM","BAA / Business",25.0,26.0,"https://etudier.uqam.ca/"),
-        ], columns=["university","program","min_r","rec_r","url"])
-    # normalize columns
-    for col in ["university","program","min_r","url"]:
-        if col not in df.columns:
-            df[col] = ""
-    if "rec_r" not in df.columns:
-        try:
-            df["rec_r"] = pd.to_numeric(df["min_r"], errors="coerce") + 1.0
-        except Exception:
-            df["rec_r"] = df["min_r"]
-    return df[["university","program","min_r","rec_r","url"]]
-
-def map_headers(df: pd.DataFrame) -> pd.DataFrame:
-    """Try to rename messy CSV headers to our standard ones."""
-    new_cols = {}
-    for col in df.columns:
-        key = col.strip().lower()
-        if key in HEADER_ALIASES:
-            new_cols[col] = HEADER_ALIASES[key]
-    if new_cols:
-        df = df.rename(columns=new_cols)
-    return df
+@st.cache_resource(show_spinner=False)
+def _program_index(path: str, mtime: float):
+    """Programs index, rebuilt only when the catalogue file changes (mtime is the cache key)."""
+    return programs.ProgramIndex(programs.load_programs(path))
+
+def get_program_index(path="uni_acceptance.csv"):
+    mtime = os.path.getmtime(path) if os.path.exists(path) else 0.0
+    return _program_index(path, mtime)
 
 def compute_importance(df: pd.DataFrame):
+    """Importance = exact overall-R gain per grade point: (5 ÷ Std. Dev) × (Credits ÷ Total Credits)."""
     if df.empty:
         return df.assign(Importance=0.0)
-    total_credits = df["Credits"].fillna(1).replace(0,1).sum()
-    imps = []
-    for _, r in df.iterrows():
-        sd = r["Std. Dev"]
-        cr = r["Credits"] if pd.notna(r["Credits"]) and r["Credits"] != 0 else 1
-        if pd.isna(sd) or sd == 0 or total_credits == 0:
-            imps.append(0.0)
-        else:
-            imps.append((5.0 / sd) * (cr / total_credits))
     df = df.copy()
-    df["Importance"] = imps
+    df["Importance"] = rscore.marginal_r(df["Your Grade"], df["Class Avg"], df["Std. Dev"],
+                                         df["Credits"].fillna(1).replace(0, 1))
+    return df
+
+def prepare_scoring_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Numeric grade columns; missing or zero credits count as 1."""
+    df = clean_numeric(df, ["Your Grade", "Class Avg", "Std. Dev", "Credits"])
+    df["Credits"] = df["Credits"].fillna(1)
+    df.loc[df["Credits"] == 0, "Credits"] = 1
     return df
 
+# ---------- View cache ----------
+# Only the selected view runs on a rerun (see VIEWS below). Whatever a view derives
+# from the course table is kept per session, keyed by what else it depends on, and
+# dropped as a whole when st.session_state.df is replaced (every edit path assigns a
+# new frame), so coming back to a view whose inputs didn't change is a lookup.
+
+def view_cache() -> Dict[Any, Any]:
+    memo = st.session_state.setdefault("_view_cache", {"src": None, "entries": {}})
+    if memo["src"] is not st.session_state.df:
+        memo["src"] = st.session_state.df
+        memo["entries"] = {}
+    return memo["entries"]
+
+def cached_view(key, compute):
+    """compute() once per key for the current course table."""
+    entries = view_cache()
+    if key not in entries:
+        entries[key] = compute()
+    return entries[key]
+
+def session_scores(r_offset_min: float = 0.0, r_offset_max: float = 0.0):
+    """(cleaned copy of st.session_state.df, rscore.RScores); scores are None when empty."""
+    def _clean():
+        src = st.session_state.df
+        return pd.DataFrame(columns=ALL_COLS) if src is None or src.empty else prepare_scoring_df(src.copy())
+    df = cached_view("scoring_df", _clean)
+    key = (float(r_offset_min), float(r_offset_max))
+
+    def _score():
+        if df.empty:
+            return None
+        # Per-session scorer: only edited rows are rescored and the overall sums move
+        # by delta (see rscore.IncrementalScorer)
+        scorer = st.session_state.setdefault("rscore_incremental", rscore.IncrementalScorer())
+        return scorer.score(df["Your Grade"], df["Class Avg"], df["Std. Dev"], df["Credits"],
+                            r_offset_min=key[0], r_offset_max=key[1])
+    return df.copy(), cached_view(("scores",) + key, _score)
+
 
 # ================== SESSION ==================
 if "df" not in st.session_state:
@@ -1506,21 +524,12 @@ if not st.session_state.get("is_premium", False):
 
     st.switch_page("landing.py")
     st.stop()
-# ================== TABS ==================
-# Add Help/Explanation first; Settings last
-explain_tab, manual_tab, csv_tab, import_tab, tab3, tab4, tab5, tab6, settings_tab = st.tabs([
-    "Help / Explanation",
-    "Manual",
-    "CSV",
-    "Import (OCR)",
-    "Results",
-    "Importance",
-    "Biggest gains",
-    "Programs",
-    "Settings"
-])
+# ================== VIEWS ==================
+# Each tab is a function and only the selected one runs, so a rerun costs what the
+# visible view costs. Registered in VIEWS (Help first, Settings last) after the last
+# definition and dispatched right before the footer.
 # ---------- EXPLANATION TAB ----------
-with explain_tab:
+def view_help():
     st.subheader("How to get your numbers (step‑by‑step)")
 
     st.markdown(
@@ -1592,15 +601,16 @@ with explain_tab:
     )
 
 # ---------- MANUAL TAB ----------
-with manual_tab:
+def view_manual():
     st.write("Enter or edit your courses below. Click 'Confirm Changes' when done.")
 
     if "df" not in st.session_state:
-        st.session_state.df = pd.DataFrame(columns=REQUIRED_COLS)
+        st.session_state.df = pd.DataFrame(columns=ALL_COLS)
 
     df_manual = st.session_state.df.copy()
-    df_manual = ensure_columns(df_manual)[REQUIRED_COLS]
+    df_manual = ensure_columns(df_manual)
     df_manual["Course Name"] = df_manual["Course Name"].astype(str).fillna("")
+    df_manual["Class Code"] = df_manual["Class Code"].fillna("").astype(str)
 
     editor_key = f"manual_editor_{st.session_state.get('manual_editor_version', 0)}"
 
@@ -1611,7 +621,7 @@ with manual_tab:
         hide_index=True,
         key=editor_key,
         column_config={
-            # ... your column_config ...
+            "Class Code": st.column_config.TextColumn("Class Code", help="Optional, e.g. 201-NYA-05"),
         },
     )
 
@@ -1620,13 +630,7 @@ with manual_tab:
         st.success("Changes saved!")
         st.rerun()
 # ---------- CSV TAB ----------
-with import_tab:
-    if not st.session_state.get("is_premium", False):
-        require_premium()
-    else:
-        st.markdown("### 📸 Import from Omnivox screenshots")
-        pass
-with csv_tab:
+def view_csv():
     st.write("Upload a CSV. We'll try to auto-detect columns.")
 
     template_df = pd.DataFrame([
@@ -1653,42 +657,32 @@ with csv_tab:
     up = st.file_uploader("Upload CSV", type=["csv"], key="csv_up")
     if up is not None:
         try:
-            df_up = pd.read_csv(up, encoding="utf-8-sig", engine="python")
-            rename_map = {}
-            for c in df_up.columns:
-                c_lower = c.strip().lower().replace(".", "").replace("_", "").replace(" ", "")
-                if "coursename" in c_lower or c_lower in ("course","classname","name"):
-                    rename_map[c] = "Course Name"
-                elif "grade" in c_lower or "mark" in c_lower or "note" in c_lower:
-                    rename_map[c] = "Your Grade"
-                elif "avg" in c_lower or "average" in c_lower or "mean" in c_lower:
-                    rename_map[c] = "Class Avg"
-                elif "std" in c_lower or "deviation" in c_lower or "sigma" in c_lower:
-                    rename_map[c] = "Std. Dev"
-                elif "credit" in c_lower or c_lower == "cr":
-                    rename_map[c] = "Credits"
-            df_up = df_up.rename(columns=rename_map)
-            for col in REQUIRED_COLS:
-                if col not in df_up.columns:
-                    df_up[col] = np.nan
-            df_up = df_up[REQUIRED_COLS]
-            df_up = clean_numeric(df_up, ["Your Grade", "Class Avg", "Std. Dev", "Credits"])
-            df_up["Credits"] = df_up["Credits"].fillna(1)
-            df_up.loc[df_up["Credits"] == 0, "Credits"] = 1
-            # Try to autofill Credits from mapping (by code/name)
-            df_up = autofill_credits_df(df_up)
-            df_up["Credits"] = pd.to_numeric(df_up["Credits"], errors="coerce").fillna(1)
-            df_up.loc[df_up["Credits"] == 0, "Credits"] = 1
+            # Streamed in chunks: detect headers once, clean + validate numbers, autofill missing Credits, default to 1
+            csv_progress = st.progress(0.0, text="Reading CSV…")
+
+            def _csv_progress(rows, frac):
+                csv_progress.progress(frac if frac is not None else 0.0, text=f"Read {rows:,} rows…")
+
+            imported = course_data.import_course_csv(
+                up, *load_credit_mappings(_credit_mapping_mtime_sig()), on_progress=_csv_progress
+            )
+            csv_progress.empty()
+            df_up = imported.df
             st.session_state.df = df_up
             st.success(f"Loaded {len(df_up)} rows from CSV.")
+            if imported.n_errors:
+                with st.expander(f"⚠️ {imported.n_errors} value(s) need a look — they were left blank"):
+                    st.dataframe(pd.DataFrame(imported.errors), use_container_width=True, hide_index=True)
+                    if imported.n_errors > len(imported.errors):
+                        st.caption(f"Showing the first {len(imported.errors)}.")
             st.session_state.manual_editor_version = st.session_state.get("manual_editor_version", 0) + 1
         except Exception as e:
             st.error(f"CSV error: {e}")
 
 # ---------- IMPORT TAB (Photo OCR only) ----------
-with import_tab:
+def view_import():
     require_premium()
-with import_tab:
+    ocr_engine = _ocr()
     st.markdown("### 📸 Import from Omnivox screenshots")
 
     ocr_files = st.file_uploader(
@@ -1700,7 +694,7 @@ with import_tab:
 
     # Always initialize these so downstream code never sees undefined names
     df_ocr = pd.DataFrame(columns=["Course Name","Class Code","Your Grade","Class Avg","Std. Dev","Credits"])
-    tess_status = _local_tesseract_status()
+    tess_status = get_ocr_engine().status()
     ocr_debug = []
     all_rows = []
 
@@ -1708,14 +702,7 @@ with import_tab:
     with st.expander("ℹ️ Credit mapping status"):
         code_map, name_map = load_credit_mappings(_credit_mapping_mtime_sig())
         st.write(f"Loaded **{len(code_map)}** code mappings and **{len(name_map)}** name mappings.")
-        candidates = [
-            "course_credits_mapping.csv",
-            "data/course_credits_mapping.csv",
-            "credits_map.csv",
-            "ministerial_credits.csv",
-            "data/ministerial_credits.csv",
-        ]
-        found = [p for p in candidates if os.path.exists(p)]
+        found = [p for p in CREDIT_MAPPING_FILES if os.path.exists(p)]
         if found:
             st.write("Found file(s):")
             for p in found:
@@ -1733,10 +720,14 @@ with import_tab:
 
     if ocr_files:
         st.caption(f"Processing {len(ocr_files)} screenshot(s)…")
-        for up in ocr_files:
+        # Read every upload up front, then OCR them in parallel (results keep upload order)
+        ocr_bytes = [up.read() for up in ocr_files]
+        ocr_results = app_extract_many(ocr_bytes)
+        for up, result in zip(ocr_files, ocr_results):
             try:
-                _bytes = up.read()
-                rows, status_used, preview = app_extract_from_image_bytes(_bytes)
+                if isinstance(result, Exception):
+                    raise result
+                rows, status_used, preview = result
                 if status_used:
                     tess_status = status_used
                 all_rows.extend(rows)
@@ -1762,7 +753,10 @@ with import_tab:
                     "rows_found": len(rows),
                     "rows_preview": snapshot[:6],
                     "engine": tess_status,
-                    "analysis": {"text_preview": preview},
+                    "analysis": {
+                        "text_preview": preview,
+                        "rois": ((status_used or {}).get("ocr_pass") or {}).get("rois", []),
+                    },
                 })
             except Exception as e:
                 st.warning(f"OCR error on {getattr(up,'name','image')}: {e}")
@@ -1790,7 +784,8 @@ with import_tab:
             df_ocr["Credits Source"] = ""
 
         # Review editor (2-decimals everywhere)
-        review_cols = ["Course Name","Your Grade","Class Avg","Std. Dev","Credits"]
+        review_cols = ["Course Name","Your Grade","Class Avg","Std. Dev","Credits","Class Code"]
+        df_ocr["Class Code"] = df_ocr["Class Code"].fillna("").astype(str)
         for col in ["Your Grade","Class Avg","Std. Dev","Credits"]:
             df_ocr[col] = pd.to_numeric(df_ocr[col], errors="coerce")
 
@@ -1805,6 +800,7 @@ with import_tab:
                 "Class Avg":   st.column_config.NumberColumn("Class Avg",  min_value=0.0, max_value=100.0, step=0.01, format="%.2f"),
                 "Std. Dev":    st.column_config.NumberColumn("Std. Dev",   min_value=0.0, max_value=50.0,  step=0.01, format="%.2f"),
                 "Credits":     st.column_config.NumberColumn("Credits",     min_value=0.0, max_value=10.0,  step=0.01, format="%.2f"),
+                "Class Code":  st.column_config.TextColumn("Class Code"),
             },
             key="ocr_review_editor"
         )
@@ -1814,8 +810,9 @@ with import_tab:
             st.dataframe(dbg, use_container_width=True)
 
         # OCR engine status + guidance
-        if not tess_status.get("has_pytesseract") or not tess_status.get("binary_ok"):
+        if not ocr_engine.engine_ready(tess_status):
             st.warning(f"OCR engine not fully available. Details: {tess_status}")
+            _recheck_engine_button("ocr_recheck_rows")
             with st.expander("How to enable OCR on macOS (one-time setup)"):
                 st.markdown(
                     "1) **Install the Tesseract binary** (Homebrew):\n"
@@ -1827,12 +824,12 @@ with import_tab:
                     "source .venv/bin/activate\n"
                     "pip install pytesseract pillow opencv-python-headless\n"
                     "```\n"
-                    "3) **Restart** this app and re-upload your screenshot.\n"
+                    "3) Click **Re-check OCR engine** above (or restart this app) and re-upload your screenshot.\n"
                     "\n"
                     "_If Homebrew is on Apple Silicon, the binary is typically at `/opt/homebrew/bin/tesseract`; this app already checks that path automatically._"
                 )
         else:
-            st.caption(f"OCR engine OK • Tesseract {tess_status.get('version')}")
+            st.caption(f"OCR engine OK • Tesseract {tess_status.get('version')} ({tess_status.get('backend')})")
 
         # Debug log
         with st.expander("🔎 OCR debug log (what the parser extracted)"):
@@ -1857,10 +854,11 @@ with import_tab:
         # Nothing parsed yet; show engine status and any logs
         if ocr_files:
             st.warning("No parsable rows found in your screenshots. Expand the debug log below to inspect OCR text.")
-        if not tess_status.get("has_pytesseract") or not tess_status.get("binary_ok"):
+        if not ocr_engine.engine_ready(tess_status):
             st.warning(f"OCR engine not fully available. Details: {tess_status}")
+            _recheck_engine_button("ocr_recheck_empty")
         else:
-            st.caption(f"OCR engine OK • Tesseract {tess_status.get('version')}")
+            st.caption(f"OCR engine OK • Tesseract {tess_status.get('version')} ({tess_status.get('backend')})")
         with st.expander("🔎 OCR debug log (what the parser extracted)"):
             if ocr_debug:
                 for entry in ocr_debug:
@@ -1869,15 +867,19 @@ with import_tab:
             else:
                 st.caption("No OCR files processed yet.")
 # ---------- SETTINGS TAB ----------
-with settings_tab:
+def view_settings():
     st.subheader("R‑range settings")
     st.caption("These shift R(min)/R(max) for different schools.")
 
+    # Widget keys are dropped while their view isn't rendered, so the offsets live under
+    # their own keys and the inputs are seeded from them
     c1, c2 = st.columns(2)
     with c1:
-        st.number_input("R offset (min)", key="r_offset_min", step=0.5)
+        st.session_state.r_offset_min = st.number_input(
+            "R offset (min)", value=float(st.session_state.r_offset_min), step=0.5, key="settings_r_offset_min")
     with c2:
-        st.number_input("R offset (max)", key="r_offset_max", step=0.5)
+        st.session_state.r_offset_max = st.number_input(
+            "R offset (max)", value=float(st.session_state.r_offset_max), step=0.5, key="settings_r_offset_max")
     st.caption("Formula: R = 35 + 5×Z + offset")
     st.markdown("""
     **What are these settings?**  
@@ -1887,7 +889,8 @@ with settings_tab:
     """)
 
     # Optional live example using your current results (if available)
-    r_c = st.session_state.get("overall_r_central")
+    _, scores = session_scores()
+    r_c = scores.overall_central if scores is not None else None
     if r_c is not None and not pd.isna(r_c):
         r_min_ex = float(r_c) + float(st.session_state.get("r_offset_min", -2.0))
         r_max_ex = float(r_c) + float(st.session_state.get("r_offset_max",  2.0))
@@ -1897,34 +900,28 @@ with settings_tab:
         )
 
     st.info("Not sure what to pick? Leave the defaults (−2.0 and +2.0). You can always adjust later.")
+
+    with st.expander("Diagnostics"):
+        st.caption("Profile cache (process-wide)")
+        st.json(get_profile_cache().stats())
 # ---------- TAB 3 (Results) ----------
-with tab3:
+def view_results():
     r_offset_min = float(st.session_state.get("r_offset_min", -2.0))
     r_offset_max = float(st.session_state.get("r_offset_max",  2.0))
-    df = st.session_state.df.copy()
-    if df.empty:
+    df, scores = session_scores(r_offset_min, r_offset_max)
+    if scores is None:
         st.warning("No data yet.")
     else:
-        df = clean_numeric(df, ["Your Grade", "Class Avg", "Std. Dev", "Credits"])
-        df["Credits"] = df["Credits"].fillna(1)
-        df.loc[df["Credits"] == 0, "Credits"] = 1
-
-        total_credits = df["Credits"].sum()
-        df["Z"] = df.apply(lambda r: zscore(r["Your Grade"], r["Class Avg"], r["Std. Dev"]), axis=1)
-
-        # central R (no offset)
-        df["R (central)"] = df["Z"].apply(lambda z: 35.0 + 5.0 * z)
-        # user offsets
-        df["R (min)"] = df["Z"].apply(lambda z: 35.0 + 5.0 * z + r_offset_min)
-        df["R (max)"] = df["Z"].apply(lambda z: 35.0 + 5.0 * z + r_offset_max)
-
+        # central R (no offset) and the user offsets, all from one vectorized pass
+        for col, values in scores.columns().items():
+            df[col] = values
         df["Weighted R (central)"] = df["R (central)"] * df["Credits"]
         df["Weighted R (min)"] = df["R (min)"] * df["Credits"]
         df["Weighted R (max)"] = df["R (max)"] * df["Credits"]
 
-        r_central = df["Weighted R (central)"].sum() / total_credits
-        r_min = df["Weighted R (min)"].sum() / total_credits
-        r_max = df["Weighted R (max)"].sum() / total_credits
+        r_central = scores.overall_central
+        r_min = scores.overall_min
+        r_max = scores.overall_max
         st.session_state.overall_r_central = float(r_central)
         st.session_state.overall_r_min = float(r_min)
         st.session_state.overall_r_max = float(r_max)
@@ -1953,9 +950,71 @@ with tab3:
             mime="text/csv"
         )
 
+        # Monte Carlo bands: sample missing / implausible class averages and std devs
+        if st.toggle("Uncertainty bands for missing or suspect Std. Dev / Class Avg", key="r_bands_on"):
+            bc1, bc2 = st.columns(2)
+            with bc1:
+                n_draws = st.select_slider("Draws", options=[5000, 10000, 20000, 50000], value=20000, key="r_bands_draws")
+            with bc2:
+                seed_in = st.number_input("Seed (0 = random)", min_value=0, value=42, step=1, key="r_bands_seed")
+            def _bands():
+                return rscore.r_bands(
+                    df["Your Grade"], df["Class Avg"], df["Std. Dev"], df["Credits"],
+                    codes=df["Class Code"] if "Class Code" in df.columns else None,
+                    draws=int(n_draws), seed=int(seed_in) or None, budget_ms=250.0,
+                )
+            # a fixed seed runs every draw and gives the same bands every time (cached);
+            # seed 0 asks for a fresh, time-budgeted draw
+            bands = cached_view(("r_bands", int(n_draws), int(seed_in)), _bands) if seed_in else _bands()
+            if not bands.uncertain.any():
+                st.caption("Every course has a plausible class average and std dev — nothing to sample.")
+            else:
+                st.markdown('<div class="chip-row">' + "".join(
+                    f'<div class="metric-chip"><div class="label">P{p}</div><div class="value">{v:.2f}</div></div>'
+                    for p, v in bands.percentiles.items()
+                ) + '</div>', unsafe_allow_html=True)
+                sampled = ", ".join(df["Course Name"].astype(str)[bands.uncertain].tolist())
+                st.caption(f"{bands.draws:,} draws in {bands.elapsed_ms:.0f} ms • sampled: {sampled}")
+
+        # Semester history: append-only snapshots of the table, cumulative R from stored sums
+        with st.expander("📚 Semester history"):
+            store = snapshots.SnapshotStore(snapshots.default_snapshot_dir(user_id))
+            sc1, sc2 = st.columns([3, 1])
+            with sc1:
+                sem_label = st.text_input("Semester label", placeholder="e.g. Fall 2025", key="snapshot_label")
+            with sc2:
+                st.write("")
+                if st.button("💾 Save current table", key="snapshot_save"):
+                    meta = store.save(sem_label, df)
+                    st.success(f"Saved “{meta.label}” ({meta.courses} courses, R {meta.overall():.2f}).")
+            hist = store.history(r_offset_min, r_offset_max)
+            if hist.empty:
+                st.caption("No semesters saved yet.")
+            else:
+                st.dataframe(hist.drop(columns=["id"]).round(2), use_container_width=True, hide_index=True)
+                fig_hist = _px().line(hist, x="label", y=["R (semester)", "R (cumulative)"], markers=True,
+                                   labels={"label": "Semester", "value": "R", "variable": ""})
+                fig_hist.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(255,255,255,0)",
+                                       font_color="#111827", height=320, margin=dict(l=20, r=20, t=30, b=20))
+                st.plotly_chart(fig_hist, use_container_width=True)
+                if len(hist) >= 2:
+                    ids = hist["id"].tolist()
+                    names = dict(zip(hist["id"], hist["label"]))
+                    dc1, dc2 = st.columns(2)
+                    with dc1:
+                        sid_a = st.selectbox("Compare", ids, index=len(ids) - 2, format_func=names.get, key="snapshot_a")
+                    with dc2:
+                        sid_b = st.selectbox("with", ids, index=len(ids) - 1, format_func=names.get, key="snapshot_b")
+                    diff_df, diff_sum = store.diff(sid_a, sid_b)
+                    st.caption(
+                        f"R {diff_sum['R A']:.2f} → {diff_sum['R B']:.2f} (**{diff_sum['Δ R']:+.2f}**) • "
+                        f"{diff_sum['changed']} changed, {diff_sum['added']} added, {diff_sum['removed']} removed"
+                    )
+                    st.dataframe(diff_df.round(2), use_container_width=True, hide_index=True)
+
 
 # ---------- TAB 4 (Importance) ----------
-with tab4:
+def view_importance():
     require_premium()
     st.markdown(
     "**What does 'Importance' mean?** It estimates how much your overall R-score reacts to improving a specific course. "
@@ -1963,63 +1022,59 @@ with tab4:
     "So, courses with **lower Std. Dev** and **more credits** usually have **bigger bubbles**. "
     "Use this to prioritize where an extra few points could move your overall R the most."
 )
-    df = st.session_state.df.copy()
+    df, _ = session_scores()
     if df.empty:
         st.warning("Add courses first.")
     else:
-        df = clean_numeric(df, ["Your Grade", "Class Avg", "Std. Dev", "Credits"])
-        df["Credits"] = df["Credits"].fillna(1)
-        df.loc[df["Credits"] == 0, "Credits"] = 1
-        df_imp = compute_importance(df)
-        df_imp["Bubble Size"] = df_imp["Importance"] * 120
-
-        fig = px.scatter(
-            df_imp,
-            x="Course Name",
-            y="Importance",
-            size="Bubble Size",
-            color="Credits",
-            hover_data=["Your Grade","Class Avg","Std. Dev","Credits"],
-            size_max=70,
-            title="Importance to overall R (bigger = bigger impact)"
-        )
-        fig.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(255,255,255,0)",
-            font_color="#111827",
-            title_font_size=18,
-            height=480,
-            margin=dict(l=20,r=20,t=50,b=20),
-        )
-        fig.update_traces(
-            marker=dict(line=dict(width=1,color="#111827"),opacity=0.8)
-        )
+        def _importance_fig():
+            df_imp = compute_importance(df)
+            df_imp["Bubble Size"] = df_imp["Importance"] * 120
+
+            fig = _px().scatter(
+                df_imp,
+                x="Course Name",
+                y="Importance",
+                size="Bubble Size",
+                color="Credits",
+                hover_data=["Your Grade","Class Avg","Std. Dev","Credits"],
+                size_max=70,
+                title="Importance to overall R (bigger = bigger impact)"
+            )
+            fig.update_layout(
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(255,255,255,0)",
+                font_color="#111827",
+                title_font_size=18,
+                height=480,
+                margin=dict(l=20,r=20,t=50,b=20),
+            )
+            fig.update_traces(
+                marker=dict(line=dict(width=1,color="#111827"),opacity=0.8)
+            )
+            return fig
+        fig = cached_view("importance_fig", _importance_fig)
         st.plotly_chart(fig, use_container_width=True)
 
 # ---------- TAB 5 (Biggest gains) ----------
-with tab5:
+def view_gains():
     require_premium()
     st.subheader("🏆 Biggest Potential R-Score Gains")
 
-    if "df" not in st.session_state or st.session_state.df is None:
+    df, scores = session_scores()
+    if scores is None:
         st.warning("Upload or enter your grades first.")
     else:
-        df = st.session_state.df.copy()
-        # Ensure numerics and sane Credits before calculations
-        df = clean_numeric(df, ["Your Grade", "Class Avg", "Std. Dev", "Credits"])
-        df["Credits"] = df["Credits"].fillna(1)
-        df.loc[df["Credits"] == 0, "Credits"] = 1
-        total_credits = df["Credits"].sum()
+        total_credits = scores.total_credits
         if pd.isna(total_credits) or total_credits <= 0:
             total_credits = 1.0
 
-        # --- Accurate per-course R-score gain calculation ---
-        # Simulate a +3 grade point improvement for each course, safely handle zero/missing Std. Dev
-        df["Z_base"] = df.apply(lambda r: zscore(r["Your Grade"], r["Class Avg"], r["Std. Dev"]), axis=1)
-        df["Z_plus3"] = df.apply(lambda r: zscore(min(float(r["Your Grade"]) + 3.0, 100.0), r["Class Avg"], r["Std. Dev"]), axis=1)
-        df["R_base"] = 35 + 5 * df["Z_base"]
-        df["R_plus3"] = 35 + 5 * df["Z_plus3"]
-        df["ΔR"] = df["R_plus3"] - df["R_base"]
+        # --- Exact per-course R-score gain calculation ---
+        # Overall R is linear in each grade, so +3 points is 3 × the closed-form marginal
+        # (capped at 100%); zero/missing Std. Dev has no effect
+        plan3 = cached_view(("gains_plan", np.inf, 3.0), lambda: rscore.allocate_points(
+            df["Your Grade"], df["Class Avg"], df["Std. Dev"], df["Credits"], budget=np.inf, max_points=3.0))
+        df["ΔR"] = rscore.R_PER_Z * plan3.room / df["Std. Dev"].where(plan3.marginal > 0)
+        df["ΔR"] = df["ΔR"].fillna(0.0)
 
         # Weight by credits to approximate total R impact
         df["gain_score"] = df["ΔR"] * df["Credits"]
@@ -2100,22 +1155,43 @@ with tab5:
         for insight in insights:
             st.markdown(f"- {insight}")
 
+        # --- Best use of a points budget (every course, not just the podium) ---
+        st.markdown("### 🎯 Plan your points")
+        pc1, pc2 = st.columns(2)
+        with pc1:
+            budget = st.number_input("Total grade points you could gain", min_value=0.0, max_value=200.0,
+                                     value=10.0, step=1.0, key="gains_budget")
+        with pc2:
+            per_course = st.number_input("Max points per course", min_value=0.0, max_value=100.0,
+                                         value=5.0, step=1.0, key="gains_per_course")
+        plan = cached_view(("gains_plan", float(budget), float(per_course)), lambda: rscore.allocate_points(
+            df["Your Grade"], df["Class Avg"], df["Std. Dev"], df["Credits"], budget=budget, max_points=per_course))
+        plan_df = pd.DataFrame({
+            "Course Name": df["Course Name"].to_numpy()[plan.order],
+            "Your Grade": df["Your Grade"].to_numpy()[plan.order],
+            "+Points": plan.points[plan.order],
+            "Overall R per point": plan.marginal[plan.order],
+            "Overall R gain": (plan.points * plan.marginal)[plan.order],
+        }).round(3)
+        st.caption(f"Best split of {budget:g} points → overall R **+{plan.gain:.2f}** "
+                   f"(each course capped at 100% and +{per_course:g}).")
+        st.dataframe(plan_df, use_container_width=True, hide_index=True)
+        budgets = np.arange(0.0, max(budget, 1.0) * 2 + 1.0)
+        curve = cached_view(("gains_curve", float(budget), float(per_course)), lambda: rscore.gain_curve(
+            df["Your Grade"], df["Class Avg"], df["Std. Dev"], df["Credits"], budgets, max_points=per_course))
+        fig_curve = _px().line(x=budgets, y=curve, labels={"x": "Points budget", "y": "Overall R gain"},
+                            title="Best possible overall R gain by budget")
+        fig_curve.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(255,255,255,0)",
+                                font_color="#111827", height=320, margin=dict(l=20, r=20, t=50, b=20))
+        st.plotly_chart(fig_curve, use_container_width=True)
+
         # ---- Revamped quick scenarios (compact chips) ----
-        dfx = st.session_state.df.copy()
-        if not dfx.empty:
-            dfx = clean_numeric(dfx, ["Your Grade", "Class Avg", "Std. Dev", "Credits"])
-            dfx["Credits"] = dfx["Credits"].fillna(1)
-            dfx.loc[dfx["Credits"] == 0, "Credits"] = 1
-
-            def overall_r_of(df_in):
-                Z = (df_in["Your Grade"] - df_in["Class Avg"]) / df_in["Std. Dev"]
-                R = 35.0 + 5.0 * Z
-                return float((R * df_in["Credits"]).sum() / df_in["Credits"].sum())
-
-            base = overall_r_of(dfx)
-            plus1 = overall_r_of(dfx.assign(**{"Your Grade": (dfx["Your Grade"] + 1).clip(upper=100)}))
-            plus2 = overall_r_of(dfx.assign(**{"Your Grade": (dfx["Your Grade"] + 2).clip(upper=100)}))
-            plus3 = overall_r_of(dfx.assign(**{"Your Grade": (dfx["Your Grade"] + 3).clip(upper=100)}))
+        if not df.empty:
+            # +1/+2/+3 to every grade as three rows of one broadcast sweep
+            course_cols = (df["Your Grade"], df["Class Avg"], df["Std. Dev"], df["Credits"])
+            base = scores.overall_central
+            plus1, plus2, plus3 = cached_view("gains_quick", lambda: rscore.sweep(
+                *course_cols, grade_delta=np.array([[1.0], [2.0], [3.0]])))
 
             st.markdown("### 🔮 Quick scenarios")
             st.markdown('<div class="chip-row">', unsafe_allow_html=True)
@@ -2125,18 +1201,50 @@ with tab5:
             st.markdown(f'<div class="metric-chip"><div class="label">+3 to all grades</div><div class="value">{plus3:.2f}</div></div>', unsafe_allow_html=True)
             st.markdown('</div>', unsafe_allow_html=True)
 
+            # Heatmap: overall R for every (grade change × std dev change) pair, plus an optional future course
+            with st.expander("🗺️ Scenario map: grade change × class std dev change"):
+                hc1, hc2, hc3, hc4, hc5 = st.columns(5)
+                with hc1:
+                    add_future = st.checkbox("Add a future course", key="sweep_future")
+                with hc2:
+                    fut_grade = st.number_input("Grade", 0.0, 100.0, 85.0, 1.0, key="sweep_fut_grade", disabled=not add_future)
+                with hc3:
+                    fut_avg = st.number_input("Class Avg", 0.0, 100.0, 75.0, 1.0, key="sweep_fut_avg", disabled=not add_future)
+                with hc4:
+                    fut_sd = st.number_input("Std. Dev", 0.0, 50.0, 10.0, 0.5, key="sweep_fut_sd", disabled=not add_future)
+                with hc5:
+                    fut_cr = st.number_input("Credits", 0.0, 10.0, 2.0, 0.33, key="sweep_fut_cr", disabled=not add_future)
+                grade_steps = np.arange(-5.0, 5.5, 1.0)
+                sd_steps = np.arange(-3.0, 3.25, 0.5)
+                future = (fut_grade, fut_avg, fut_sd, fut_cr) if add_future else None
+                grid = cached_view(("gains_grid", future), lambda: rscore.sweep(
+                    *course_cols,
+                    grade_delta=grade_steps[:, None, None],
+                    sd_delta=sd_steps[None, :, None],
+                    extra=tuple([v] for v in future) if future else None,
+                ))
+                fig_grid = _px().imshow(
+                    grid, x=[f"{v:+.1f}" for v in sd_steps], y=[f"{v:+.0f}" for v in grade_steps],
+                    labels={"x": "Std. Dev change (all courses)", "y": "Grade change (all courses)", "color": "Overall R"},
+                    color_continuous_scale="Viridis", text_auto=".1f", aspect="auto",
+                )
+                fig_grid.update_layout(paper_bgcolor="rgba(0,0,0,0)", font_color="#111827", height=460,
+                                       margin=dict(l=20, r=20, t=30, b=20))
+                st.plotly_chart(fig_grid, use_container_width=True)
+                st.caption(f"{grid.size} scenarios from one NumPy broadcast. Shifted std devs stop at {rscore.PLAUSIBLE_SD[0]:g}.")
+
 # ---------- TAB 6 (Programs) ----------
-with tab6:
+def view_programs():
     require_premium()
     st.markdown('<div class="glass-toolbar">', unsafe_allow_html=True)
-    uni_df = load_uni_csv()
+    prog_index = get_program_index()
 
     # Filters + selectors (left-justified; 5 controls + right spacer)
     cols = st.columns([1.4, 1.6, 1.8, 1.6, 2.4, 8])  # last column is an empty spacer to anchor left
     with cols[0]:
-        uni_choice = st.selectbox("University", ["All"] + sorted(uni_df["university"].dropna().unique().tolist()))
+        uni_choice = st.selectbox("University", [programs.ALL] + prog_index.universities)
     with cols[1]:
-        prog_choice = st.selectbox("Program", ["All"] + sorted(uni_df["program"].dropna().unique().tolist()))
+        prog_choice = st.selectbox("Program", [programs.ALL] + prog_index.programs)
     with cols[2]:
         threshold_type = st.selectbox("Threshold", ["Minimum (acceptance)", "Recommended (competitive)"])
     with cols[3]:
@@ -2147,54 +1255,47 @@ with tab6:
 
     st.markdown('</div>', unsafe_allow_html=True)
 
-    # Apply filters
-    if uni_choice != "All":
-        uni_df = uni_df[uni_df["university"] == uni_choice]
-    if prog_choice != "All":
-        uni_df = uni_df[uni_df["program"] == prog_choice]
-
     # Pick threshold column
     th_col = "min_r" if threshold_type.startswith("Minimum") else "rec_r"
 
-    # Choose user's R according to selector (fallback compute if not present)
-    central_r = st.session_state.get("overall_r_central", None)
-    lower_r   = st.session_state.get("overall_r_min", None)
-    higher_r  = st.session_state.get("overall_r_max", None)
-    if central_r is None or pd.isna(central_r):
-        df_tmp = st.session_state.df.copy()
-        if not df_tmp.empty:
-            df_tmp = clean_numeric(df_tmp, ["Your Grade", "Class Avg", "Std. Dev", "Credits"])
-            df_tmp["Credits"] = df_tmp["Credits"].fillna(1)
-            df_tmp.loc[df_tmp["Credits"] == 0, "Credits"] = 1
-            Z = (df_tmp["Your Grade"] - df_tmp["Class Avg"]) / df_tmp["Std. Dev"]
-            baseR = 35.0 + 5.0 * Z
-            central_r = float((baseR * df_tmp["Credits"]).sum() / df_tmp["Credits"].sum())
-            lower_r   = central_r + float(st.session_state.get("r_offset_min", -2.0))
-            higher_r  = central_r + float(st.session_state.get("r_offset_max",  2.0))
+    # Choose user's R according to selector (the Results view may not have run this session)
+    central_r = lower_r = higher_r = None
+    _, scores = session_scores(float(st.session_state.get("r_offset_min", -2.0)),
+                               float(st.session_state.get("r_offset_max",  2.0)))
+    if scores is not None:
+        central_r = scores.overall_central
+        lower_r   = scores.overall_min
+        higher_r  = scores.overall_max
 
     current_r = {"Central": central_r, "Lower": lower_r, "Higher": higher_r}.get(r_use_choice, central_r)
 
+    PROGRAMS_PER_PAGE = 20
+
+    def _program_page(matches, key):
+        """Rows for the page picked under a result list; only this page gets rendered."""
+        n_pages = max(1, -(-len(matches) // PROGRAMS_PER_PAGE))
+        page = 1
+        if n_pages > 1:
+            page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1, key=key)
+            first = (page - 1) * PROGRAMS_PER_PAGE
+            st.caption(f"Showing {first + 1}–{min(first + PROGRAMS_PER_PAGE, len(matches))} of {len(matches)}")
+        return prog_index.page(matches, page, PROGRAMS_PER_PAGE)
+
     if current_r is None or pd.isna(current_r):
-        st.warning("Calculate your R in the Results tab first.")
+        st.warning("Add courses first (Manual, CSV or Import).")
     else:
         st.markdown(f"### Your selected R: **{current_r:.2f}**  •  Comparing to **{threshold_type.lower()}** thresholds")
 
-        q = pd.to_numeric(uni_df[th_col], errors="coerce")
-        qualified = uni_df[q <= current_r].sort_values(th_col)
-        stretch   = uni_df[(q > current_r) & (q <= current_r + stretch_window)].sort_values(th_col)
-
-        # ensure stretch has content if empty
-        show_nearest_caption = False
-        if stretch.empty and not uni_df.empty:
-            stretch = uni_df[q > current_r].sort_values(th_col).head(5)
-            show_nearest_caption = True
+        # Binary searches over the pre-sorted index instead of masking + sorting the table
+        qualified = prog_index.qualified(current_r, th_col, uni_choice, prog_choice)
+        stretch, show_nearest_caption = prog_index.stretch(current_r, stretch_window, th_col, uni_choice, prog_choice)
 
         # QUALIFIED (once)
         st.subheader("✅ You likely qualify for")
         if qualified.empty:
             st.write("No matches found.")
         else:
-            for _, row in qualified.iterrows():
+            for _, row in _program_page(qualified, "programs_page_qualified").iterrows():
                 st.markdown(
                     f'<div class="glass-card" style="background:rgba(17,24,39,0.9);color:white;">'
                     f'<div style="font-weight:600;">{row["university"]}</div>'
@@ -2207,12 +1308,12 @@ with tab6:
 
         # STRETCH (once)
         st.subheader(f"🟡 Stretch programs (≤ +{stretch_window:.1f} R)")
-        if show_nearest_caption:
+        if show_nearest_caption and not stretch.empty:
             st.caption("No stretch within window; showing nearest-above programs instead.")
         if stretch.empty:
             st.write("No stretch programs found — try improving your grades!")
         else:
-            for _, row in stretch.iterrows():
+            for _, row in _program_page(stretch, "programs_page_stretch").iterrows():
                 st.markdown(
                     f'<div class="glass-card" style="background:rgba(255,230,170,0.3);">'
                     f'<div style="font-weight:600;">{row["university"]}</div>'
@@ -2223,7 +1324,23 @@ with tab6:
                     unsafe_allow_html=True
                 )
 
-        # Only close toolbar div once
+VIEWS = {
+    "Help / Explanation": view_help,
+    "Manual": view_manual,
+    "CSV": view_csv,
+    "Import (OCR)": view_import,
+    "Results": view_results,
+    "Importance": view_importance,
+    "Biggest gains": view_gains,
+    "Programs": view_programs,
+    "Settings": view_settings,
+}
+if st.session_state.get("view") not in VIEWS:
+    st.session_state["view"] = qp.get("view") if qp.get("view") in VIEWS else "Help / Explanation"
+active_view = st.radio("View", list(VIEWS), key="view", horizontal=True, label_visibility="collapsed")
+with startup_timing.phase(f"first render: {active_view}"):
+    VIEWS[active_view]()
+startup_timing.report("pages/Main.py")
 
 st.markdown("""
 <hr style="margin-top:40px;opacity:0.3">
@@ -0,0 +1,115 @@
+# profiles.py — per-user profile lookup with a short TTL cache (no Streamlit)
+# Main.py needs id / is_premium / tos_accepted on every rerun, and a rerun happens
+# on every click and every keystroke in the editors. The profile row only changes
+# on checkout, so it is fetched once per TTL per user and the Stripe return drops
+# the entry explicitly.
+
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+import requests
+
+__all__ = ["PROFILE_FIELDS", "ProfileCache", "fetch_profile", "default_profile_ttl"]
+
+PROFILE_FIELDS = "id,is_premium,tos_accepted"
+
+
+def default_profile_ttl() -> float:
+    """RSCORE_PROFILE_TTL seconds (default 60)."""
+    try:
+        return max(0.0, float(os.environ.get("RSCORE_PROFILE_TTL", "60")))
+    except ValueError:
+        return 60.0
+
+
+def fetch_profile(base_url: str, api_key: str, access_token: str, user_id: str,
+                  timeout: float = 5.0, session: requests.Session | None = None) -> Dict[str, Any]:
+    """The user's profiles row ({} when there is none). Raises on transport/HTTP errors."""
+    resp = (session or requests).get(
+        f"{base_url}/rest/v1/profiles",
+        headers={"apikey": api_key, "Authorization": f"Bearer {access_token}"},
+        params={"id": f"eq.{user_id}", "select": PROFILE_FIELDS},
+        timeout=timeout,
+    )
+    resp.raise_for_status()
+    rows = resp.json()
+    return dict(rows[0]) if rows else {}
+
+
+class ProfileCache:
+    """Thread-safe user_id → profile dict with a TTL.
+
+    A failed fetch is cached as {} for `error_ttl` seconds, so an outage costs one
+    request per user per few seconds instead of one per rerun.
+    """
+
+    def __init__(self, ttl: float = 60.0, error_ttl: float = 5.0, max_entries: int = 10_000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = float(ttl)
+        self.error_ttl = float(error_ttl)
+        self.max_entries = int(max_entries)
+        self._clock = clock
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}   # user_id → (expires at, profile)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.invalidations = 0
+
+    # ---------- Public API ----------
+
+    def get(self, user_id: str, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Cached profile, or fetch() on a miss / after expiry."""
+        now = self._clock()
+        with self._lock:
+            hit = self._entries.get(user_id)
+            if hit is not None and hit[0] > now:
+                self.hits += 1
+                return dict(hit[1])
+            self.misses += 1
+        try:
+            profile, ttl = dict(fetch() or {}), self.ttl
+        except Exception:
+            profile, ttl = {}, self.error_ttl
+            with self._lock:
+                self.errors += 1
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._evict(now)
+            self._entries[user_id] = (self._clock() + ttl, profile)
+        return dict(profile)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop one user's entry (e.g. after checkout)."""
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "invalidations": self.invalidations,
+            }
+
+    # ---------- Internals ----------
+
+    def _evict(self, now: float) -> None:
+        """Expired entries first; if still full, the ones closest to expiry."""
+        for k in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+            del self._entries[k]
+        overflow = len(self._entries) - self.max_entries + 1
+        if overflow > 0:
+            for k in sorted(self._entries, key=lambda k: self._entries[k][0])[:overflow]:
+                del self._entries[k]
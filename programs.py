@@ -0,0 +1,115 @@
+# programs.py — university program catalogue + eligibility index (no Streamlit)
+# The Programs tab asks the same two questions on every rerun: which programs have
+# a threshold ≤ my R, and which sit within +window above it. ProgramIndex sorts
+# each (university, program) scope by min_r and rec_r once, so both become binary
+# searches and a page of results is a slice.
+
+from __future__ import annotations
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["PROGRAM_COLS", "THRESHOLD_COLS", "ALL", "load_programs", "ProgramIndex", "Matches"]
+
+PROGRAM_COLS = ["university", "program", "min_r", "rec_r", "url"]
+THRESHOLD_COLS = ("min_r", "rec_r")
+ALL = "All"
+
+
+def load_programs(path: str = "uni_acceptance.csv") -> pd.DataFrame:
+    if os.path.exists(path):
+        df = pd.read_csv(path)
+    else:
+        # fallback sample with min & recommended thresholds
+        df = pd.DataFrame([
+            ("McGill","Bachelor of Engineering",31.0,32.5,"https://www.mcgill.ca/engineering/"),
+            ("McGill","Desautels BCom (Management)",30.0,31.0,"https://www.mcgill.ca/desautels/programs/bcom"),
+            ("McGill","BSc (Science)",28.5,30.0,"https://www.mcgill.ca/science/"),
+            ("Concordia","BCompSci (Computer Science)",27.0,28.0,"https://www.concordia.ca/academics/undergraduate/computer-science.html"),
+            ("Concordia","BEng (Mechanical)",28.0,29.5,"https://www.concordia.ca/academics/undergraduate/mechanical-engineering.html"),
+            ("Université de Montréal","BSc (Sciences)",27.5,28.5,"https://admission.umontreal.ca/programmes/"),
+            ("Polytechnique Montréal","BEng",29.0,30.5,"https://www.polymtl.ca/futurs/"),
+            ("ÉTS","BEng (Génie)",26.5,27.5,"https://www.etsmtl.ca/programmes/1er-cycle"),
+            ("Université Laval","Bachelor programs (sample)",26.0,27.0,"https://www.ulaval.ca/etudes"),
+            ("Université de Sherbrooke","BEng",27.0,28.0,"https://www.usherbrooke.ca/programmes"),
+            ("UQAM","BAA / Business",25.0,26.0,"https://etudier.uqam.ca/"),
+        ], columns=PROGRAM_COLS)
+    # normalize columns
+    for col in ["university","program","min_r","url"]:
+        if col not in df.columns:
+            df[col] = ""
+    if "rec_r" not in df.columns:
+        try:
+            df["rec_r"] = pd.to_numeric(df["min_r"], errors="coerce") + 1.0
+        except Exception:
+            df["rec_r"] = df["min_r"]
+    return df[PROGRAM_COLS]
+
+
+@dataclass
+class Matches:
+    """Row positions into ProgramIndex.table, ascending by threshold."""
+    positions: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.positions) == 0
+
+
+class ProgramIndex:
+    """Programs pre-sorted by each threshold, per university / program filter."""
+
+    def __init__(self, table: pd.DataFrame):
+        self.table = table.reset_index(drop=True)
+        self.universities: List[str] = sorted(self.table["university"].dropna().unique().tolist())
+        self.programs: List[str] = sorted(self.table["program"].dropna().unique().tolist())
+        self._thresholds = {c: pd.to_numeric(self.table[c], errors="coerce").to_numpy(dtype=float)
+                            for c in THRESHOLD_COLS}
+        # (university|ALL, program|ALL) → row positions; only scopes that exist get an entry
+        groups: Dict[Tuple[str, str], np.ndarray] = {(ALL, ALL): np.arange(len(self.table))}
+        for keys, cols in (((0,), ["university"]), ((1,), ["program"]), ((0, 1), ["university", "program"])):
+            for name, idx in self.table.groupby(cols, sort=False).indices.items():
+                name = name if isinstance(name, tuple) else (name,)
+                key = [ALL, ALL]
+                for k, v in zip(keys, name):
+                    key[k] = v
+                groups[tuple(key)] = np.asarray(idx)
+        # scope → threshold column → (sorted thresholds, positions in that order); NaN thresholds dropped
+        self._sorted: Dict[Tuple[str, str], Dict[str, Tuple[np.ndarray, np.ndarray]]] = {}
+        for scope, idx in groups.items():
+            per_col = {}
+            for c, th in self._thresholds.items():
+                rows = idx[~np.isnan(th[idx])]
+                order = rows[np.argsort(th[rows], kind="stable")]
+                per_col[c] = (th[order], order)
+            self._sorted[scope] = per_col
+
+    def _scope(self, university: str, program: str, col: str) -> Tuple[np.ndarray, np.ndarray]:
+        empty = (np.empty(0), np.empty(0, dtype=int))
+        return self._sorted.get((university or ALL, program or ALL), {}).get(col, empty)
+
+    def qualified(self, r: float, col: str = "min_r", university: str = ALL, program: str = ALL) -> Matches:
+        th, pos = self._scope(university, program, col)
+        return Matches(pos[:np.searchsorted(th, r, side="right")])
+
+    def stretch(self, r: float, window: float, col: str = "min_r", university: str = ALL,
+                program: str = ALL, nearest: int = 5) -> Tuple[Matches, bool]:
+        """Programs with r < threshold ≤ r + window. When none, the `nearest` ones above r
+        (second value True)."""
+        th, pos = self._scope(university, program, col)
+        lo = np.searchsorted(th, r, side="right")
+        hi = np.searchsorted(th, r + window, side="right")
+        if hi > lo:
+            return Matches(pos[lo:hi]), False
+        return Matches(pos[lo:lo + nearest]), True
+
+    def page(self, matches: Matches, page: int, per_page: int = 20) -> pd.DataFrame:
+        """Rows for one page (1-based) of a result, still in threshold order."""
+        start = max(0, (int(page) - 1) * per_page)
+        return self.table.iloc[matches.positions[start:start + per_page]]
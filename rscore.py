@@ -0,0 +1,436 @@
+# rscore.py — vectorized R-score math shared by every tab (no Streamlit)
+# Z = (grade − class avg) / std dev, R = 35 + 5·Z, overall R = credit-weighted mean.
+# One NumPy pass over the course arrays replaces the per-row df.apply(zscore) calls;
+# score_cohort does the same for a whole cohort with grouped (bincount) reductions.
+
+from __future__ import annotations
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["R_BASE", "R_PER_Z", "RScores", "zscores", "score_courses", "overall_r",
+           "IncrementalScorer", "marginal_r", "PointsPlan", "allocate_points", "gain_curve",
+           "sweep", "COURSE_FAMILY_PRIORS", "suspect_mask", "RBands", "r_bands",
+           "COHORT_COLUMNS", "score_cohort"]
+
+R_BASE = 35.0
+R_PER_Z = 5.0
+
+
+def _arr(x: Any) -> np.ndarray:
+    return np.asarray(x, dtype=float).reshape(-1)
+
+
+def zscores(grade, avg, sd, missing_z: float | None = None) -> np.ndarray:
+    """Per-course Z with the same rules as the old row-wise zscore():
+    zero std dev → 0.0; a NaN input → NaN, or `missing_z` when given."""
+    g, a, s = _arr(grade), _arr(avg), _arr(sd)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (g - a) / s
+    z[s == 0] = 0.0
+    if missing_z is not None:
+        z[np.isnan(g) | np.isnan(a) | np.isnan(s)] = missing_z
+    return z
+
+
+def overall_r(r: np.ndarray, credits: np.ndarray) -> float:
+    """Credit-weighted mean of R. NaN courses add nothing but keep their credits
+    in the denominator (as the old Series.sum() / total_credits did)."""
+    total = float(np.sum(credits))
+    if not total > 0:
+        return float("nan")
+    return float(np.nansum(r * credits) / total)
+
+
+@dataclass
+class RScores:
+    z: np.ndarray
+    r_central: np.ndarray
+    r_min: np.ndarray
+    r_max: np.ndarray
+    credits: np.ndarray
+    total_credits: float
+    overall_central: float
+    overall_min: float
+    overall_max: float
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Per-course columns under the names the Results table uses."""
+        return {"Z": self.z, "R (central)": self.r_central, "R (min)": self.r_min, "R (max)": self.r_max}
+
+
+def score_courses(grade, avg, sd, credits, r_offset_min: float = 0.0, r_offset_max: float = 0.0,
+                  missing_z: float | None = None) -> RScores:
+    """Z, R (central/min/max) per course and the credit-weighted overall values, in one pass.
+    Credits are used as given; callers default missing/zero credits to 1 beforehand."""
+    z = zscores(grade, avg, sd, missing_z)
+    cr = _arr(credits)
+    r = R_BASE + R_PER_Z * z
+    r_min, r_max = r + r_offset_min, r + r_offset_max
+    return RScores(
+        z=z,
+        r_central=r,
+        r_min=r_min,
+        r_max=r_max,
+        credits=cr,
+        total_credits=float(np.sum(cr)),
+        overall_central=overall_r(r, cr),
+        overall_min=overall_r(r_min, cr),
+        overall_max=overall_r(r_max, cr),
+    )
+
+
+# ---------- Marginal impact / allocation ----------
+
+def marginal_r(grade, avg, sd, credits) -> np.ndarray:
+    """
+    Exact d(overall R) / d(grade point) per course: 5 · credits / (std dev · total credits).
+    Overall R is linear in each grade, so this is also the gain per point right up to
+    the grade cap. It is 0 wherever zscores() can't move: a zero or missing std dev
+    pins Z to 0, and a missing grade or class avg leaves Z NaN (the course adds nothing).
+    """
+    g, a, s, cr = _arr(grade), _arr(avg), _arr(sd), _arr(credits)
+    total = float(np.sum(cr))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m = R_PER_Z * cr / (s * total)
+    m[~np.isfinite(m) | ~(s > 0) | np.isnan(g) | np.isnan(a)] = 0.0
+    return m
+
+
+@dataclass
+class PointsPlan:
+    order: np.ndarray      # course indices, best gain per point first
+    marginal: np.ndarray   # overall R per grade point (input order)
+    room: np.ndarray       # points each course can still take (input order)
+    points: np.ndarray     # points allocated (input order)
+    gain: float            # overall R gained by the allocation
+
+
+def _room(grade, avg, sd, credits, max_points, cap: float) -> Tuple[np.ndarray, np.ndarray]:
+    g = _arr(grade)
+    m = marginal_r(grade, avg, sd, credits)
+    room = np.clip(cap - g, 0.0, None)
+    if max_points is not None:
+        room = np.minimum(room, np.broadcast_to(np.asarray(max_points, dtype=float), room.shape))
+    room[np.isnan(room) | (m <= 0)] = 0.0
+    return m, room
+
+
+def allocate_points(grade, avg, sd, credits, budget: float, max_points=None, cap: float = 100.0) -> PointsPlan:
+    """
+    Spread `budget` grade points across courses to maximize overall R, with each
+    course capped at `cap` (100%) and optionally at `max_points` (scalar or per course).
+    The objective is linear with box constraints, so filling courses in order of
+    marginal gain is optimal (a fractional knapsack); no search is needed.
+    """
+    m, room = _room(grade, avg, sd, credits, max_points, cap)
+    order = np.argsort(-m, kind="stable")
+    filled = np.cumsum(room[order])
+    take = np.clip(float(budget) - (filled - room[order]), 0.0, room[order])
+    points = np.zeros_like(room)
+    points[order] = take
+    return PointsPlan(order=order, marginal=m, room=room, points=points, gain=float(np.sum(points * m)))
+
+
+def gain_curve(grade, avg, sd, credits, budgets, max_points=None, cap: float = 100.0) -> np.ndarray:
+    """Best overall R gain for every budget at once. The optimum is piecewise linear
+    and concave in the budget, with a knot wherever a course fills up."""
+    m, room = _room(grade, avg, sd, credits, max_points, cap)
+    order = np.argsort(-m, kind="stable")
+    x = np.concatenate([[0.0], np.cumsum(room[order])])
+    y = np.concatenate([[0.0], np.cumsum(room[order] * m[order])])
+    return np.interp(np.asarray(budgets, dtype=float), x, y)
+
+
+# ---------- Scenario sweeps ----------
+
+def _weighted_r_sum(g, a, s, cr) -> np.ndarray:
+    """Σ R·credits over the last (course) axis, zscores() rules, any leading scenario axes."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(s == 0, 0.0, (g - a) / s)
+    return np.nansum((R_BASE + R_PER_Z * z) * cr, axis=-1)
+
+
+def sweep(grade, avg, sd, credits, grade_delta=0.0, sd_delta=0.0, extra=None, cap: float = 100.0) -> np.ndarray:
+    """
+    Overall R for a whole grid of what-if scenarios in one broadcast computation.
+
+    `grade_delta` and `sd_delta` broadcast against the course axis (last): a scalar,
+    shape (k, 1) for k uniform scenarios, (k, n) for per-course deltas, or e.g.
+    (G, 1, 1) with (1, S, 1) for a G × S grid. Grades are capped at `cap`; a
+    shifted std dev never drops below PLAUSIBLE_SD[0] (or the course's own value,
+    if already smaller), so a large negative delta can't hit the zero-std-dev rule
+    and flip a course's Z to 0. Courses whose std dev is 0 or missing are not
+    shifted at all. `extra` is an optional (grade, avg, sd, credits) tuple of
+    hypothetical future courses added to every scenario unchanged. The result has
+    the broadcast shape minus the course axis; the input arrays are never copied per
+    scenario beyond the broadcast itself.
+    """
+    g, a, s, cr = _arr(grade), _arr(avg), _arr(sd), _arr(credits)
+    gd, sdd = np.asarray(grade_delta, dtype=float), np.asarray(sd_delta, dtype=float)
+    G = np.minimum(g + gd, cap)
+    # a zero / missing std dev stays pinned (Z = 0 / unscored) under every delta
+    S = np.where(s > 0, np.maximum(s + sdd, np.minimum(s, PLAUSIBLE_SD[0])), s)
+    num = _weighted_r_sum(G, a, S, cr)
+    total = float(np.sum(cr))
+    if extra is not None:
+        eg, ea, es, ecr = (_arr(x) for x in extra)
+        num = num + _weighted_r_sum(eg, ea, es, ecr)
+        total += float(np.sum(ecr))
+    if not total > 0:
+        return np.full(np.shape(num), np.nan)
+    return num / total
+
+
+# ---------- Uncertainty bands (Monte Carlo) ----------
+
+# Prior (class avg mean, class avg spread, std dev mean, std dev spread) by the
+# discipline prefix of a Quebec course code ("201-NYA-05" → "201"). Rough CEGEP
+# figures; anything not listed falls back to the student's own courses, then DEFAULT.
+COURSE_FAMILY_PRIORS: Dict[str, Tuple[float, float, float, float]] = {
+    "101": (74.0, 5.0, 11.0, 3.0),   # biology
+    "109": (82.0, 4.0, 8.0, 2.5),    # physical education
+    "201": (71.0, 6.0, 14.0, 3.5),   # mathematics
+    "202": (72.0, 5.5, 12.5, 3.0),   # chemistry
+    "203": (71.0, 6.0, 13.0, 3.5),   # physics
+    "340": (76.0, 4.5, 9.0, 2.5),    # philosophy
+    "345": (76.0, 4.5, 9.0, 2.5),    # humanities
+    "420": (73.0, 6.0, 13.0, 3.5),   # computer science
+    "601": (75.0, 4.5, 8.5, 2.5),    # français
+    "602": (77.0, 4.5, 8.5, 2.5),    # French as a second language
+    "603": (76.0, 4.5, 8.5, 2.5),    # English
+    "604": (78.0, 4.5, 8.5, 2.5),    # English as a second language
+}
+DEFAULT_PRIOR = (75.0, 5.0, 10.0, 3.0)
+# Values outside these ranges are treated as OCR misreads and sampled like missing ones
+PLAUSIBLE_AVG = (35.0, 100.0)
+PLAUSIBLE_SD = (1.5, 30.0)
+
+
+def suspect_mask(avg, sd) -> Tuple[np.ndarray, np.ndarray]:
+    """(avg uncertain, sd uncertain): missing or outside the plausible range."""
+    a, s = _arr(avg), _arr(sd)
+    bad_a = np.isnan(a) | (a < PLAUSIBLE_AVG[0]) | (a > PLAUSIBLE_AVG[1])
+    bad_s = np.isnan(s) | (s < PLAUSIBLE_SD[0]) | (s > PLAUSIBLE_SD[1])
+    return bad_a, bad_s
+
+
+def _priors(codes, avg: np.ndarray, sd: np.ndarray, bad_a: np.ndarray, bad_s: np.ndarray) -> np.ndarray:
+    """(n, 4) prior per course: code family, else the student's trusted courses, else DEFAULT."""
+    own = list(DEFAULT_PRIOR)
+    if (~bad_a).sum() >= 2:
+        own[0], own[1] = float(np.mean(avg[~bad_a])), max(float(np.std(avg[~bad_a])), 3.0)
+    if (~bad_s).sum() >= 2:
+        own[2], own[3] = float(np.mean(sd[~bad_s])), max(float(np.std(sd[~bad_s])), 1.5)
+    fam = [str(c).strip()[:3] if c is not None else "" for c in (codes if codes is not None else [None] * len(avg))]
+    return np.array([COURSE_FAMILY_PRIORS.get(f, own) for f in fam], dtype=float)
+
+
+@dataclass
+class RBands:
+    percentiles: Dict[int, float]                   # overall R at each percentile
+    draws: int                                      # draws actually run (may stop early on the budget)
+    uncertain: np.ndarray                           # courses that were sampled
+    elapsed_ms: float = 0.0
+    seed: int | None = None
+    samples: np.ndarray = field(default_factory=lambda: np.empty(0), repr=False)
+
+
+def r_bands(grade, avg, sd, credits, codes: Sequence[Any] | None = None, draws: int = 20000,
+            seed: int | None = None, budget_ms: float = 150.0, chunk: int = 4000,
+            percentiles: Sequence[int] = (5, 25, 50, 75, 95)) -> RBands:
+    """
+    Percentile bands for overall R when some class averages / std devs are missing or
+    look misread. Uncertain values are drawn from their course-family prior (normal
+    averages, log-normal std devs, clipped to plausible ranges) and every draw is
+    scored as one (draws × courses) array. Without a seed, draws run in chunks and
+    stop once `budget_ms` is spent, so the Results tab stays interactive; with a seed
+    all `draws` always run (in the same fixed chunks), so the bands are reproducible
+    regardless of machine load. A missing grade still leaves its course unscored.
+    """
+    t0 = time.perf_counter()
+    g, a, s, cr = _arr(grade), _arr(avg), _arr(sd), _arr(credits)
+    bad_a, bad_s = suspect_mask(a, s)
+    uncertain = bad_a | bad_s
+    prior = _priors(codes, a, s, bad_a, bad_s)
+    rng = np.random.default_rng(seed)
+    total = float(np.sum(cr))
+
+    # log-normal parameters matching the prior mean / spread of the std dev
+    sig2 = np.log1p((prior[:, 3] / prior[:, 2]) ** 2)
+    mu = np.log(prior[:, 2]) - sig2 / 2
+    ia, isd = np.flatnonzero(bad_a), np.flatnonzero(bad_s)
+
+    out = []
+    done = 0
+    while done < draws:
+        n = min(chunk, draws - done)
+        A = np.broadcast_to(a, (n, a.size)).copy()
+        S = np.broadcast_to(s, (n, s.size)).copy()
+        if ia.size:
+            A[:, ia] = np.clip(rng.normal(prior[ia, 0], prior[ia, 1], (n, ia.size)), *PLAUSIBLE_AVG)
+        if isd.size:
+            S[:, isd] = np.clip(rng.lognormal(mu[isd], np.sqrt(sig2[isd]), (n, isd.size)), *PLAUSIBLE_SD)
+        R = R_BASE + R_PER_Z * (g - A) / S
+        out.append(np.nansum(R * cr, axis=1) / total if total > 0 else np.full(n, np.nan))
+        done += n
+        if not uncertain.any():
+            break
+        if seed is None and (time.perf_counter() - t0) * 1e3 > budget_ms:
+            break
+
+    samples = np.concatenate(out) if out else np.empty(0)
+    pct = {int(p): float(v) for p, v in zip(percentiles, np.percentile(samples, percentiles))} if samples.size else {}
+    return RBands(percentiles=pct, draws=int(samples.size), uncertain=uncertain,
+                  elapsed_ms=(time.perf_counter() - t0) * 1e3, seed=seed, samples=samples)
+
+
+# ---------- Incremental scoring ----------
+
+class IncrementalScorer:
+    """
+    score_courses() for a table that changes a few rows at a time (one per session).
+
+    Z is cached per row content hash (grade, avg, sd, credits), and the overall sums
+    (credits, R·credits, credits of scored rows) are kept as running totals. Each
+    call hashes the rows, scores only the contents it has not seen, and applies the
+    count changes to the totals as deltas. Offsets are applied when reading out
+    (R + offset is linear), so changing them never rescores a row.
+    """
+
+    def __init__(self, missing_z: float | None = None):
+        self.missing_z = missing_z
+        self._z: Dict[int, float] = {}
+        self._counts: Dict[int, int] = {}
+        self._credits_of: Dict[int, float] = {}
+        self._total = self._sum_rc = self._scored_cr = 0.0
+        self.last_scored = 0    # rows (distinct contents) scored by the last call
+
+    @staticmethod
+    def _keys(g: np.ndarray, a: np.ndarray, sd: np.ndarray, cr: np.ndarray) -> np.ndarray:
+        return pd.util.hash_pandas_object(pd.DataFrame({"g": g, "a": a, "s": sd, "c": cr}), index=False).to_numpy()
+
+    def _contrib(self, key: int, credits: float) -> Tuple[float, float, float]:
+        r = R_BASE + R_PER_Z * self._z[key]
+        if np.isnan(r):
+            return credits, 0.0, 0.0
+        return credits, r * credits, credits
+
+    def score(self, grade, avg, sd, credits, r_offset_min: float = 0.0, r_offset_max: float = 0.0) -> RScores:
+        g, a, s, cr = _arr(grade), _arr(avg), _arr(sd), _arr(credits)
+        keys = self._keys(g, a, s, cr)
+        uniq, first, inverse, counts = np.unique(keys, return_index=True, return_inverse=True, return_counts=True)
+        uniq_list = uniq.tolist()
+
+        new = [i for i, k in enumerate(uniq_list) if k not in self._z]
+        if new:
+            idx = first[new]
+            for k, z in zip(uniq[new].tolist(), zscores(g[idx], a[idx], s[idx], self.missing_z).tolist()):
+                self._z[k] = z
+        self.last_scored = len(new)
+
+        # Per distinct content whose row count changed: (key, count delta)
+        new_counts = dict(zip(uniq_list, counts.tolist()))
+        cr_of = dict(zip(uniq_list, cr[first].tolist()))
+        changed = [(k, n - self._counts.get(k, 0)) for k, n in new_counts.items() if n != self._counts.get(k, 0)]
+        gone = [k for k in self._counts if k not in new_counts]
+
+        if len(changed) + len(gone) > len(uniq_list) // 2:
+            # Mostly a new table (first call, paste, import): re-sum instead of delta-updating
+            self._total = self._sum_rc = self._scored_cr = 0.0
+            deltas = [(k, n, cr_of[k]) for k, n in new_counts.items()]
+        else:
+            deltas = [(k, dn, cr_of[k]) for k, dn in changed]
+            deltas += [(k, -self._counts[k], self._credits_of[k]) for k in gone]
+        for k, dn, credits in deltas:
+            t, rc, sc = self._contrib(k, credits)
+            self._total += dn * t
+            self._sum_rc += dn * rc
+            self._scored_cr += dn * sc
+        for k in gone:
+            del self._z[k]
+        self._counts, self._credits_of = new_counts, cr_of
+
+        z = np.array([self._z[k] for k in uniq_list], dtype=float)[inverse.reshape(-1)]
+        r = R_BASE + R_PER_Z * z
+        total = self._total if self._counts else 0.0
+
+        def _overall(offset: float) -> float:
+            return (self._sum_rc + offset * self._scored_cr) / total if total > 0 else float("nan")
+
+        return RScores(
+            z=z,
+            r_central=r,
+            r_min=r + r_offset_min,
+            r_max=r + r_offset_max,
+            credits=cr,
+            total_credits=total,
+            overall_central=_overall(0.0),
+            overall_min=_overall(r_offset_min),
+            overall_max=_overall(r_offset_max),
+        )
+
+
+# ---------- Cohort batch scoring ----------
+
+# Long-format input: one row per student × course
+COHORT_COLUMNS = {"student_id": "student_id", "course": "course", "grade": "grade",
+                  "avg": "avg", "sd": "sd", "credits": "credits"}
+
+
+def _numeric(col: pd.Series) -> np.ndarray:
+    """Float array; text cells are parsed like the Results tab's clean_numeric ("85,5 %" → 85.5)."""
+    if pd.api.types.is_numeric_dtype(col):
+        return col.to_numpy(dtype=float)
+    return (
+        col.astype(str)
+        .str.replace(",", ".", regex=False)
+        .str.extract(r"([0-9.]+)")[0]
+        .astype(float)
+        .to_numpy()
+    )
+
+
+def score_cohort(table: pd.DataFrame, r_offset_min: float = 0.0, r_offset_max: float = 0.0,
+                 missing_z: float | None = None, columns: Dict[str, str] | None = None) -> pd.DataFrame:
+    """
+    Per-student R for a long-format cohort table, with the Results tab's math:
+    missing/zero credits count as 1, and a course whose R is NaN keeps its credits in
+    the denominator. Students are factorized once and every per-student sum is a
+    single np.bincount, so no per-student DataFrame is ever built.
+
+    Returns one row per student_id (sorted): courses, credits, R (central/min/max).
+    Rows without a student_id are ignored.
+    """
+    cols = {**COHORT_COLUMNS, **(columns or {})}
+    codes, students = pd.factorize(table[cols["student_id"]], sort=True)
+    keep = codes >= 0
+    codes = codes[keep]
+    g = _numeric(table[cols["grade"]])[keep]
+    a = _numeric(table[cols["avg"]])[keep]
+    sd = _numeric(table[cols["sd"]])[keep]
+    cr = _numeric(table[cols["credits"]])[keep]
+    cr[np.isnan(cr) | (cr == 0)] = 1.0
+
+    r = R_BASE + R_PER_Z * zscores(g, a, sd, missing_z)
+    scored = ~np.isnan(r)
+    n = len(students)
+    total = np.bincount(codes, weights=cr, minlength=n)
+    sum_rc = np.bincount(codes, weights=np.where(scored, r * cr, 0.0), minlength=n)
+    # (R + offset)·credits summed over scored courses = sum_rc + offset·scored credits
+    scored_cr = np.bincount(codes, weights=np.where(scored, cr, 0.0), minlength=n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        central = sum_rc / total
+        r_min = (sum_rc + r_offset_min * scored_cr) / total
+        r_max = (sum_rc + r_offset_max * scored_cr) / total
+    return pd.DataFrame({
+        "student_id": students,
+        "courses": np.bincount(codes, minlength=n),
+        "credits": total,
+        "R (central)": central,
+        "R (min)": r_min,
+        "R (max)": r_max,
+    })
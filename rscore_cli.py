@@ -0,0 +1,147 @@
+# rscore_cli.py — score course CSVs from the command line (no Streamlit)
+# Same pipeline as the CSV tab: chunked read, header detection, numeric cleaning and
+# validation, credit autofill, then rscore. Files are read, scored and written one
+# at a time, so memory stays flat however many exports a folder holds; --jobs fans
+# files out to processes. Invalid values are blanked and counted in "warnings".
+#
+#   python rscore_cli.py exports/                       # one summary row per file (CSV on stdout)
+#   python rscore_cli.py a.csv b.csv --courses -f json  # per-course rows as JSON lines
+#   python rscore_cli.py exports/ --jobs 4 -o results.csv
+
+from __future__ import annotations
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple
+
+import course_data
+import rscore
+
+SUMMARY_FIELDS = ["file", "courses", "credits", "R (central)", "R (min)", "R (max)", "warnings", "error"]
+COURSE_FIELDS = ["file"] + course_data.REQUIRED_COLS + ["Credits Source", "Z", "R (central)", "R (min)", "R (max)"]
+
+# Set per process (main or pool worker) before any file is scored
+_MAPPINGS: Tuple[Dict[str, float], Dict[str, float]] = ({}, {})
+_OFFSETS: Tuple[float, float] = (-2.0, 2.0)
+
+
+def _init_worker(mappings, offsets) -> None:
+    global _MAPPINGS, _OFFSETS
+    _MAPPINGS, _OFFSETS = mappings, offsets
+
+
+def iter_csv_paths(inputs: List[str]) -> Iterator[str]:
+    """Files as given; directories walked recursively for *.csv, in sorted order."""
+    for p in inputs:
+        if os.path.isdir(p):
+            for root, dirs, files in os.walk(p):
+                dirs.sort()
+                for fn in sorted(files):
+                    if fn.lower().endswith(".csv"):
+                        yield os.path.join(root, fn)
+        else:
+            yield p
+
+
+def _num(v: Any) -> Any:
+    try:
+        f = float(v)
+    except (TypeError, ValueError):
+        return v
+    return None if math.isnan(f) else round(f, 4)
+
+
+def score_file(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """(summary row, per-course rows) for one CSV; errors land in the summary row."""
+    try:
+        imported = course_data.import_course_csv(path, *_MAPPINGS)
+        df = imported.df
+        scores = rscore.score_courses(df["Your Grade"], df["Class Avg"], df["Std. Dev"], df["Credits"],
+                                      r_offset_min=_OFFSETS[0], r_offset_max=_OFFSETS[1])
+    except Exception as e:
+        return {"file": path, "error": str(e)}, []
+    for col, values in scores.columns().items():
+        df[col] = values
+    df.insert(0, "file", path)
+    summary = {
+        "file": path,
+        "courses": len(df),
+        "credits": _num(scores.total_credits),
+        "R (central)": _num(scores.overall_central),
+        "R (min)": _num(scores.overall_min),
+        "R (max)": _num(scores.overall_max),
+        "warnings": imported.n_errors,
+        "error": "",
+    }
+    courses = [{k: _num(v) if k != "file" else v for k, v in row.items()}
+               for row in df[COURSE_FIELDS].to_dict(orient="records")]
+    return summary, courses
+
+
+class _Writer:
+    """Streams rows as CSV (header once) or JSON lines."""
+
+    def __init__(self, fh, fmt: str, fields: List[str]):
+        self.fh, self.fmt = fh, fmt
+        self.csv = csv.DictWriter(fh, fieldnames=fields, extrasaction="ignore") if fmt == "csv" else None
+        if self.csv is not None:
+            self.csv.writeheader()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        if self.csv is not None:
+            self.csv.writerow({k: ("" if v is None else v) for k, v in row.items()})
+        else:
+            self.fh.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.fh.flush()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Compute R-scores for course CSVs (CSV-tab template format).")
+    ap.add_argument("inputs", nargs="+", help="CSV files and/or directories of CSV files")
+    ap.add_argument("-o", "--out", help="output file (default: stdout)")
+    ap.add_argument("-f", "--format", choices=("csv", "json"), default="csv", help="csv, or JSON lines")
+    ap.add_argument("--courses", action="store_true", help="write per-course rows instead of one row per file")
+    ap.add_argument("--r-offset-min", type=float, default=-2.0)
+    ap.add_argument("--r-offset-max", type=float, default=2.0)
+    ap.add_argument("--mapping-dir", help="where to look for the credit mapping CSVs (default: cwd)")
+    ap.add_argument("-j", "--jobs", type=int, default=1, help="score files in N processes (0 = all cores)")
+    args = ap.parse_args(argv)
+
+    mappings = course_data.load_credit_mappings(args.mapping_dir)
+    offsets = (args.r_offset_min, args.r_offset_max)
+    paths = iter_csv_paths(args.inputs)
+    jobs = args.jobs or os.cpu_count() or 1
+
+    fh = open(args.out, "w", newline="", encoding="utf-8") if args.out else sys.stdout
+    failed = 0
+    try:
+        writer = _Writer(fh, args.format, COURSE_FIELDS if args.courses else SUMMARY_FIELDS)
+        if jobs <= 1:
+            _init_worker(mappings, offsets)
+            results = map(score_file, paths)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(mappings, offsets))
+            results = pool.map(score_file, paths, chunksize=4)
+        try:
+            for summary, courses in results:
+                if summary.get("error"):
+                    failed += 1
+                    print(f"{summary['file']}: {summary['error']}", file=sys.stderr)
+                for row in (courses if args.courses else [summary]):
+                    writer.write(row)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    finally:
+        if fh is not sys.stdout:
+            fh.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
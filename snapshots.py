@@ -0,0 +1,166 @@
+# snapshots.py — per-semester R-score history, append-only on disk (no Streamlit)
+# Each saved semester is one compressed .npz of column arrays (names, grade, avg,
+# std dev, credits, Z). manifest.json lists the snapshots in order together with
+# their credit-weighted sums, so cumulative R over any number of semesters is a
+# cumsum over the manifest and never re-reads the course arrays.
+
+from __future__ import annotations
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import rscore
+
+__all__ = ["SnapshotMeta", "SnapshotStore", "default_snapshot_dir"]
+
+_COLS = {"Course Name": "name", "Your Grade": "grade", "Class Avg": "avg", "Std. Dev": "sd", "Credits": "credits"}
+_SAFE_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def default_snapshot_dir(user_id: str | None = None) -> str:
+    """RSCORE_SNAPSHOT_DIR (default .rscore_snapshots), one subdirectory per user."""
+    root = os.environ.get("RSCORE_SNAPSHOT_DIR") or ".rscore_snapshots"
+    return os.path.join(root, _SAFE_RE.sub("_", str(user_id or "local")))
+
+
+@dataclass
+class SnapshotMeta:
+    id: str
+    label: str
+    created: float
+    courses: int
+    total_credits: float      # Σ credits
+    sum_rc: float             # Σ R·credits over scored courses
+    scored_credits: float     # Σ credits over scored courses (for R offsets)
+    file: str
+
+    def overall(self, offset: float = 0.0) -> float:
+        return (self.sum_rc + offset * self.scored_credits) / self.total_credits if self.total_credits > 0 else float("nan")
+
+
+class SnapshotStore:
+    """Append-only semester snapshots under one directory (thread-safe within a process)."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._manifest = os.path.join(root, "manifest.json")
+        self._lock = threading.Lock()
+
+    # ---------- Manifest ----------
+
+    def list(self) -> List[SnapshotMeta]:
+        try:
+            with open(self._manifest, "r", encoding="utf-8") as fh:
+                return [SnapshotMeta(**m) for m in json.load(fh)]
+        except (FileNotFoundError, ValueError):
+            return []
+
+    def _write_manifest(self, metas: List[SnapshotMeta]) -> None:
+        tmp = f"{self._manifest}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump([asdict(m) for m in metas], fh)
+        os.replace(tmp, self._manifest)
+
+    # ---------- Write ----------
+
+    def save(self, label: str, df: pd.DataFrame) -> SnapshotMeta:
+        """Store a cleaned course table (Results-tab columns) as the next semester."""
+        cols = {k: df[c].to_numpy() if c in df.columns else np.full(len(df), np.nan) for c, k in _COLS.items()}
+        names = np.asarray([str(x) for x in cols["name"]], dtype=str)
+        num = {k: np.asarray(cols[k], dtype=float) for k in ("grade", "avg", "sd", "credits")}
+        scores = rscore.score_courses(num["grade"], num["avg"], num["sd"], num["credits"])
+        scored = ~np.isnan(scores.r_central)
+
+        sid = time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+        fn = f"{sid}.npz"
+        os.makedirs(self.root, exist_ok=True)
+        np.savez_compressed(os.path.join(self.root, fn), name=names, z=scores.z, **num)
+        meta = SnapshotMeta(
+            id=sid, label=str(label).strip() or sid, created=time.time(), courses=len(names),
+            total_credits=scores.total_credits,
+            sum_rc=float(np.sum(scores.r_central[scored] * scores.credits[scored])),
+            scored_credits=float(np.sum(scores.credits[scored])),
+            file=fn,
+        )
+        with self._lock:
+            self._write_manifest(self.list() + [meta])
+        return meta
+
+    # ---------- Read ----------
+
+    def load(self, sid: str) -> pd.DataFrame:
+        meta = next(m for m in self.list() if m.id == sid)
+        with np.load(os.path.join(self.root, meta.file)) as z:
+            df = pd.DataFrame({c: z[k] for c, k in _COLS.items()})
+            df["Z"] = z["z"]
+        df["R (central)"] = rscore.R_BASE + rscore.R_PER_Z * df["Z"]
+        return df
+
+    def history(self, r_offset_min: float = 0.0, r_offset_max: float = 0.0) -> pd.DataFrame:
+        """One row per semester: its own R and the cumulative R up to it, from the stored sums."""
+        metas = self.list()
+        if not metas:
+            return pd.DataFrame(columns=["id", "label", "courses", "credits", "R (semester)",
+                                         "R (cumulative)", "R (cumulative min)", "R (cumulative max)"])
+        tc = np.cumsum([m.total_credits for m in metas])
+        rc = np.cumsum([m.sum_rc for m in metas])
+        sc = np.cumsum([m.scored_credits for m in metas])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cum = rc / tc
+            cum_min = (rc + r_offset_min * sc) / tc
+            cum_max = (rc + r_offset_max * sc) / tc
+        return pd.DataFrame({
+            "id": [m.id for m in metas],
+            "label": [m.label for m in metas],
+            "courses": [m.courses for m in metas],
+            "credits": [m.total_credits for m in metas],
+            "R (semester)": [m.overall() for m in metas],
+            "R (cumulative)": cum,
+            "R (cumulative min)": cum_min,
+            "R (cumulative max)": cum_max,
+        })
+
+    def diff(self, sid_a: str, sid_b: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Course-level changes from snapshot A to B, matched on the cleaned course name
+        (repeated names, e.g. two PE sections, pair up in table order):
+        status (added / removed / changed / same) with grade and R deltas, plus a summary
+        whose overall change comes straight from the stored sums.
+        """
+        a, b = self.load(sid_a), self.load(sid_b)
+        def keyed(d: pd.DataFrame) -> pd.DataFrame:
+            k = d["Course Name"].astype(str).str.strip().str.lower()
+            return d.assign(_k=k, _n=d.groupby(k, sort=False).cumcount())
+
+        m = keyed(a).merge(keyed(b), on=["_k", "_n"], how="outer", suffixes=(" A", " B"), indicator=True)
+        m["Course Name"] = m["Course Name B"].fillna(m["Course Name A"])
+        vals = ["Your Grade", "Class Avg", "Std. Dev", "Credits"]
+        same = np.ones(len(m), dtype=bool)
+        for c in vals:
+            x, y = m[f"{c} A"].to_numpy(dtype=float), m[f"{c} B"].to_numpy(dtype=float)
+            same &= (x == y) | (np.isnan(x) & np.isnan(y))
+        m["status"] = np.select([m["_merge"].eq("left_only"), m["_merge"].eq("right_only"), same],
+                                ["removed", "added", "same"], default="changed")
+        m["Δ Grade"] = m["Your Grade B"] - m["Your Grade A"]
+        m["Δ R"] = m["R (central) B"] - m["R (central) A"]
+        out = m[["Course Name", "status", "Your Grade A", "Your Grade B", "Δ Grade",
+                 "R (central) A", "R (central) B", "Δ R"]]
+        metas = {x.id: x for x in self.list()}
+        summary = {
+            "added": int((m["status"] == "added").sum()),
+            "removed": int((m["status"] == "removed").sum()),
+            "changed": int((m["status"] == "changed").sum()),
+            "R A": metas[sid_a].overall(),
+            "R B": metas[sid_b].overall(),
+        }
+        summary["Δ R"] = summary["R B"] - summary["R A"]
+        order = {"changed": 0, "added": 1, "removed": 2, "same": 3}
+        return out.sort_values("status", key=lambda s: s.map(order), kind="stable").reset_index(drop=True), summary
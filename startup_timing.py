@@ -0,0 +1,57 @@
+# startup_timing.py — cold-start breakdown for the Streamlit pages (stdlib only)
+# Set RSCORE_STARTUP_REPORT=1 and each page prints, to stderr, how long its imports
+# and one-time setup took on the first run in a process; imports deferred to a view
+# are reported the first time that view opens. For per-module detail underneath,
+# run with PYTHONPROFILEIMPORTTIME=1 (Python's own -X importtime).
+
+from __future__ import annotations
+import importlib
+import os
+import sys
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Iterator, List, Tuple
+
+__all__ = ["ENABLED", "phase", "timed_import", "report"]
+
+ENABLED = os.environ.get("RSCORE_STARTUP_REPORT", "").strip().lower() not in ("", "0", "false", "no")
+
+_T0 = time.perf_counter()                 # first import of this module ≈ process start for the app
+_PHASES: List[Tuple[str, float]] = []     # (name, seconds), first occurrence only
+_SEEN: set = set()
+_REPORTED = 0                             # phases already printed
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a block the first time `name` runs in this process (no-op when disabled)."""
+    if not ENABLED or name in _SEEN:
+        yield
+        return
+    _SEEN.add(name)
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        _PHASES.append((name, time.perf_counter() - t))
+
+
+def timed_import(module: str) -> ModuleType:
+    """importlib.import_module, recorded as an "import <module>" phase."""
+    with phase(f"import {module}"):
+        return importlib.import_module(module)
+
+
+def report(label: str = "startup") -> None:
+    """Print phases recorded since the last report (nothing when disabled or none are new)."""
+    global _REPORTED
+    if not ENABLED or _REPORTED >= len(_PHASES):
+        return
+    new = _PHASES[_REPORTED:]
+    _REPORTED = len(_PHASES)
+    width = max(len(n) for n, _ in new)
+    lines = [f"[rscore] {label} (+{(time.perf_counter() - _T0) * 1e3:,.0f} ms since first import)"]
+    lines += [f"  {n:<{width}}  {s * 1e3:8.1f} ms" for n, s in new]
+    lines.append(f"  {'total':<{width}}  {sum(s for _, s in new) * 1e3:8.1f} ms")
+    print("\n".join(lines), file=sys.stderr, flush=True)
@@ -0,0 +1,161 @@
+# tesseract_pool.py — long-lived Tesseract workers for the OCR import path (no Streamlit)
+# pytesseract writes a temp PNG and spawns a fresh `tesseract` process (re-loading the
+# eng+fra traineddata) for every call. With the `tesserocr` binding (requirements.txt;
+# libtesseract-dev / libleptonica-dev in packages.txt) we keep a small pool of
+# libtesseract engines with the models already loaded and hand them PIL images in
+# memory. Where tesserocr isn't installed, get_tesseract_pool() returns None and
+# callers keep using pytesseract.
+
+from __future__ import annotations
+import os
+import queue
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import tesserocr  # type: ignore
+except Exception:  # pragma: no cover
+    tesserocr = None  # type: ignore
+
+__all__ = ["TesseractPool", "get_tesseract_pool", "tesserocr_available", "pool_backend_enabled", "pool_error",
+           "reset_pool_errors"]
+
+_PSM_RE = re.compile(r"--psm\s+(\d+)")
+
+
+def tesserocr_available() -> bool:
+    return tesserocr is not None
+
+
+def pool_backend_enabled() -> bool:
+    """RSCORE_TESS_BACKEND=cli forces pytesseract even when tesserocr is installed."""
+    return tesserocr is not None and os.environ.get("RSCORE_TESS_BACKEND", "auto").lower() != "cli"
+
+
+class TesseractPool:
+    """Fixed-size pool of PyTessBaseAPI engines, checked out one caller at a time."""
+
+    def __init__(self, size: int = 2, lang: str = "eng+fra", oem: int = 1, tessdata: str | None = None):
+        if tesserocr is None:
+            raise ImportError("tesserocr is not installed.")
+        self.size = max(1, int(size))
+        self.lang = lang
+        self.oem = oem
+        self.tessdata = tessdata or os.environ.get("TESSDATA_PREFIX") or None
+        self._idle: "queue.Queue[Any]" = queue.Queue()
+        self._calls_lock = threading.Lock()
+        self._apis: List[Any] = []
+        for _ in range(self.size):
+            kwargs: Dict[str, Any] = {"lang": lang, "oem": tesserocr.OEM(oem)}
+            if self.tessdata:
+                kwargs["path"] = self.tessdata
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+            self._apis.append(api)
+            self._idle.put(api)
+        self.calls = 0
+
+    @contextmanager
+    def engine(self, timeout: float | None = None) -> Iterator[Any]:
+        api = self._idle.get(timeout=timeout)
+        try:
+            yield api
+        finally:
+            api.Clear()
+            self._idle.put(api)
+
+    def _prepare(self, api: Any, pil_img, config: str) -> None:
+        m = _PSM_RE.search(config or "")
+        api.SetPageSegMode(tesserocr.PSM(int(m.group(1))) if m else tesserocr.PSM.SINGLE_BLOCK)
+        api.SetImage(pil_img)
+        with self._calls_lock:
+            self.calls += 1
+
+    def image_to_string(self, pil_img, config: str = "") -> str:
+        with self.engine() as api:
+            self._prepare(api, pil_img, config)
+            return api.GetUTF8Text() or ""
+
+    def image_to_data(self, pil_img, config: str = "") -> Dict[str, list]:
+        """Word boxes in the same shape as pytesseract.image_to_data(output_type=Output.DICT)."""
+        keys = ("level", "page_num", "block_num", "par_num", "line_num", "word_num",
+                "left", "top", "width", "height", "conf", "text")
+        out: Dict[str, list] = {k: [] for k in keys}
+        with self.engine() as api:
+            self._prepare(api, pil_img, config)
+            api.Recognize()
+            it = api.GetIterator()
+            if it is None:
+                return out
+            RIL = tesserocr.RIL
+            block = par = line = word = 0
+            for r in tesserocr.iterate_level(it, RIL.WORD):
+                if r.IsAtBeginningOf(RIL.BLOCK):
+                    block += 1; par = line = 0
+                if r.IsAtBeginningOf(RIL.PARA):
+                    par += 1; line = 0
+                if r.IsAtBeginningOf(RIL.TEXTLINE):
+                    line += 1; word = 0
+                word += 1
+                box = r.BoundingBox(RIL.WORD)
+                if box is None:
+                    continue
+                x1, y1, x2, y2 = box
+                vals = (5, 1, block, par, line, word, x1, y1, x2 - x1, y2 - y1,
+                        r.Confidence(RIL.WORD), r.GetUTF8Text(RIL.WORD) or "")
+                for k, v in zip(keys, vals):
+                    out[k].append(v)
+        return out
+
+    def close(self) -> None:
+        for api in self._apis:
+            try:
+                api.End()
+            except Exception:
+                pass
+        self._apis.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "tesserocr-pool", "size": self.size, "lang": self.lang,
+                "idle": self._idle.qsize(), "calls": self.calls}
+
+    def version(self) -> str:
+        return (tesserocr.tesseract_version() or "").splitlines()[0].replace("tesseract", "").strip()
+
+
+# Process-wide pools shared by every Streamlit session, one per (lang, oem), created
+# on first use. A failed build is remembered per key until reset_pool_errors().
+_POOL_LOCK = threading.Lock()
+_POOLS: Dict[Tuple[str, int], TesseractPool] = {}
+_POOL_FAILED: Dict[Tuple[str, int], str] = {}
+
+
+def get_tesseract_pool(lang: str = "eng+fra", oem: int = 1) -> Optional[TesseractPool]:
+    """The shared pool for this lang/oem, or None when tesserocr is unavailable/disabled
+    or the pool failed to load."""
+    if not pool_backend_enabled():
+        return None
+    key = (lang, int(oem))
+    pool = _POOLS.get(key)
+    if pool is not None or key in _POOL_FAILED:
+        return pool
+    with _POOL_LOCK:
+        if key not in _POOLS and key not in _POOL_FAILED:
+            size = int(os.environ.get("RSCORE_TESS_WORKERS", "0") or 0) or min(4, os.cpu_count() or 1)
+            try:
+                _POOLS[key] = TesseractPool(size=size, lang=lang, oem=oem)
+            except Exception as e:
+                _POOL_FAILED[key] = str(e)
+    return _POOLS.get(key)
+
+
+def pool_error(lang: str = "eng+fra", oem: int = 1) -> str | None:
+    return _POOL_FAILED.get((lang, int(oem)))
+
+
+def reset_pool_errors() -> None:
+    """Forget failed builds so the next get_tesseract_pool() tries again (e.g. after
+    installing language data)."""
+    with _POOL_LOCK:
+        _POOL_FAILED.clear()
@@ -0,0 +1,45 @@
+# test_course_data.py — CSV import (run with: python -m pytest -q)
+
+from __future__ import annotations
+import io
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import course_data  # noqa: E402
+import rscore  # noqa: E402
+
+CSV = (
+    "Course,Code,Grade,Average,Std Dev,Credits\n"
+    "Calculus I,201-NYA-05,85,78,,2.33\n"
+    "Humanities,345-101-MQ,80,76,8,2\n"
+    "Chemistry,202-NYA-05,82,75,6,2.66\n"
+)
+
+
+def test_csv_import_keeps_class_code_for_r_bands():
+    imported = course_data.import_course_csv(io.StringIO(CSV), {}, {})
+    df = imported.df
+    assert list(df["Class Code"]) == ["201-NYA-05", "345-101-MQ", "202-NYA-05"]
+
+    # the missing Std. Dev is drawn from the mathematics (201) family prior
+    bad_a, bad_s = rscore.suspect_mask(df["Class Avg"], df["Std. Dev"])
+    prior = rscore._priors(df["Class Code"], df["Class Avg"].to_numpy(float), df["Std. Dev"].to_numpy(float),
+                           bad_a, bad_s)
+    assert tuple(prior[0]) == rscore.COURSE_FAMILY_PRIORS["201"]
+
+    with_codes = rscore.r_bands(df["Your Grade"], df["Class Avg"], df["Std. Dev"], df["Credits"],
+                                codes=df["Class Code"], draws=4000, seed=1)
+    without = rscore.r_bands(df["Your Grade"], df["Class Avg"], df["Std. Dev"], df["Credits"],
+                             draws=4000, seed=1)
+    assert with_codes.uncertain.tolist() == [True, False, False]
+    assert not np.isclose(with_codes.percentiles[50], without.percentiles[50])
+
+
+def test_csv_import_without_codes_has_blank_class_code():
+    csv = "Course Name,Your Grade,Class Avg,Std. Dev,Credits\nPhysics,88,80,5,2\n"
+    df = course_data.import_course_csv(io.StringIO(csv), {}, {}).df
+    assert list(df["Class Code"]) == [""]
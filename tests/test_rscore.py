@@ -0,0 +1,32 @@
+# test_rscore.py — scoring edge cases (run with: python -m pytest -q)
+
+from __future__ import annotations
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rscore  # noqa: E402
+
+
+def test_sweep_keeps_zero_sd_course_pinned():
+    g, a, s, cr = [85.0, 80.0], [75.0, 70.0], [0.0, 10.0], [2.0, 2.0]
+    deltas = np.array([-3.0, 0.0, 0.5, 1.0, 3.0])
+    got = rscore.sweep(g, a, s, cr, sd_delta=deltas[:, None])
+    # the zero-sd course stays at Z = 0 (R 35); only the other course moves
+    want = [(35.0 + rscore.R_BASE + rscore.R_PER_Z * 10.0 / (10.0 + d)) / 2 for d in deltas]
+    np.testing.assert_allclose(got, want)
+    assert got[1] == 37.5
+
+
+def test_sweep_keeps_missing_sd_course_unscored():
+    g, a, s, cr = [85.0, 80.0], [75.0, 70.0], [np.nan, 10.0], [2.0, 2.0]
+    got = rscore.sweep(g, a, s, cr, sd_delta=np.array([[-1.0], [1.0]]))
+    np.testing.assert_allclose(got, [(35.0 + 5.0 * 10.0 / 9.0) / 2, (35.0 + 5.0 * 10.0 / 11.0) / 2])
+
+
+def test_sweep_floors_negative_delta():
+    got = rscore.sweep([80.0], [70.0], [4.0], [1.0], sd_delta=-10.0)
+    assert np.isclose(got, 35.0 + 5.0 * 10.0 / rscore.PLAUSIBLE_SD[0])